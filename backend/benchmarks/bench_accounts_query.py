@@ -0,0 +1,63 @@
+"""Latency of GET /api/insights/accounts pages: per-request full sort vs the planned query.
+
+Run from backend/: python benchmarks/bench_accounts_query.py [n_accounts ...]
+
+"full sort" re-implements the previous filter-then-sort-everything path as a baseline;
+"planned" is get_records, which slices, walks, heaps or sorts per services/account_index.py.
+"""
+import math
+import sys
+
+from bench_common import best_of, synthetic_accounts
+
+from models.subscription import SubscriptionStatus
+from services.account_index import plan_order
+from services.insights.accounts_query import SortBy, SortDir, get_records
+from services.store import STORE
+
+
+def _full_sort(accounts, *, page: int, page_size: int, status, search, sort_by: SortBy, sort_dir: SortDir) -> list:
+    if status is not None:
+        accounts = [a for a in accounts if a.subscription.status == status]
+    if search:
+        accounts = [a for a in accounts if search in a.account.account_label.lower()]
+    if sort_by == SortBy.account_label:
+        key = lambda a: a.account.account_label.lower()
+    else:
+        key = lambda a: getattr(a.usage, sort_by.value)
+    ordered = sorted(accounts, key=key, reverse=sort_dir == SortDir.desc)
+    return ordered[(page - 1) * page_size:page * page_size]
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [100_000, 1_000_000]
+    page_size = 25
+    for n in sizes:
+        accounts = synthetic_accounts(n)
+        STORE.set(source="bench", accounts=accounts)
+        values = list(accounts.values())
+        index = STORE.snapshot.index
+
+        print(f"{n:,} accounts, page_size {page_size}")
+        for label, status, search, sort_by, sort_dir in (
+            ("all, label asc", None, None, SortBy.account_label, SortDir.asc),
+            ("active, sent desc", SubscriptionStatus.active, None, SortBy.notifications_sent, SortDir.desc),
+            ("search, records asc", None, "account 12", SortBy.total_records, SortDir.asc),
+        ):
+            matching = len(index.select(status=status, search=search))
+            last = max(1, math.ceil(matching / page_size))
+            for page in sorted({1, 3, last // 2, last}):
+                kwargs = dict(page=page, page_size=page_size, search=search, sort_by=sort_by, sort_dir=sort_dir)
+                full_ms = best_of(lambda: _full_sort(values, status=status, **kwargs)) * 1000
+                planned_ms = best_of(
+                    lambda: get_records(status=status.value if status else None, **kwargs)
+                ) * 1000
+                plan = plan_order(matching, n, page * page_size).value
+                print(
+                    f"  {label:<20} page {page:>6,}  full sort {full_ms:>8,.1f} ms"
+                    f"   planned {planned_ms:>8,.1f} ms ({plan})"
+                )
+
+
+if __name__ == "__main__":
+    main()
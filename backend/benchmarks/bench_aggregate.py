@@ -0,0 +1,42 @@
+"""Latency of POST /aggregate queries (hash aggregation over the columns) as the store grows.
+
+Run from backend/: python benchmarks/bench_aggregate.py [n_accounts ...]
+"""
+import sys
+
+from bench_common import best_of, synthetic_accounts
+
+from models.aggregate import AggregateRequest
+from services.insights.aggregate import aggregate
+from services.store import STORE
+
+QUERIES = {
+    "count by status": {"group_by": ["status"], "aggregations": [{"op": "count"}]},
+    "sums by seat bucket": {
+        "group_by": ["seat_bucket"],
+        "aggregations": [{"op": "sum", "field": "messages_processed"}, {"op": "mean", "field": "notifications_sent"}],
+    },
+    "p90 by status x title": {
+        "group_by": ["status", "workflow_title"],
+        "aggregations": [{"op": "count"}, {"op": "percentile", "field": "notifications_sent", "q": 90}],
+    },
+    "filtered max": {
+        "filters": {"status": "active", "search": "account 1"},
+        "aggregations": [{"op": "max", "field": "seats_total"}],
+    },
+}
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        STORE.set(source="bench", accounts=synthetic_accounts(n))
+        print(f"{n:,} accounts")
+        for name, body in QUERIES.items():
+            request = AggregateRequest.model_validate(body)
+            ms = best_of(lambda: aggregate(request)) * 1000
+            print(f"  {name:<24} {ms:>9,.1f} ms   {ms * 1e6 / n:>6,.0f} ns/account")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Usage quantiles: sorting every account per request vs the per-ingest ValueDistribution sketches.
+
+Run from backend/: python benchmarks/bench_distribution.py [n_accounts ...]
+"""
+import sys
+
+from bench_common import best_of, synthetic_accounts
+
+from services.columns import AccountColumns
+from services.insights.analytics import UsageField, usage_distribution_from
+from services.totals import AccountTotals
+
+QUANTILES = (50, 90, 99)
+
+
+def _exact(values) -> list[int]:
+    ordered = sorted(values)
+    return [ordered[int(q / 100 * (len(ordered) - 1))] for q in QUANTILES]
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        accounts = synthetic_accounts(n)
+        build_s = best_of(lambda: AccountTotals.build(accounts), repeat=1)
+        totals = AccountTotals.build(accounts)
+        columns = AccountColumns.build(accounts)
+
+        print(f"{n:,} accounts (totals with distributions built in {build_s:,.2f} s)")
+        for field in (UsageField.messages_processed, UsageField.notifications_sent, UsageField.total_records):
+            exact = _exact(columns[field.value])
+            sketch = usage_distribution_from(totals, field=field, status=None, quantiles=QUANTILES)
+            error = max(abs(q["value"] - e) / e for q, e in zip(sketch["quantiles"], exact) if e)
+            exact_ms = best_of(lambda: _exact(columns[field.value])) * 1000
+            sketch_ms = best_of(lambda: usage_distribution_from(totals, field=field, status=None, quantiles=QUANTILES)) * 1000
+            print(f"  {field.value:<20} sort {exact_ms:>8.1f} ms   sketch {sketch_ms:>6.3f} ms   max rel. error {error:.2%}")
+
+
+if __name__ == "__main__":
+    main()
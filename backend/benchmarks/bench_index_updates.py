@@ -0,0 +1,51 @@
+"""Publishing a delta ingest: AccountIndex.with_changes vs rebuilding the index from scratch.
+
+Run from backend/: python benchmarks/bench_index_updates.py [n_accounts ...]
+
+Each size replaces a few hundred existing accounts (new labels, statuses and metrics) and
+appends a hundred more, the shape of a typical delta ingest.
+"""
+import random
+import sys
+
+from bench_common import best_of, synthetic_accounts
+
+from services.account_index import AccountIndex
+from services.columns import AccountColumns
+
+REPLACED = (300, 3_000)
+APPENDED = 100
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000_000]
+    for n in sizes:
+        accounts = synthetic_accounts(n + APPENDED)
+        uuids = list(accounts)
+        before = {u: accounts[u] for u in uuids[:n]}
+        columns_before = AccountColumns.build(before)
+        index_before = AccountIndex.build(before, columns_before)
+        donors = list(before.values())
+        rng = random.Random(3)
+
+        print(f"{n:,} accounts")
+        for replaced in REPLACED:
+            # Another account's values under the replaced account's uuid
+            changed = {
+                u: rng.choice(donors).model_copy(update={"account": before[u].account})
+                for u in rng.sample(uuids[:n], replaced)
+            }
+            changed.update({u: accounts[u] for u in uuids[n:]})
+            columns = columns_before.with_changes(changed)
+            after = {**before, **changed}
+
+            rebuild = best_of(lambda: AccountIndex.build(after, columns), repeat=1)
+            patch = best_of(lambda: index_before.with_changes(columns_before, columns, changed))
+            print(
+                f"  {replaced:>6,} replaced + {APPENDED} new   rebuild {rebuild * 1000:>8,.0f} ms"
+                f"   with_changes {patch * 1000:>7,.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
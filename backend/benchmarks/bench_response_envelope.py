@@ -0,0 +1,99 @@
+"""Per-request cost of the response envelope: old BaseHTTPMiddleware vs the pure ASGI one.
+
+Run from backend/: python benchmarks/bench_response_envelope.py [page_size ...]
+
+The wrapped app sends a pre-encoded accounts page shaped like GET /api/insights/accounts, so
+the timings isolate what each middleware adds. Requests go straight through the ASGI interface.
+"""
+import asyncio
+import json
+import sys
+import time
+
+from bench_common import synthetic_accounts
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, Response
+
+from common.response import UniformResponseMiddleware
+from services.insights.serializers import account_to_record
+
+
+class ReparseMiddleware(BaseHTTPMiddleware):
+    """The previous middleware: buffer, json.loads, re-encode through a new JSONResponse."""
+
+    async def dispatch(self, request, call_next):
+        response: Response = await call_next(request)
+        if response.status_code >= 400 or "application/json" not in (response.headers.get("content-type") or ""):
+            return response
+        body = b""
+        async for chunk in response.body_iterator:
+            body += chunk
+        original = json.loads(body.decode("utf-8"))
+        if isinstance(original, dict) and "status" in original and ("data" in original or "error" in original):
+            return JSONResponse(status_code=response.status_code, content=original)
+        return JSONResponse(status_code=response.status_code, content={"status": True, "data": original})
+
+
+SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/accounts",
+    "raw_path": b"/accounts",
+    "query_string": b"",
+    "headers": [],
+    "http_version": "1.1",
+    "scheme": "http",
+    "server": ("test", 80),
+    "client": ("test", 1),
+    "root_path": "",
+}
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+def _per_request_ms(app, n: int, *, rounds: int = 5) -> float:
+    async def run() -> float:
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(n):
+                await app(dict(SCOPE), _receive, _send)
+            best = min(best, (time.perf_counter() - start) / n * 1000)
+        return best
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [25, 200]
+    accounts = list(synthetic_accounts(max(sizes)).values())
+    for size in sizes:
+        page = {
+            "page": 1,
+            "page_size": size,
+            "total_items": 10**6,
+            "total_pages": 40_000,
+            "items": [account_to_record(a) for a in accounts[:size]],
+            "next_cursor": None,
+        }
+        endpoint = JSONResponse({"status": True, "data": page})
+        n = 2000 if size <= 50 else 500
+
+        bare = _per_request_ms(endpoint, n)
+        old = _per_request_ms(ReparseMiddleware(endpoint), n) - bare
+        new = _per_request_ms(UniformResponseMiddleware(endpoint), n) - bare
+        print(
+            f"page_size {size:>4} ({len(endpoint.body) / 1024:,.0f} KiB): "
+            f"re-parse +{old:.3f} ms   pure ASGI +{new:.3f} ms per request"
+        )
+
+
+if __name__ == "__main__":
+    main()
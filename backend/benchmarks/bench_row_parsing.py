@@ -0,0 +1,37 @@
+"""Rows/sec of CSV aggregation in strict (per-row Pydantic) vs fast parse mode.
+
+Run from backend/: python benchmarks/bench_row_parsing.py [n_rows]
+
+Accounts are still validated once at the storage boundary, so the gain grows with the
+number of rows each account spans.
+"""
+import csv
+import logging
+import sys
+from io import BytesIO
+
+from bench_common import best_of, synthetic_csv
+
+from services.aggregation import ParseMode, aggregate_rows, iter_chunks, iter_csv_lines
+
+
+def _run(csv_bytes: bytes, mode: ParseMode) -> None:
+    aggregate_rows(csv.DictReader(iter_csv_lines(iter_chunks(BytesIO(csv_bytes)))), mode=mode)
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    for rows_per_account in (1, 4):
+        csv_bytes = synthetic_csv(n_rows, rows_per_account=rows_per_account)
+        results = {mode: n_rows / best_of(lambda: _run(csv_bytes, mode)) for mode in ParseMode}
+
+        print(f"{n_rows:,} rows, {rows_per_account} row(s) per account")
+        for mode, rows_per_sec in results.items():
+            print(f"  {mode.value:>6}: {rows_per_sec:>12,.0f} rows/sec")
+        print(f"  speedup: {results[ParseMode.fast] / results[ParseMode.strict]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Account-manager rule evaluation: one pass per rule vs the fused single-pass RuleEngine.
+
+Run from backend/: python benchmarks/bench_rules.py [n_accounts ...]
+
+"objects" walks the account models once per rule, "masks" re-implements the previous
+per-rule column masks, "fused" is summary.account_manager_engine(). Reads count every
+attribute traversal (objects) or column element read (masks, fused), measured on a sample.
+"""
+import operator
+import sys
+from dataclasses import replace
+from itertools import islice
+
+from bench_common import best_of, synthetic_accounts
+from pydantic import BaseModel
+
+from models.subscription import SubscriptionStatus
+from services.columns import AccountColumns, Mask, positions_of
+from services.insights import summary
+from services.store import STORE
+
+SAMPLE = 20_000
+READS = 0
+
+
+class _Counted:
+    """Proxy counting every attribute traversal through a model."""
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        global READS
+        READS += 1
+        value = getattr(self._target, name)
+        return _Counted(value) if isinstance(value, BaseModel) else value
+
+
+class _CountedColumn(list):
+    def __iter__(self):
+        global READS
+        READS += len(self)
+        return super().__iter__()
+
+
+class _CountedStatus(bytes):
+    def __iter__(self):
+        global READS
+        READS += len(self)
+        return super().__iter__()
+
+
+def _objects(accounts) -> list[list]:
+    inactive, active = SubscriptionStatus.inactive, SubscriptionStatus.active
+    seats = lambda s: s.admin_seats + s.user_seats + s.read_only_seats
+    return [
+        [a for a in accounts if a.subscription.status == inactive and (a.usage.messages_processed > 0 or a.usage.notifications_sent > 0 or a.usage.notifications_billed > 0)],
+        [a for a in accounts if a.subscription.status == active and a.usage.messages_processed == 0 and a.usage.notifications_sent == 0 and a.usage.automation_count == 0],
+        [
+            a
+            for a in accounts
+            if a.subscription.status == active
+            and (
+                (seats(a.subscription) >= 10 and a.usage.messages_processed <= 5 and a.usage.notifications_sent <= 5 and a.usage.automation_count == 0)
+                or (seats(a.subscription) <= 2 and a.usage.notifications_sent >= 200)
+            )
+        ],
+        [a for a in accounts if a.usage.notifications_sent > 0 and (a.usage.notifications_billed == 0 or a.usage.notifications_billed > a.usage.notifications_sent)],
+    ]
+
+
+# The previous per-rule mask helpers: comparisons run in C through map(), combinations as big-int bitwise ops
+
+
+def gt(column, value: int) -> Mask:
+    return bytes(map(value.__lt__, column))
+
+
+def ge(column, value: int) -> Mask:
+    return bytes(map(value.__le__, column))
+
+
+def le(column, value: int) -> Mask:
+    return bytes(map(value.__ge__, column))
+
+
+def eq(column, value: int) -> Mask:
+    return bytes(map(value.__eq__, column))
+
+
+def _combine(masks, op) -> Mask:
+    n = len(masks[0])
+    acc = int.from_bytes(masks[0], "little")
+    for m in masks[1:]:
+        acc = op(acc, int.from_bytes(m, "little"))
+    return acc.to_bytes(n, "little")
+
+
+def all_of(*masks: Mask) -> Mask:
+    return _combine(masks, operator.and_)
+
+
+def any_of(*masks: Mask) -> Mask:
+    return _combine(masks, operator.or_)
+
+
+def _status(c: AccountColumns, status: SubscriptionStatus):
+    global READS
+    READS += len(c.status)
+    return c.status_mask(status)
+
+
+def _masks(c: AccountColumns) -> list[list[int]]:
+    inactive, active = _status(c, SubscriptionStatus.inactive), _status(c, SubscriptionStatus.active)
+    messages, sent, billed, automation = (c[f] for f in ("messages_processed", "notifications_sent", "notifications_billed", "automation_count"))
+    seats = [a + u + r for a, u, r in zip(c["admin_seats"], c["user_seats"], c["read_only_seats"])]
+    return [
+        positions_of(all_of(inactive, any_of(gt(messages, 0), gt(sent, 0), gt(billed, 0)))),
+        positions_of(all_of(active, eq(messages, 0), eq(sent, 0), eq(automation, 0))),
+        positions_of(
+            all_of(
+                _status(c, SubscriptionStatus.active),
+                any_of(
+                    all_of(ge(seats, 10), le(messages, 5), le(sent, 5), eq(automation, 0)),
+                    all_of(le(seats, 2), ge(sent, 200)),
+                ),
+            )
+        ),
+        positions_of(all_of(gt(sent, 0), any_of(eq(billed, 0), bytes(map(int.__gt__, billed, sent))))),
+    ]
+
+
+def _counted_columns(columns: AccountColumns) -> AccountColumns:
+    return replace(
+        columns,
+        status=_CountedStatus(columns.status),
+        ints={name: _CountedColumn(values) for name, values in columns.ints.items()},
+    )
+
+
+def _reads_per_account(fn, data, n: int) -> float:
+    global READS
+    READS = 0
+    fn(data)
+    return READS / n
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000_000]
+    engine = summary.account_manager_engine()
+    for n in sizes:
+        accounts = synthetic_accounts(n)
+        columns = AccountColumns.build(accounts)
+        values = list(accounts.values())
+        fused = engine.evaluate(columns)
+        assert _masks(columns) == [fused[r.name] for r in summary.ACCOUNT_MANAGER_RULES]
+
+        sample = dict(islice(accounts.items(), SAMPLE))
+        sample_columns = _counted_columns(AccountColumns.build(sample))
+        k = len(sample)
+        reads = {
+            "objects": _reads_per_account(_objects, [_Counted(a) for a in sample.values()], k),
+            "masks": _reads_per_account(_masks, sample_columns, k),
+            "fused": _reads_per_account(engine.evaluate, sample_columns, k),
+        }
+        times = {
+            "objects": best_of(lambda: _objects(values), repeat=1),
+            "masks": best_of(lambda: _masks(columns)),
+            "fused": best_of(lambda: engine.evaluate(columns)),
+        }
+
+        print(f"{n:,} accounts, {len(summary.ACCOUNT_MANAGER_RULES)} rules")
+        for name in ("objects", "masks", "fused"):
+            print(f"  {name:<8} {times[name] * 1000:>9,.1f} ms   {reads[name]:>5.1f} reads/account")
+        print(f"  account manager summary {best_of(lambda: summary.account_manager_summary_from(columns)) * 1000:,.1f} ms")
+        STORE.set(source="bench", accounts=accounts)
+        summary.account_manager_summary()
+        print(f"  cached per rule set and version {best_of(summary.account_manager_summary) * 1000:,.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Serialization cost of one accounts page: dicts + response_model vs cached JSON fragments.
+
+Run from backend/: python benchmarks/bench_serialization.py [page_size ...]
+
+"validated" builds record dicts and validates/dumps them through the response model the way
+FastAPI did for every request; "fragments" is get_records_json with a warm per-snapshot cache.
+Both include the same query work, which is also timed alone.
+"""
+import sys
+
+from bench_common import best_of, synthetic_accounts
+
+from models.api_responses import AccountsPageDTO, ApiSuccessResponse
+from services.insights.accounts_query import SortBy, _select_page, get_records, get_records_json
+from services.store import STORE
+
+RESPONSE = ApiSuccessResponse[AccountsPageDTO]
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [25, 200]
+    STORE.set(source="bench", accounts=synthetic_accounts(100_000))
+    for size in sizes:
+        kwargs = dict(page=3, page_size=size, sort_by=SortBy.total_records)
+        get_records_json(**kwargs)  # warm the fragment cache
+
+        query = best_of(lambda: _select_page(**kwargs), repeat=50)
+        validated = best_of(
+            lambda: RESPONSE.model_validate({"status": True, "data": get_records(**kwargs)}).model_dump_json(), repeat=50
+        )
+        fragments = best_of(lambda: get_records_json(**kwargs), repeat=50)
+        print(
+            f"page_size {size:>4}: query {query * 1000:6.3f} ms   serialization: validated "
+            f"{(validated - query) * 1000:6.3f} ms   fragments {(fragments - query) * 1000:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
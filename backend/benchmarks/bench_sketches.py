@@ -0,0 +1,61 @@
+"""Exact title Counter vs WorkflowSketch (HyperLogLog + count-min + heavy hitters) at scale.
+
+Run from backend/: python benchmarks/bench_sketches.py [distinct_titles ...]
+
+Title frequencies follow a Zipf law scaled so there are ~20 account-workflow pairs per distinct
+title; updates arrive as per-ingest title deltas, as AccountTotals.with_changes applies them.
+"""
+import sys
+import tracemalloc
+from collections import Counter
+
+from bench_common import best_of
+
+from services.sketches import WorkflowSketch
+
+
+def _counts(distinct: int) -> dict[str, int]:
+    scale = 20 * distinct / sum(1 / r for r in range(1, distinct + 1))
+    return {f"Workflow {r}": max(1, round(scale / r)) for r in range(1, distinct + 1)}
+
+
+def _allocated(build) -> tuple[object, int]:
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [100_000, 1_000_000]
+    for distinct in sizes:
+        counts = _counts(distinct)
+        pairs = sum(counts.values())
+
+        def build_sketch() -> WorkflowSketch:
+            sketch = WorkflowSketch()
+            sketch.update(counts)
+            return sketch
+
+        exact, exact_bytes = _allocated(lambda: Counter(counts))
+        sketch, sketch_bytes = _allocated(build_sketch)
+        update_s = best_of(build_sketch, repeat=1)
+        expected = [t for t, _ in exact.most_common(10)]
+        found = [t for t, _ in sketch.top(10)]
+
+        print(f"{distinct:,} distinct titles, {pairs:,} account-workflow pairs (sketch update {update_s:,.1f} s)")
+        print(f"  memory     exact {exact_bytes / 2**20:>8.1f} MiB   sketch {sketch_bytes / 2**20:>8.2f} MiB")
+        print(
+            f"  top 10     exact {best_of(lambda: exact.most_common(10)) * 1000:>8.3f} ms   "
+            f"sketch {best_of(lambda: sketch.top(10)) * 1000:>8.3f} ms   ({len(set(found) & set(expected))}/10 agree)"
+        )
+        uncached = best_of(lambda: setattr(sketch.distinct, "_estimate", None) or sketch.distinct.count())
+        print(
+            f"  distinct   exact {len(exact):>12,}   sketch {sketch.distinct.count():>12,}   "
+            f"({uncached * 1000:.3f} ms, cached {best_of(sketch.distinct.count) * 1000:.4f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Latency of the summary/analytics functions on the store (columns, maintained totals) vs walking the models.
+
+Run from backend/: python benchmarks/bench_summaries.py [n_accounts ...]
+
+The "objects" column re-implements the previous per-account attribute walks as a baseline.
+"""
+import sys
+from collections import Counter
+
+from bench_common import best_of, synthetic_accounts
+
+from models.subscription import SubscriptionStatus
+from services.columns import AccountColumns
+from services.insights import analytics, summary
+from services.store import STORE
+
+
+def _objects_leadership(accounts) -> None:
+    sum(1 for a in accounts if a.subscription.status == SubscriptionStatus.active)
+    sum(len(a.workflows) for a in accounts)
+    len({w.title for a in accounts for w in a.workflows})
+    for field in ("automation_count", "messages_processed", "notifications_sent", "notifications_billed"):
+        sum(getattr(a.usage, field) for a in accounts)
+
+
+def _objects_account_manager(accounts) -> None:
+    inactive, active = SubscriptionStatus.inactive, SubscriptionStatus.active
+    lists = [
+        [a for a in accounts if a.subscription.status == inactive and (a.usage.messages_processed > 0 or a.usage.notifications_sent > 0 or a.usage.notifications_billed > 0)],
+        [a for a in accounts if a.subscription.status == active and a.usage.messages_processed == 0 and a.usage.notifications_sent == 0 and a.usage.automation_count == 0],
+        [a for a in accounts if a.subscription.status == active and (a.subscription.admin_seats + a.subscription.user_seats + a.subscription.read_only_seats) >= 10],
+        [a for a in accounts if a.usage.notifications_sent > 0 and (a.usage.notifications_billed == 0 or a.usage.notifications_billed > a.usage.notifications_sent)],
+    ]
+    for items in lists:
+        [{"account_uuid": str(a.account.account_uuid), "account_label": a.account.account_label} for a in items]
+
+
+def _objects_top_workflows(accounts) -> None:
+    Counter(w.title for a in accounts for w in a.workflows).most_common(10)
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or [100_000]
+    for n in sizes:
+        accounts = synthetic_accounts(n)
+        build = best_of(lambda: AccountColumns.build(accounts), repeat=1)
+        STORE.set(source="bench", accounts=accounts)
+        values = list(accounts.values())
+
+        cases = [
+            ("leadership summary", lambda: _objects_leadership(values), summary.leadership_summary),
+            ("account manager summary", lambda: _objects_account_manager(values), summary.account_manager_summary),
+            ("top workflows", lambda: _objects_top_workflows(values), analytics.top_workflows),
+            ("usage by status", None, analytics.usage_by_subscription_status),
+        ]
+        print(f"{n:,} accounts (columns built in {build * 1000:,.0f} ms)")
+        for name, objects, columnar in cases:
+            columnar_ms = best_of(columnar) * 1000
+            objects_ms = best_of(objects) * 1000 if objects else float("nan")
+            print(f"  {name:<24} objects {objects_ms:>9,.1f} ms   store {columnar_ms:>9,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import hashlib
+import secrets
+from typing import Optional
+
+from fastapi import Request, Response
+
+from services.store import STORE
+
+# Store versions restart at 0 in every process: tags also name the process, so a restarted
+# server (or another worker) never matches a tag issued for different data
+BOOT_ID = secrets.token_hex(4)
+
+
+class NotModified(Exception):
+    """Raised before an endpoint runs when the client already holds the current payload."""
+
+    def __init__(self, etag: str) -> None:
+        super().__init__(etag)
+        self.etag = etag
+
+
+def etag_for(request: Request, version: int) -> str:
+    # Same data version + same path and query (in any parameter order) => same payload
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    digest = hashlib.blake2b(f"{request.url.path}?{query}".encode("utf-8"), digest_size=8).hexdigest()
+    # Weak: the uniform-response middleware may re-encode the body
+    return f'W/"{BOOT_ID}-{version}-{digest}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    # If-None-Match uses weak comparison
+    return "*" in tags or etag.removeprefix("W/") in (t.removeprefix("W/") for t in tags)
+
+
+def conditional_get(request: Request, response: Response) -> None:
+    """Router dependency: 304 for a matching If-None-Match, otherwise tag the response.
+
+    The version is read before the endpoint, so a tag can only be older than the data it labels;
+    an ingest landing in between costs the client one extra download, never a stale 304.
+    """
+    # Only safe reads are cacheable; a POST's payload also depends on its body
+    if request.method not in ("GET", "HEAD"):
+        return
+    etag = etag_for(request, STORE.version)
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise NotModified(etag)
+    response.headers["ETag"] = etag
+    # Authenticated data: browsers may keep it but must revalidate before reuse
+    response.headers["Cache-Control"] = "private, no-cache"
@@ -2,9 +2,13 @@ import json
 from typing import Any
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.conditional import NotModified
 
 
 def _error_payload(message: str, details: Any = None) -> dict[str, Any]:
@@ -14,55 +18,99 @@ def _error_payload(message: str, details: Any = None) -> dict[str, Any]:
     return err
 
 
-class UniformResponseMiddleware(BaseHTTPMiddleware):
-    
-    def __init__(self, app: Any, *, exclude_paths: set[str] | None = None) -> None:
-        super().__init__(app)
-        self.exclude_paths = exclude_paths or {"/openapi.json", "/docs", "/redoc"}
+class PreEncodedJSONResponse(Response):
+    """A body the service layer already encoded (and enveloped); sent as-is, never re-validated."""
 
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
+    media_type = "application/json"
 
-        if request.url.path in self.exclude_paths:
-            return response
 
-        if response.status_code >= 400:
-            return response
+# ApiSuccessResponse bodies (and error payloads) start with exactly these bytes; anything else,
+# even another {"status": ...} object, goes through _envelope's full check
+_ENVELOPE_PREFIXES = (b'{"status":true,"data":', b'{"status":false,')
 
-        content_type = (response.headers.get("content-type") or "").lower()
-        if "application/json" not in content_type:
-            return response
 
-        # Read the original JSON body
-        body = b""
-        async for chunk in response.body_iterator:
-            body += chunk
+def _envelope(body: bytes) -> bytes | None:
+    """Wrapped body for a non-enveloped JSON payload, or None to pass it through unchanged."""
+    if not body:
+        return b'{"status":true,"data":null}'
+    try:
+        original = json.loads(body.decode("utf-8"))
+    except Exception:
+        # If it isn't valid JSON, return it unchanged
+        return None
+    # Avoid double-wrapping if already shaped
+    if isinstance(original, dict) and "status" in original and ("data" in original or "error" in original):
+        return None
+    return b'{"status":true,"data":' + body + b"}"
+
 
-        if not body:
-            return JSONResponse(status_code=response.status_code, content={"status": True, "data": None})
+class UniformResponseMiddleware:
+    """Pure ASGI middleware wrapping successful JSON bodies as {"status": true, "data": ...}.
 
-        try:
-            original = json.loads(body.decode("utf-8"))
-        except Exception:
-            # If it isn't valid JSON, return it unchanged
-            return Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type,
-            )
+    Bodies that already start with the envelope stream through untouched, so the hot path never
+    buffers, parses or re-encodes. Anything else is buffered and wrapped by concatenation; only
+    those bodies are parsed, to keep the old already-shaped and invalid-JSON checks.
+    """
 
-        # Avoid double-wrapping if already shaped
-        if isinstance(original, dict) and "status" in original and ("data" in original or "error" in original):
-            return JSONResponse(status_code=response.status_code, content=original)
+    def __init__(self, app: ASGIApp, *, exclude_paths: set[str] | None = None) -> None:
+        self.app = app
+        self.exclude_paths = exclude_paths or {"/openapi.json", "/docs", "/redoc"}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
 
-        return JSONResponse(status_code=response.status_code, content={"status": True, "data": original})
+        start: Message | None = None
+        body = b""
+        passthrough = True
+
+        async def send_wrapped(message: Message) -> None:
+            nonlocal start, body, passthrough
+            if message["type"] == "http.response.start":
+                content_type = Headers(raw=message["headers"]).get("content-type", "").lower()
+                status = message["status"]
+                if 200 <= status < 400 and status != 304 and "application/json" in content_type:
+                    # Hold the start message until the body shows whether it needs wrapping
+                    start, passthrough = message, False
+                    return
+                await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if body.startswith(_ENVELOPE_PREFIXES):
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+            if more_body:
+                return
+
+            wrapped = _envelope(body)
+            if wrapped is not None:
+                headers = MutableHeaders(raw=list(start["headers"]))
+                headers["content-length"] = str(len(wrapped))
+                start = {**start, "headers": headers.raw}
+                body = wrapped
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapped)
 
 
 def install_response_handling(app: FastAPI) -> None:
     # Success wrapper
     app.add_middleware(UniformResponseMiddleware)
 
+    @app.exception_handler(NotModified)
+    async def not_modified_handler(request: Request, exc: NotModified):
+        return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "private, no-cache"})
+
     # Error formatting
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
@@ -81,7 +129,8 @@ def install_response_handling(app: FastAPI) -> None:
             content={
                 "status": False,
                 "data": None,
-                "error": _error_payload("Validation error", details=exc.errors()),
+                # Validator errors carry the raised exception in their context; encode it like FastAPI does
+                "error": _error_payload("Validation error", details=jsonable_encoder(exc.errors())),
             },
         )
 
@@ -1,34 +1,63 @@
-from typing import Optional
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Response
+from fastapi.responses import StreamingResponse
+from pydantic import Field
 
+from models.aggregate import AggregateRequest
 from models.api_responses import (
     AccountsPageDTO,
+    AggregateResultDTO,
     ApiSuccessResponse,
     ChartDTO,
+    DashboardDTO,
     SummaryData,
     UsageBySubscriptionStatusDTO,
+    UsageDistributionDTO,
 )
+from services.insights.aggregate import aggregate
 from services.insights.analytics import (
+    UsageField,
     notifications_sent_vs_billed,
     subscriptions_by_status,
     top_workflows,
     usage_by_subscription_status,
+    usage_distribution,
 )
-from services.insights.accounts_query import SortBy, SortDir, get_records
-from services.insights.summary import Audience, get_summary
+from services.insights.accounts_export import MEDIA_TYPES, ExportFormat, export_accounts
+from services.insights.accounts_query import SortBy, SortDir, get_records_json
+from services.insights.dashboard import get_dashboard
+from services.insights.summary import DEFAULT_RULE_SET, Audience, get_summary
+from common.conditional import conditional_get
+from common.response import PreEncodedJSONResponse
 from services.auth.dependencies import get_current_email
 
-router = APIRouter(prefix="/api/insights", tags=["insights"], dependencies=[Depends(get_current_email)])
+router = APIRouter(
+    prefix="/api/insights",
+    tags=["insights"],
+    dependencies=[Depends(get_current_email), Depends(conditional_get)],
+)
 
 
 @router.get("/summary", response_model=ApiSuccessResponse[SummaryData])
-def summary(audience: Audience = Query(Audience.leadership)):
-    return {"status": True, "data": get_summary(audience=audience)}
+def summary(
+    audience: Audience = Query(Audience.leadership),
+    rule_set: str = Query(DEFAULT_RULE_SET, description="Named account-manager thresholds (INSIGHTS_RULE_SETS)"),
+):
+    return {"status": True, "data": get_summary(audience=audience, rule_set=rule_set)}
+
+
+@router.get("/dashboard", response_model=ApiSuccessResponse[DashboardDTO])
+def dashboard(
+    top_workflows_limit: int = Query(10, ge=1, le=100),
+    rule_set: str = Query(DEFAULT_RULE_SET, description="Named account-manager thresholds (INSIGHTS_RULE_SETS)"),
+):
+    return {"status": True, "data": get_dashboard(top_workflows_limit=top_workflows_limit, rule_set=rule_set)}
 
 
 @router.get("/accounts", response_model=ApiSuccessResponse[AccountsPageDTO])
 def accounts_query(
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=200),
     account_uuid: Optional[str] = Query(None, description="A uuid string"),
@@ -37,8 +66,10 @@ def accounts_query(
     workflow_title: Optional[str] = Query(None, description="Exact match on workflow title (case-insensitive)"),
     sort_by: SortBy = Query(SortBy.account_label),
     sort_dir: SortDir = Query(SortDir.asc),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides 'page'"),
 ):
-    return {"status": True, "data": get_records(
+    # response_model documents the shape; the body is built from cached record fragments and skips validation
+    body = get_records_json(
         page=page,
         page_size=page_size,
         account_uuid=account_uuid,
@@ -47,7 +78,39 @@ def accounts_query(
         workflow_title=workflow_title,
         sort_by=sort_by,
         sort_dir=sort_dir,
-    )}
+        cursor=cursor,
+    )
+    # Headers set by dependencies (ETag) live on `response`; a returned Response must carry them itself
+    return PreEncodedJSONResponse(content=body, headers=response.headers)
+
+
+@router.get("/accounts/export", response_class=StreamingResponse)
+def accounts_export(
+    response: Response,
+    format: ExportFormat = Query(ExportFormat.csv),
+    account_uuid: Optional[str] = Query(None, description="A uuid string"),
+    status: Optional[str] = Query(None, description="active|inactive"),
+    search: Optional[str] = Query(None, description="Case-insensitive substring match on account_label"),
+    workflow_title: Optional[str] = Query(None, description="Exact match on workflow title (case-insensitive)"),
+    sort_by: SortBy = Query(SortBy.account_label),
+    sort_dir: SortDir = Query(SortDir.asc),
+):
+    chunks = export_accounts(
+        format=format,
+        account_uuid=account_uuid,
+        status=status,
+        search=search,
+        workflow_title=workflow_title,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+    )
+    headers = {**response.headers, "Content-Disposition": f'attachment; filename="accounts.{format.value}"'}
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[format], headers=headers)
+
+
+@router.post("/aggregate", response_model=ApiSuccessResponse[AggregateResultDTO])
+def aggregate_accounts(body: AggregateRequest):
+    return {"status": True, "data": aggregate(body)}
 
 
 @router.get("/analytics/subscriptions-by-status", response_model=ApiSuccessResponse[ChartDTO])
@@ -67,4 +130,14 @@ def analytics_top_workflows(limit: int = Query(10, ge=1, le=100)):
 
 @router.get("/analytics/usage/by-subscription-status", response_model=ApiSuccessResponse[UsageBySubscriptionStatusDTO])
 def analytics_usage_by_subscription_status():
-    return {"status": True, "data": usage_by_subscription_status()}
\ No newline at end of file
+    return {"status": True, "data": usage_by_subscription_status()}
+
+@router.get("/analytics/usage/distribution", response_model=ApiSuccessResponse[UsageDistributionDTO])
+def analytics_usage_distribution(
+    field: UsageField = Query(UsageField.messages_processed),
+    status: Optional[str] = Query(None, description="active|inactive; all accounts when omitted"),
+    q: list[Annotated[float, Field(ge=0, le=100)]] = Query(
+        [50, 90, 99], min_length=1, max_length=20, description="1 to 20 percentiles between 0 and 100"
+    ),
+):
+    return {"status": True, "data": usage_distribution(field=field, status=status, quantiles=q)}
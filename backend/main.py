@@ -9,6 +9,8 @@ from controllers.ingestion import router as ingestion_router
 from controllers.insights import router as insights_router
 from controllers.auth import router as auth_router
 from services.csv_ingestion import init_expected_headers_from_starter, ingest_path
+from services.ingestion_jobs import JOBS
+from services.insights.config import get_insights_settings
 from common.response import install_response_handling
 from dotenv import load_dotenv
 
@@ -21,10 +23,13 @@ STARTER_CSV = Path(__file__).resolve().parent / "sample_data.csv"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup; a malformed INSIGHTS_RULE_SETS fails here instead of on the first request
+    get_insights_settings()
     init_expected_headers_from_starter(STARTER_CSV)
     ingest_path(STARTER_CSV, source=f"startup:{STARTER_CSV.name}")
     yield
+    # Shutdown
+    JOBS.shutdown()
 
 
 
@@ -0,0 +1,85 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class GroupBy(str, Enum):
+    status = "status"
+    workflow_title = "workflow_title"
+    seat_bucket = "seat_bucket"
+
+
+class AggregateOp(str, Enum):
+    count = "count"
+    sum = "sum"
+    mean = "mean"
+    min = "min"
+    max = "max"
+    percentile = "percentile"
+
+
+class MetricField(str, Enum):
+    admin_seats = "admin_seats"
+    user_seats = "user_seats"
+    read_only_seats = "read_only_seats"
+    seats_total = "seats_total"
+    total_records = "total_records"
+    automation_count = "automation_count"
+    messages_processed = "messages_processed"
+    notifications_sent = "notifications_sent"
+    notifications_billed = "notifications_billed"
+
+
+class Aggregation(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    op: AggregateOp
+    field: Optional[MetricField] = None
+    # Percentile rank for op=percentile, linearly interpolated between accounts
+    q: Optional[float] = Field(default=None, ge=0, le=100)
+
+    @model_validator(mode="after")
+    def _check_arguments(self) -> "Aggregation":
+        if (self.op == AggregateOp.count) != (self.field is None):
+            raise ValueError("'field' is required for every op except count")
+        if (self.op == AggregateOp.percentile) != (self.q is not None):
+            raise ValueError("'q' is required for op=percentile, and only for it")
+        return self
+
+    @property
+    def name(self) -> str:
+        if self.op == AggregateOp.count:
+            return "count"
+        if self.op == AggregateOp.percentile:
+            return f"p{self.q:g}_{self.field.value}"
+        return f"{self.op.value}_{self.field.value}"
+
+
+class AccountFilters(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    account_uuid: Optional[str] = None
+    status: Optional[str] = None
+    search: Optional[str] = None
+    workflow_title: Optional[str] = None
+
+
+class AggregateRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    group_by: list[GroupBy] = Field(default_factory=list, max_length=3)
+    filters: AccountFilters = Field(default_factory=AccountFilters)
+    aggregations: list[Aggregation] = Field(min_length=1, max_length=20)
+    # Lower bounds of the seat_bucket groups over seats_total; the last bucket is open-ended
+    seat_buckets: list[int] = Field(default_factory=lambda: [0, 3, 10, 25], min_length=1, max_length=20)
+
+    @model_validator(mode="after")
+    def _check_unique(self) -> "AggregateRequest":
+        if len(set(self.group_by)) != len(self.group_by):
+            raise ValueError("'group_by' keys must be unique")
+        if len({a.name for a in self.aggregations}) != len(self.aggregations):
+            raise ValueError("'aggregations' must be unique")
+        if self.seat_buckets[0] != 0 or any(a >= b for a, b in zip(self.seat_buckets, self.seat_buckets[1:])):
+            raise ValueError("'seat_buckets' must start at 0 and be strictly increasing")
+        return self
@@ -24,6 +24,56 @@ class IngestionResult(BaseModel):
     records_loaded: int = Field(ge=0)
 
 
+class IngestionJobDTO(IngestionResult):
+    job_id: str
+    source: str
+    state: Literal["queued", "running", "succeeded", "failed"]
+    rows_processed: int = Field(ge=0)
+    rows_per_sec: float = Field(ge=0)
+    row_errors: int = Field(ge=0)
+    conflicts: int = Field(ge=0)
+    rows_unchanged: int = Field(ge=0)
+    rows_updated: int = Field(ge=0)
+    rows_new: int = Field(ge=0)
+    error: Optional[Any] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class RowErrorDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    row_number: int = Field(ge=1)
+    message: str
+    raw: dict[str, Any]
+    category: str
+
+
+class ConflictDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    account_uuid: str
+    row_number: int = Field(ge=1)
+    field: str
+    expected: Any
+    got: Any
+
+
+class IssuePageDTO(BaseModel, Generic[T]):
+    model_config = ConfigDict(extra="forbid")
+
+    page: int = Field(ge=1)
+    page_size: int = Field(ge=1, le=200)
+    total_items: int = Field(ge=0)
+    total_pages: int = Field(ge=1)
+    # Issues seen by the last ingest; more than total_items when the log hit its cap
+    total_seen: int = Field(ge=0)
+    truncated: bool
+    counts: dict[str, int]
+    items: list[T]
+
+
 class LeadershipAnalytics(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -137,11 +187,12 @@ class AccountRecordDTO(BaseModel):
 class AccountsPageDTO(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    page: int = Field(ge=1)
+    page: Optional[int] = Field(default=None, ge=1)
     page_size: int = Field(ge=1, le=200)
     total_items: int = Field(ge=0)
     total_pages: int = Field(ge=1)
     items: list[AccountRecordDTO]
+    next_cursor: Optional[str] = None
 
 
 class ChartDTO(BaseModel):
@@ -166,4 +217,48 @@ class UsageBySubscriptionStatusDTO(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     active: UsageTotalsDTO
-    inactive: UsageTotalsDTO
\ No newline at end of file
+    inactive: UsageTotalsDTO
+
+class QuantileDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    q: float = Field(ge=0, le=100)
+    value: Optional[float] = None
+
+
+class UsageDistributionDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    field: str
+    status: Optional[str] = None
+    accounts: int = Field(ge=0)
+    relative_accuracy: float
+    quantiles: list[QuantileDTO]
+    histogram: ChartDTO
+
+
+class DashboardDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    leadership: LeadershipSummary
+    account_manager: AccountManagerSummary
+    subscriptions_by_status: ChartDTO
+    notifications_sent_vs_billed: ChartDTO
+    top_workflows: ChartDTO
+    usage_by_subscription_status: UsageBySubscriptionStatusDTO
+
+
+class AggregateGroupDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    key: dict[str, Optional[str]]
+    values: dict[str, Optional[Union[int, float]]]
+
+
+class AggregateResultDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    group_by: list[str]
+    aggregations: list[str]
+    total_items: int = Field(ge=0)
+    groups: list[AggregateGroupDTO]
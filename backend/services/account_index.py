@@ -0,0 +1,400 @@
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import compress, islice
+from typing import Any, Iterator, Mapping, Optional, Sequence
+from uuid import UUID
+
+from models.account_aggregate import AccountAggregate
+from models.subscription import SubscriptionStatus
+from services.columns import STATUS_CODES, USAGE_FIELDS, AccountColumns
+
+# Sorted account positions (store order) matching one index key
+Postings = array
+
+# Label search indexes every distinct casefolded trigram; shorter needles fall back to a scan
+NGRAM = 3
+
+# Past this share of changed accounts, re-sorting everything beats patching the orderings
+REBUILD_FRACTION = 1 / 32
+
+
+class OrderPlan(str, Enum):
+    slice = "slice"  # everything selected: slice the precomputed ordering
+    walk = "walk"  # walk the ordering, keeping selected positions, until the page is full
+    heap = "heap"  # top-k selection over the selection
+    sort = "sort"  # stable sort of the whole selection
+
+
+# Rough per-element costs (microseconds, CPython 3.11) behind plan_order
+_SET_BUILD_COST = 0.07
+_WALK_STEP_COST = 0.2
+_HEAP_SCAN_COST = 0.1
+_HEAP_PUSH_COST = 0.25
+_SORT_COST = 0.016
+
+
+def plan_order(selected: int, total: int, stop: int) -> OrderPlan:
+    """Cheapest way to produce the first `stop` of `selected` positions (out of `total`) in key order."""
+    if selected == total:
+        return OrderPlan.slice
+    stop = min(stop, selected)
+    # Assumes filters are independent of the sort key: a match every total/selected steps
+    walk = _SET_BUILD_COST * selected + _WALK_STEP_COST * min(total, stop * total / max(selected, 1))
+    heap = _HEAP_SCAN_COST * selected + _HEAP_PUSH_COST * stop * math.log2(stop + 1)
+    sort = _SORT_COST * selected * math.log2(selected + 1)
+    return min((walk, OrderPlan.walk), (heap, OrderPlan.heap), (sort, OrderPlan.sort))[1]
+
+
+def _folded(label_lower: str) -> str:
+    # Shares the lowered string whenever casefolding changes nothing (almost always)
+    return label_lower if (f := label_lower.casefold()) == label_lower else f
+
+
+def _grams(label: str) -> set[str]:
+    return {label[i:i + NGRAM] for i in range(len(label) - NGRAM + 1)}
+
+
+def _title_keys(columns: AccountColumns, pos: int) -> set[str]:
+    offsets, codes, titles = columns.workflow_offsets, columns.workflow_codes, columns.workflow_titles
+    return {titles[code].lower() for code in codes[offsets[pos]:offsets[pos + 1]]}
+
+
+def _patch_postings(postings: Postings, removed: set[int], added: set[int]) -> Postings:
+    """`postings` without `removed` and with `added`, still sorted; untouched runs are copied slice-wise."""
+    removed, added = removed - added, added - removed
+    if not removed and not added:
+        return postings
+    patched = array("q")
+    start = 0
+    for pos in sorted(removed | added):
+        i = bisect_left(postings, pos, start)
+        patched.extend(postings[start:i])
+        if pos in added:
+            patched.append(pos)
+        else:
+            i += 1
+        start = i
+    patched.extend(postings[start:])
+    return patched
+
+
+def _patch_ordering(
+    order: array, old_values: Sequence, values: Sequence, replaced: list[int], changed: list[int], descending: bool
+) -> array:
+    """`order` re-sorted after the accounts at `changed` (ascending) took their values from `values`.
+
+    Positions are located in the old ordering by binary search: replaced ones by their old key,
+    changed ones by their new key among the entries that keep theirs.
+    """
+    cuts = [(_first_after(order, old_values, old_values[p], p, descending) - 1, 1, p) for p in replaced]
+    moved = sorted(changed, key=values.__getitem__, reverse=descending)
+    cuts += [(_first_after(order, old_values, values[p], p, descending), 0, p) for p in moved]
+    # Insertions at an index go before the entry there (which may itself be removed); sort is stable for ties
+    cuts.sort(key=lambda c: (c[0], c[1]))
+    patched = array("q")
+    start = 0
+    for i, removal, p in cuts:
+        patched.extend(order[start:i])
+        start = i
+        if removal:
+            start = i + 1
+        else:
+            patched.append(p)
+    patched.extend(order[start:])
+    return patched
+
+
+@dataclass(frozen=True)
+class AccountIndex:
+    """Secondary indexes for the /api/insights/accounts filters, kept up to date per ingest.
+
+    Entries are positions into `accounts` (the store's dict order, as in AccountColumns),
+    so intersecting filters never touches the account models.
+    """
+
+    accounts: list[AccountAggregate] = field(default_factory=list)
+    positions: Mapping[UUID, int] = field(default_factory=dict)
+    status: bytes = b""
+    by_status: dict[SubscriptionStatus, Postings] = field(default_factory=dict)
+    # Lowercased workflow title -> positions of the accounts listing it
+    by_title: dict[str, Postings] = field(default_factory=dict)
+    labels_lower: list[str] = field(default_factory=list)
+    # Casefolded labels for search, and trigram -> positions of the labels containing it
+    labels_folded: list[str] = field(default_factory=list)
+    by_trigram: dict[str, Postings] = field(default_factory=dict)
+    # Sort key -> (ascending, descending) permutations of all positions; ties keep store order
+    orderings: dict[str, tuple[array, array]] = field(default_factory=dict)
+    sort_values: dict[str, Sequence] = field(default_factory=dict)
+    # JSON-encoded account records by position, filled on first use (services/insights/serializers.py)
+    record_json: list[Optional[bytes]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    @classmethod
+    def build(cls, accounts: Mapping[UUID, AccountAggregate], columns: AccountColumns) -> "AccountIndex":
+        by_status = {s: array("q", compress(range(len(columns)), columns.status_mask(s))) for s in SubscriptionStatus}
+
+        lowered = [t.lower() for t in columns.workflow_titles]
+        by_title: dict[str, Postings] = {}
+        offsets, codes = columns.workflow_offsets, columns.workflow_codes
+        for pos in range(len(columns)):
+            for code in codes[offsets[pos]:offsets[pos + 1]]:
+                postings = by_title.setdefault(lowered[code], array("q"))
+                # Titles differing only in case map to one key; list the account once
+                if not postings or postings[-1] != pos:
+                    postings.append(pos)
+
+        labels_lower = [label.lower() for label in columns.labels]
+        labels_folded = list(map(_folded, labels_lower))
+        trigram_lists: defaultdict[str, list[int]] = defaultdict(list)
+        for pos, label in enumerate(labels_folded):
+            for gram in _grams(label):
+                trigram_lists[gram].append(pos)
+        by_trigram = {gram: array("q", ps) for gram, ps in trigram_lists.items()}
+
+        sort_values = {"account_label": labels_lower, **{name: columns[name] for name in USAGE_FIELDS}}
+        positions = range(len(columns))
+        orderings = {
+            name: (
+                array("q", sorted(positions, key=values.__getitem__)),
+                array("q", sorted(positions, key=values.__getitem__, reverse=True)),
+            )
+            for name, values in sort_values.items()
+        }
+
+        return cls(
+            accounts=list(accounts.values()),
+            positions=columns.positions,
+            status=columns.status,
+            by_status=by_status,
+            by_title=by_title,
+            labels_lower=labels_lower,
+            labels_folded=labels_folded,
+            by_trigram=by_trigram,
+            orderings=orderings,
+            sort_values=sort_values,
+            record_json=[None] * len(columns),
+        )
+
+    def with_changes(
+        self, before: AccountColumns, columns: AccountColumns, changed: Mapping[UUID, AccountAggregate]
+    ) -> "AccountIndex":
+        """Next index after `changed` accounts were replaced or appended, as in AccountColumns.with_changes.
+
+        `self` must index `before`, and `columns` must be `before.with_changes(changed)`. Postings
+        and orderings are patched at the changed positions, so the cost is a copy of each
+        structure plus O(log n) work per changed account, not a re-sort of the store.
+        """
+        if not changed:
+            return self
+        if len(changed) > REBUILD_FRACTION * len(columns):
+            accounts = list(self.accounts)
+            accounts.extend([None] * (len(columns) - len(accounts)))
+            for u, agg in changed.items():
+                accounts[columns.positions[u]] = agg
+            return AccountIndex.build(dict(zip(columns.uuids, accounts)), columns)
+
+        n_before = len(before)
+        changed_pos = sorted(columns.positions[u] for u in changed)
+        replaced = [p for p in changed_pos if p < n_before]
+
+        accounts = list(self.accounts)
+        accounts.extend([None] * (len(columns) - n_before))
+        record_json = list(self.record_json)
+        record_json.extend([None] * (len(columns) - n_before))
+        for u, agg in changed.items():
+            p = columns.positions[u]
+            accounts[p] = agg
+            record_json[p] = None
+
+        by_status = {
+            s: _patch_postings(
+                postings,
+                {p for p in replaced if before.status[p] == STATUS_CODES[s]},
+                {p for p in changed_pos if columns.status[p] == STATUS_CODES[s]},
+            )
+            for s, postings in self.by_status.items()
+        }
+
+        title_changes: defaultdict[str, tuple[set, set]] = defaultdict(lambda: (set(), set()))
+        for p in replaced:
+            for key in _title_keys(before, p):
+                title_changes[key][0].add(p)
+        for p in changed_pos:
+            for key in _title_keys(columns, p):
+                title_changes[key][1].add(p)
+        by_title = dict(self.by_title)
+        for key, (removed, added) in title_changes.items():
+            postings = _patch_postings(by_title.get(key, array("q")), removed, added)
+            if postings:
+                by_title[key] = postings
+            else:
+                by_title.pop(key, None)
+
+        labels_lower = list(self.labels_lower)
+        labels_folded = list(self.labels_folded)
+        gram_changes: defaultdict[str, tuple[set, set]] = defaultdict(lambda: (set(), set()))
+        for p in replaced:
+            for gram in _grams(labels_folded[p]):
+                gram_changes[gram][0].add(p)
+        for p in changed_pos:
+            low = columns.labels[p].lower()
+            if p < n_before:
+                labels_lower[p], labels_folded[p] = low, _folded(low)
+            else:
+                labels_lower.append(low)
+                labels_folded.append(_folded(low))
+            for gram in _grams(labels_folded[p]):
+                gram_changes[gram][1].add(p)
+        by_trigram = dict(self.by_trigram)
+        for gram, (removed, added) in gram_changes.items():
+            postings = _patch_postings(by_trigram.get(gram, array("q")), removed, added)
+            if postings:
+                by_trigram[gram] = postings
+            else:
+                by_trigram.pop(gram, None)
+
+        sort_values = {"account_label": labels_lower, **{name: columns[name] for name in USAGE_FIELDS}}
+        orderings = {
+            name: tuple(
+                _patch_ordering(order, self.sort_values[name], values, replaced, changed_pos, descending)
+                for descending, order in enumerate(self.orderings[name])
+            )
+            for name, values in sort_values.items()
+        }
+
+        return AccountIndex(
+            accounts=accounts,
+            positions=columns.positions,
+            status=columns.status,
+            by_status=by_status,
+            by_title=by_title,
+            labels_lower=labels_lower,
+            labels_folded=labels_folded,
+            by_trigram=by_trigram,
+            orderings=orderings,
+            sort_values=sort_values,
+            record_json=record_json,
+        )
+
+    def lookup_uuid(self, account_uuid: str) -> Postings:
+        try:
+            pos = self.positions.get(UUID(account_uuid.strip()))
+        except ValueError:
+            pos = None
+        return array("q") if pos is None else array("q", [pos])
+
+    def label_candidates(self, needle: str) -> Optional[Postings]:
+        """Positions whose label may contain `needle` (casefolded): those with its rarest trigram."""
+        if len(needle) < NGRAM:
+            return None
+        grams = {needle[i:i + NGRAM] for i in range(len(needle) - NGRAM + 1)}
+        return min((self.by_trigram.get(g, array("q")) for g in grams), key=len)
+
+    def select(
+        self,
+        *,
+        account_uuid: Optional[str] = None,
+        status: Optional[SubscriptionStatus] = None,
+        search: Optional[str] = None,
+        workflow_title: Optional[str] = None,
+    ) -> Sequence[int]:
+        """Positions of the accounts matching every given filter, in store order."""
+        postings: list[Postings] = []
+        if account_uuid:
+            postings.append(self.lookup_uuid(account_uuid))
+        if workflow_title:
+            postings.append(self.by_title.get(workflow_title.strip().lower(), array("q")))
+        needle = search.strip().casefold() if search else ""
+        grams = self.label_candidates(needle) if needle else None
+        if grams is not None:
+            postings.append(grams)
+
+        selected: Optional[Sequence[int]] = None
+        if postings:
+            # Start from the most selective list; each intersection costs O(len(other))
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for other in postings[1:]:
+                # Trigram hits are only a superset; the substring check below is cheaper than intersecting
+                if other is not grams:
+                    candidates.intersection_update(other)
+            selected = sorted(candidates)
+            if status is not None:
+                code = STATUS_CODES[status]
+                selected = [p for p in selected if self.status[p] == code]
+        elif status is not None:
+            selected = self.by_status[status]
+
+        if needle:
+            labels = self.labels_folded
+            selected = [p for p in (selected if selected is not None else range(len(labels))) if needle in labels[p]]
+
+        return range(len(self)) if selected is None else selected
+
+    def ordered(self, selected: Sequence[int], *, key: str, descending: bool, start: int, stop: int) -> list[int]:
+        """Positions [start:stop) of `selected` (store order) sorted by `key`, without sorting the whole store.
+
+        Every plan returns what a stable sort of `selected` would: equal keys keep store order.
+        """
+        plan = plan_order(len(selected), len(self), stop)
+        if plan == OrderPlan.slice:
+            return self.orderings[key][descending][start:stop].tolist()
+        if plan == OrderPlan.walk:
+            wanted = set(selected)
+            return list(islice(filter(wanted.__contains__, self.orderings[key][descending]), start, stop))
+        values = self.sort_values[key].__getitem__
+        if plan == OrderPlan.heap:
+            # nsmallest/nlargest are documented to equal sorted(...)[:n], ties included
+            top = heapq.nlargest if descending else heapq.nsmallest
+            return top(stop, selected, key=values)[start:stop]
+        return sorted(selected, key=values, reverse=descending)[start:stop]
+
+    def iter_ordered(self, selected: Sequence[int], *, key: str, descending: bool) -> Iterator[int]:
+        """All of `selected` in `key` order, lazily where the precomputed ordering allows it."""
+        order = self.orderings[key][descending]
+        if len(selected) == len(order):
+            return iter(order)
+        if plan_order(len(selected), len(order), len(selected)) == OrderPlan.walk:
+            return filter(set(selected).__contains__, order)
+        return iter(sorted(selected, key=self.sort_values[key].__getitem__, reverse=descending))
+
+    def ordered_after(
+        self, selected: Sequence[int], *, key: str, descending: bool, value: Any, position: int, limit: int
+    ) -> list[int]:
+        """Up to `limit` positions of `selected` that sort after (`value`, `position`) by `key`."""
+        order = self.orderings[key][descending]
+        values = self.sort_values[key]
+        if len(selected) == len(order):
+            start = _first_after(order, values, value, position, descending)
+            return order[start:start + limit].tolist()
+        if plan_order(len(selected), len(order), limit) == OrderPlan.walk:
+            start = _first_after(order, values, value, position, descending)
+            wanted = set(selected)
+            return list(islice(filter(wanted.__contains__, map(order.__getitem__, range(start, len(order)))), limit))
+        if descending:
+            rest = [p for p in selected if values[p] < value or (values[p] == value and p > position)]
+        else:
+            rest = [p for p in selected if values[p] > value or (values[p] == value and p > position)]
+        top = heapq.nlargest if descending else heapq.nsmallest
+        return top(limit, rest, key=values.__getitem__)
+
+
+def _first_after(order: array, values: Sequence, value: Any, position: int, descending: bool) -> int:
+    # Binary search over an ordering: keys are monotonic, ties are in ascending position order
+    lo, hi = 0, len(order)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        p = order[mid]
+        v = values[p]
+        if (v > value if descending else v < value) or (v == value and p <= position):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
@@ -1,19 +1,23 @@
+import codecs
 import csv
-import logging
+import io
 from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterable, Iterator, NamedTuple
 from uuid import UUID
 
 from pydantic import ValidationError
 
 from models.account import Account
 from models.account_aggregate import AccountAggregate
-from models.subscription import Subscription
+from models.subscription import Subscription, SubscriptionStatus
 from models.usage import Usage
 from models.workflow import Workflow
-
-logger = logging.getLogger(__name__)
+from services.ingest_logging import IssueReporter
+from services.issue_log import IssueLog
 
 # Required columns for a row to be ingested (non-blank)
 REQUIRED_FIELDS: list[str] = [
@@ -35,12 +39,76 @@ OPTIONAL_FIELDS: set[str] = {
     "Workflow Title",
 }
 
+# Uploads are read in fixed-size chunks so memory stays bounded regardless of file size
+CHUNK_SIZE = 64 * 1024
+
+# How often (in rows) aggregation publishes progress counters
+PROGRESS_EVERY = 4096
+
+# Compared between duplicate rows of the same account, in conflict-reporting order
+COMPARED_FIELDS: tuple[str, ...] = (
+    "account_label",
+    "subscription.status",
+    "subscription.admin_seats",
+    "subscription.user_seats",
+    "subscription.read_only_seats",
+    "usage.total_records",
+    "usage.automation_count",
+    "usage.messages_processed",
+    "usage.notifications_sent",
+    "usage.notifications_billed",
+)
+
+_STATUSES: dict[str, SubscriptionStatus] = {s.value: s for s in SubscriptionStatus}
+
+
+class ParseMode(str, Enum):
+    # fast: typed parsing of the raw csv fields, Pydantic only at the storage boundary
+    #       and for rows the fast parser cannot vouch for
+    # strict: Pydantic models for every row (reference behaviour)
+    fast = "fast"
+    strict = "strict"
+
+
+class ParsedRow(NamedTuple):
+    account_uuid: UUID
+    account_label: str
+    status: SubscriptionStatus
+    admin_seats: int
+    user_seats: int
+    read_only_seats: int
+    total_records: int
+    automation_count: int
+    messages_processed: int
+    notifications_sent: int
+    notifications_billed: int
+    workflow_title: str | None
+
+    def compared_values(self) -> tuple[Any, ...]:
+        # Same order as COMPARED_FIELDS
+        return self[1:11]
+
+
+@dataclass
+class IngestProgress:
+    # Updated in place by the aggregation loop and read concurrently by job status requests
+    rows_processed: int = 0
+    row_errors: int = 0
+    conflicts: int = 0
+    # Delta classification, known up front from the hashing pass; stays 0 with delta ingestion off
+    rows_unchanged: int = 0
+    rows_updated: int = 0
+    rows_new: int = 0
+    # Accounts in the store this ingest published; 0 until it has published
+    records_loaded: int = 0
+
 
 @dataclass(frozen=True)
 class RowError:
     row_number: int
     message: str
     raw: dict[str, Any]
+    category: str = "validation"  # no_header | missing_fields | validation
 
 
 @dataclass(frozen=True)
@@ -103,14 +171,148 @@ def _parse_row_models(row: dict[str, Any]) -> tuple[Account, Subscription, Usage
     return account, subscription, usage, workflow
 
 
+def _parsed_from_models(row: dict[str, Any]) -> ParsedRow:
+    account, subscription, usage, workflow = _parse_row_models(row)
+    return ParsedRow(
+        account.account_uuid,
+        account.account_label,
+        subscription.status,
+        subscription.admin_seats,
+        subscription.user_seats,
+        subscription.read_only_seats,
+        usage.total_records,
+        usage.automation_count,
+        usage.messages_processed,
+        usage.notifications_sent,
+        usage.notifications_billed,
+        workflow.title if workflow else None,
+    )
+
+
+def account_key(value: Any) -> str:
+    """Text key of an account's rows before parsing; equal UUIDs in canonical form share a key."""
+    return value.strip().lower() if isinstance(value, str) else ""
+
+
+def uuid_position(fieldnames: list[str]) -> int | None:
+    # Last occurrence wins, like csv.DictReader
+    positions = [i for i, name in enumerate(fieldnames) if name == "Account UUID"]
+    return positions[-1] if positions else None
+
+
+class _FastParser:
+    """Typed parsing of raw csv fields without Pydantic.
+
+    Only accepts input it can vouch for: canonical hyphenated UUIDs and plain ASCII digits.
+    Anything else ("+5", "1_000", braced UUIDs, bad values) returns None so the caller
+    falls back to the models, which decide acceptance and produce the error message.
+    """
+
+    def __init__(self, fieldnames: list[str]) -> None:
+        # Last occurrence wins, exactly like the dict csv.DictReader would build
+        index = {name: i for i, name in enumerate(fieldnames)}
+        self.width = len(fieldnames)
+        self.usable = all(field in index for field in REQUIRED_FIELDS)
+        self._values = itemgetter(*(index.get(field, 0) for field in REQUIRED_FIELDS))
+        self._title_pos = index.get("Workflow Title")
+        # Duplicate rows of an account reuse the UUID parsed for its first row
+        self._uuids: dict[str, UUID] = {}
+
+    def _uuid(self, value: str) -> UUID | None:
+        account_uuid = self._uuids.get(value)
+        if account_uuid is not None:
+            return account_uuid
+        if len(value) != 36 or not (value[8] == value[13] == value[18] == value[23] == "-"):
+            return None
+        try:
+            account_uuid = UUID(value)
+        except ValueError:
+            return None
+        self._uuids[value] = account_uuid
+        return account_uuid
+
+    def __call__(self, fields: list[str]) -> ParsedRow | None:
+        if not self.usable or len(fields) != self.width:
+            return None
+
+        values = list(map(str.strip, self._values(fields)))
+        if not all(values):
+            return None
+
+        ints = values[3:]
+        digits = "".join(ints)
+        # Values past 18 digits go through Pydantic, which owns the size limits
+        if not (digits.isascii() and digits.isdigit()) or max(map(len, ints)) > 18:
+            return None
+        status = _STATUSES.get(values[2].lower())
+        account_uuid = self._uuid(values[0])
+        if status is None or account_uuid is None:
+            return None
+
+        title = fields[self._title_pos].strip() if self._title_pos is not None else ""
+        return ParsedRow(account_uuid, values[1], status, *map(int, ints), title or None)
+
+
+def _row_dict(reader: csv.DictReader, fields: list[str]) -> dict[str, Any]:
+    # Mirrors csv.DictReader.__next__ for rows that take the slow path
+    fieldnames = reader.fieldnames
+    row = dict(zip(fieldnames, fields))
+    if len(fieldnames) < len(fields):
+        row[reader.restkey] = fields[len(fieldnames):]
+    elif len(fieldnames) > len(fields):
+        for key in fieldnames[len(fields):]:
+            row[key] = reader.restval
+    return row
+
+
+def aggregate_from_parsed(p: ParsedRow) -> AccountAggregate:
+    # Storage boundary: one Pydantic validation per account, not per row
+    return AccountAggregate.model_validate(
+        {
+            "account": {"account_uuid": p.account_uuid, "account_label": p.account_label},
+            "subscription": {
+                "status": p.status,
+                "admin_seats": p.admin_seats,
+                "user_seats": p.user_seats,
+                "read_only_seats": p.read_only_seats,
+            },
+            "usage": {
+                "total_records": p.total_records,
+                "automation_count": p.automation_count,
+                "messages_processed": p.messages_processed,
+                "notifications_sent": p.notifications_sent,
+                "notifications_billed": p.notifications_billed,
+            },
+            "workflows": [{"title": p.workflow_title}] if p.workflow_title else [],
+        }
+    )
+
+
+def compared_values(agg: AccountAggregate) -> tuple[Any, ...]:
+    # Same order as COMPARED_FIELDS
+    return (
+        agg.account.account_label,
+        agg.subscription.status,
+        agg.subscription.admin_seats,
+        agg.subscription.user_seats,
+        agg.subscription.read_only_seats,
+        agg.usage.total_records,
+        agg.usage.automation_count,
+        agg.usage.messages_processed,
+        agg.usage.notifications_sent,
+        agg.usage.notifications_billed,
+    )
+
+
 def _record_conflict(
     *,
-    conflicts: list[ConflictError],
+    conflicts: list[ConflictError] | IssueLog[ConflictError],
     account_uuid: UUID,
     row_number: int,
     field: str,
     expected: Any,
     got: Any,
+    reporter: IssueReporter | None = None,
 ) -> None:
     if expected == got:
         return
@@ -123,84 +325,198 @@ def _record_conflict(
         got=got,
     )
     conflicts.append(ce)
-    logger.warning(
-        "CSV conflict (first row wins): account_uuid=%s row=%d field=%s expected=%r got=%r",
-        ce.account_uuid,
-        ce.row_number,
-        ce.field,
-        ce.expected,
-        ce.got,
-    )
+    if reporter is not None:
+        reporter.conflict(ce)
 
 
-def load_and_aggregate(
-    csv_path: Path,
-) -> tuple[dict[UUID, AccountAggregate], list[RowError], list[ConflictError]]:
-    accounts: dict[UUID, AccountAggregate] = {}
-    row_errors: list[RowError] = []
-    conflicts: list[ConflictError] = []
+def iter_chunks(stream: BinaryIO, *, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    return iter(partial(stream.read, chunk_size), b"")
+
+
+def iter_csv_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode byte chunks incrementally and yield complete lines for the csv module.
 
-    with csv_path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+    Only the tail after the last newline of a chunk is carried over, so a multi-byte
+    character or a line split across two chunks is never cut in half.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        cut = pending.rfind("\n") + 1
+        if cut:
+            yield from io.StringIO(pending[:cut], newline="")
+            pending = pending[cut:]
 
-        if not reader.fieldnames:
-            msg = "CSV has no header row"
-            logger.warning(msg)
-            row_errors.append(RowError(row_number=1, message=msg, raw={}))
-            return accounts, row_errors, conflicts
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield from io.StringIO(pending, newline="")
 
-        for row_number, raw_row in enumerate(reader, start=2):
-            row = _normalize_row(raw_row)
+
+def iter_parsed_rows(
+    reader: csv.DictReader,
+    *,
+    mode: ParseMode,
+    row_errors: list[RowError] | IssueLog[RowError],
+    first_row_number: int = 2,
+    reporter: IssueReporter | None = None,
+    skip_keys: frozenset[str] = frozenset(),
+) -> Iterator[tuple[int, ParsedRow | None]]:
+    """Yield (row_number, parsed) for valid rows; invalid rows are appended to row_errors
+    (and passed to `reporter` for logging, if given).
+
+    Rows of accounts in `skip_keys` (see account_key) are not parsed and yield None.
+    """
+    parse_fast = _FastParser(reader.fieldnames) if mode == ParseMode.fast else None
+    key_pos = uuid_position(reader.fieldnames) if skip_keys else None
+
+    # Iterate the underlying csv.reader; DictReader skips blank lines the same way
+    for row_number, fields in enumerate(filter(None, reader.reader), start=first_row_number):
+        if key_pos is not None and key_pos < len(fields) and account_key(fields[key_pos]) in skip_keys:
+            yield row_number, None
+            continue
+
+        parsed = parse_fast(fields) if parse_fast else None
+
+        if parsed is None:
+            row = _normalize_row(_row_dict(reader, fields))
 
             missing = _missing_required_fields(row)
             if missing:
                 msg = f"Missing required fields: {', '.join(missing)}"
-                row_errors.append(RowError(row_number=row_number, message=msg, raw=row))
-                logger.warning("Dropping row %d: %s", row_number, msg)
+                err = RowError(row_number=row_number, message=msg, raw=row, category="missing_fields")
+                row_errors.append(err)
+                if reporter is not None:
+                    reporter.row_error(err)
                 continue
 
             try:
-                account, subscription, usage, workflow = _parse_row_models(row)
+                parsed = _parsed_from_models(row)
             except (KeyError, ValidationError) as e:
-                msg = str(e)
-                row_errors.append(RowError(row_number=row_number, message=msg, raw=row))
-                logger.warning("Dropping row %d due to validation error: %s", row_number, msg)
+                err = RowError(row_number=row_number, message=str(e), raw=row)
+                row_errors.append(err)
+                if reporter is not None:
+                    reporter.row_error(err)
                 continue
 
-            existing = accounts.get(account.account_uuid)
-            if existing is None:
-                agg = AccountAggregate(account=account, subscription=subscription, usage=usage, workflows=[])
-                if workflow:
-                    agg.workflows.append(workflow)
-                accounts[account.account_uuid] = agg
-                continue
+        yield row_number, parsed
+
+
+def record_conflicts(
+    *,
+    conflicts: list[ConflictError] | IssueLog[ConflictError],
+    account_uuid: UUID,
+    row_number: int,
+    expected_values: tuple[Any, ...],
+    got_values: tuple[Any, ...],
+    reporter: IssueReporter | None = None,
+) -> None:
+    if expected_values == got_values:
+        return
+    for field, expected, got in zip(COMPARED_FIELDS, expected_values, got_values):
+        _record_conflict(
+            conflicts=conflicts,
+            account_uuid=account_uuid,
+            row_number=row_number,
+            field=field,
+            expected=expected,
+            got=got,
+            reporter=reporter,
+        )
+
+
+def add_workflow_title(agg: AccountAggregate, title: str | None) -> None:
+    if title and all(w.title != title for w in agg.workflows):
+        agg.workflows.append(Workflow(title=title))
+
+
+def new_row_error_log(**caps: Any) -> IssueLog[RowError]:
+    return IssueLog(RowError, category=attrgetter("category"), **caps)
+
+
+def new_conflict_log(**caps: Any) -> IssueLog[ConflictError]:
+    return IssueLog(ConflictError, category=attrgetter("field"), **caps)
 
-            # First row wins: log conflicts, do not overwrite existing values.
-            comparisons: list[tuple[str, Any, Any]] = [
-                ("account_label", existing.account.account_label, account.account_label),
-                ("subscription.status", existing.subscription.status, subscription.status),
-                ("subscription.admin_seats", existing.subscription.admin_seats, subscription.admin_seats),
-                ("subscription.user_seats", existing.subscription.user_seats, subscription.user_seats),
-                ("subscription.read_only_seats", existing.subscription.read_only_seats, subscription.read_only_seats),
-                ("usage.total_records", existing.usage.total_records, usage.total_records),
-                ("usage.automation_count", existing.usage.automation_count, usage.automation_count),
-                ("usage.messages_processed", existing.usage.messages_processed, usage.messages_processed),
-                ("usage.notifications_sent", existing.usage.notifications_sent, usage.notifications_sent),
-                ("usage.notifications_billed", existing.usage.notifications_billed, usage.notifications_billed),
-            ]
-            for field, expected, got in comparisons:
-                _record_conflict(
-                    conflicts=conflicts,
-                    account_uuid=account.account_uuid,
-                    row_number=row_number,
-                    field=field,
-                    expected=expected,
-                    got=got,
-                )
-
-            if workflow:
-                existing_titles = {w.title for w in existing.workflows}
-                if workflow.title not in existing_titles:
-                    existing.workflows.append(workflow)
-
-    return accounts, row_errors, conflicts
\ No newline at end of file
+
+def _update_progress(
+    progress: IngestProgress, rows_processed: int, row_errors: IssueLog[RowError], conflicts: IssueLog[ConflictError]
+) -> None:
+    progress.rows_processed = rows_processed
+    progress.row_errors = len(row_errors)
+    progress.conflicts = len(conflicts)
+
+
+def aggregate_rows(
+    reader: csv.DictReader,
+    *,
+    mode: ParseMode = ParseMode.fast,
+    progress: IngestProgress | None = None,
+    skip_keys: frozenset[str] = frozenset(),
+    row_errors: IssueLog[RowError] | None = None,
+    conflicts: IssueLog[ConflictError] | None = None,
+    reporter: IssueReporter | None = None,
+) -> tuple[dict[UUID, AccountAggregate], IssueLog[RowError], IssueLog[ConflictError]]:
+    """Aggregate rows into accounts; errors and conflicts go to the given (or default) issue logs."""
+    accounts: dict[UUID, AccountAggregate] = {}
+    row_errors = row_errors if row_errors is not None else new_row_error_log()
+    conflicts = conflicts if conflicts is not None else new_conflict_log()
+    reporter = reporter if reporter is not None else IssueReporter()
+
+    if not reader.fieldnames:
+        err = RowError(row_number=1, message="CSV has no header row", raw={}, category="no_header")
+        row_errors.append(err)
+        reporter.row_error(err)
+        return accounts, row_errors, conflicts
+
+    row_number = 1
+    for row_number, parsed in iter_parsed_rows(
+        reader, mode=mode, row_errors=row_errors, reporter=reporter, skip_keys=skip_keys
+    ):
+        if progress is not None and not row_number % PROGRESS_EVERY:
+            _update_progress(progress, row_number - 1, row_errors, conflicts)
+        if parsed is None:
+            continue
+
+        existing = accounts.get(parsed.account_uuid)
+        if existing is None:
+            accounts[parsed.account_uuid] = aggregate_from_parsed(parsed)
+            continue
+
+        # First row wins: log conflicts, do not overwrite existing values.
+        record_conflicts(
+            conflicts=conflicts,
+            account_uuid=parsed.account_uuid,
+            row_number=row_number,
+            expected_values=compared_values(existing),
+            got_values=parsed.compared_values(),
+            reporter=reporter,
+        )
+        add_workflow_title(existing, parsed.workflow_title)
+
+    if progress is not None:
+        last_row = max(row_number, row_errors.last_row_number, 1)
+        _update_progress(progress, last_row - 1, row_errors, conflicts)
+    return accounts, row_errors, conflicts
+
+
+def load_and_aggregate(
+    csv_path: Path,
+    *,
+    mode: ParseMode = ParseMode.fast,
+    progress: IngestProgress | None = None,
+    skip_keys: frozenset[str] = frozenset(),
+    row_errors: IssueLog[RowError] | None = None,
+    conflicts: IssueLog[ConflictError] | None = None,
+    reporter: IssueReporter | None = None,
+) -> tuple[dict[UUID, AccountAggregate], IssueLog[RowError], IssueLog[ConflictError]]:
+    with csv_path.open("rb") as f:
+        reader = csv.DictReader(iter_csv_lines(iter_chunks(f)))
+        return aggregate_rows(
+            reader,
+            mode=mode,
+            progress=progress,
+            skip_keys=skip_keys,
+            row_errors=row_errors,
+            conflicts=conflicts,
+            reporter=reporter,
+        )
@@ -0,0 +1,178 @@
+import operator
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate, compress, islice
+from operator import attrgetter
+from typing import Iterable, Mapping, Union
+from uuid import UUID
+
+from models.account_aggregate import AccountAggregate
+from models.subscription import SubscriptionStatus
+
+# Status column codes; a status mask is one bytes.translate away
+STATUS_CODES: dict[SubscriptionStatus, int] = {s: i for i, s in enumerate(SubscriptionStatus)}
+
+SEAT_FIELDS: tuple[str, ...] = ("admin_seats", "user_seats", "read_only_seats")
+USAGE_FIELDS: tuple[str, ...] = (
+    "total_records",
+    "automation_count",
+    "messages_processed",
+    "notifications_sent",
+    "notifications_billed",
+)
+
+_LABEL = attrgetter("account.account_label")
+_STATUS = attrgetter("subscription.status")
+_WORKFLOWS = attrgetter("workflows")
+_INT_FIELDS = {
+    **{f: attrgetter(f"subscription.{f}") for f in SEAT_FIELDS},
+    **{f: attrgetter(f"usage.{f}") for f in USAGE_FIELDS},
+}
+
+# int64 where values fit; a plain list otherwise (models allow arbitrarily large ints)
+IntColumn = Union[array, list]
+
+# A boolean vector: one 0/1 byte per account position
+Mask = bytes
+
+
+def _int_column(values: Iterable[int]) -> IntColumn:
+    values = list(values)
+    try:
+        return array("q", values)
+    except OverflowError:
+        return values
+
+
+@dataclass(frozen=True)
+class AccountColumns:
+    """Struct-of-arrays copy of the account metrics, position-aligned with `uuids`.
+
+    Positions follow the store's dict order. Workflows are dictionary-encoded: the titles of
+    the account at position i are `workflow_codes[workflow_offsets[i]:workflow_offsets[i + 1]]`,
+    decoded through `workflow_titles`. Built once per ingest and never mutated afterwards.
+    """
+
+    uuids: list[UUID] = field(default_factory=list)
+    uuid_strs: list[str] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+    status: bytes = b""
+    ints: dict[str, IntColumn] = field(default_factory=lambda: {f: array("q") for f in SEAT_FIELDS + USAGE_FIELDS})
+    workflow_offsets: array = field(default_factory=lambda: array("q", [0]))
+    workflow_codes: array = field(default_factory=lambda: array("l"))
+    workflow_titles: list[str] = field(default_factory=list)
+    title_codes: dict[str, int] = field(default_factory=dict)
+    positions: dict[UUID, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+    def __getitem__(self, name: str) -> IntColumn:
+        return self.ints[name]
+
+    @classmethod
+    def build(cls, accounts: Mapping[UUID, AccountAggregate]) -> "AccountColumns":
+        return cls().with_changes(accounts)
+
+    def with_changes(self, changed: Mapping[UUID, AccountAggregate]) -> "AccountColumns":
+        """Next columns after `changed` accounts were replaced or (if new) appended in order."""
+        if not changed:
+            return self
+
+        positions = dict(self.positions)
+        replaced = {positions[u]: agg for u, agg in changed.items() if u in positions}
+        appended = [agg for u, agg in changed.items() if u not in positions]
+
+        new_uuids = [agg.account.account_uuid for agg in appended]
+        positions.update(zip(new_uuids, range(len(self.uuids), len(self.uuids) + len(new_uuids))))
+        uuids = self.uuids + new_uuids
+        # Stringified once here instead of on every response that lists accounts
+        uuid_strs = self.uuid_strs + list(map(str, new_uuids))
+
+        labels = self.labels + list(map(_LABEL, appended))
+        status = bytearray(self.status)
+        status.extend(map(STATUS_CODES.__getitem__, map(_STATUS, appended)))
+        ints = {name: _extend(column[:], map(_INT_FIELDS[name], appended)) for name, column in self.ints.items()}
+        for pos, agg in replaced.items():
+            labels[pos] = _LABEL(agg)
+            status[pos] = STATUS_CODES[_STATUS(agg)]
+            for name in ints:
+                ints[name] = _assign(ints[name], pos, _INT_FIELDS[name](agg))
+
+        titles = list(self.workflow_titles)
+        title_codes = dict(self.title_codes)
+
+        def encode(aggs: Iterable[AccountAggregate]) -> array:
+            flat = [w.title for agg in aggs for w in agg.workflows]
+            for title in flat:
+                if title not in title_codes:
+                    title_codes[title] = len(titles)
+                    titles.append(title)
+            return array("l", map(title_codes.__getitem__, flat))
+
+        offsets, codes = _splice_workflows(
+            self.workflow_offsets, self.workflow_codes, {pos: encode([agg]) for pos, agg in replaced.items()}
+        )
+        offsets.extend(islice(accumulate(map(len, map(_WORKFLOWS, appended)), initial=len(codes)), 1, None))
+        codes.extend(encode(appended))
+
+        return AccountColumns(
+            uuids=uuids,
+            uuid_strs=uuid_strs,
+            labels=labels,
+            status=bytes(status),
+            ints=ints,
+            workflow_offsets=offsets,
+            workflow_codes=codes,
+            workflow_titles=titles,
+            title_codes=title_codes,
+            positions=positions,
+        )
+
+    def status_mask(self, status: SubscriptionStatus) -> Mask:
+        code = STATUS_CODES[status]
+        return self.status.translate(bytes(int(i == code) for i in range(256)))
+
+    def seats_total(self) -> IntColumn:
+        admin, user, read_only = (self.ints[f] for f in SEAT_FIELDS)
+        return _int_column(map(operator.add, map(operator.add, admin, user), read_only))
+
+
+def _extend(column: IntColumn, values: Iterable[int]) -> IntColumn:
+    values = list(values)
+    try:
+        column.extend(values)
+    except OverflowError:
+        column = list(column)
+        column.extend(values)
+    return column
+
+
+def _assign(column: IntColumn, pos: int, value: int) -> IntColumn:
+    try:
+        column[pos] = value
+    except OverflowError:
+        column = list(column)
+        column[pos] = value
+    return column
+
+
+def _splice_workflows(offsets: array, codes: array, replaced: dict[int, array]) -> tuple[array, array]:
+    # Copies the untouched runs between replaced positions slice-wise; only offsets are re-based
+    new_offsets = array("q", [0])
+    new_codes = array("l")
+    start = 0
+    for pos in sorted(replaced) + [len(offsets) - 1]:
+        if pos > start:
+            shift = len(new_codes) - offsets[start]
+            new_codes.extend(codes[offsets[start]:offsets[pos]])
+            new_offsets.extend(map(shift.__add__, offsets[start + 1:pos + 1]))
+        if pos < len(offsets) - 1:
+            new_codes.extend(replaced[pos])
+            new_offsets.append(len(new_codes))
+        start = pos + 1
+    return new_offsets, new_codes
+
+
+def positions_of(mask: Mask) -> list[int]:
+    return list(compress(range(len(mask)), mask))
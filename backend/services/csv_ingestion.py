@@ -1,21 +1,38 @@
 import csv
 import io
+import shutil
+import tempfile
+import time
 from pathlib import Path
+from typing import BinaryIO, Optional
+from uuid import UUID
 
 from fastapi import HTTPException
 
-from services.store import STORE
-from services.aggregation import load_and_aggregate
+from models.account_aggregate import AccountAggregate
+from services.store import STORE, StoreSnapshot
+from services.aggregation import (
+    CHUNK_SIZE,
+    ConflictError,
+    IngestProgress,
+    RowError,
+    aggregate_rows,
+    iter_chunks,
+    iter_csv_lines,
+    new_conflict_log,
+    new_row_error_log,
+)
+from services.delta import DeltaPlan, next_row_digests, plan_delta
+from services.ingest_logging import IssueReporter
+from services.ingestion_config import IngestionSettings, get_ingestion_settings
+from services.issue_log import IssueLog
+from services.parallel_aggregation import load_and_aggregate_parallel
+from services.totals import AccountTotals
 
 
-def _read_headers(csv_bytes: bytes) -> list[str]:
-    text = csv_bytes.decode("utf-8-sig")  # handles BOM if present
-    reader = csv.reader(io.StringIO(text))
-    try:
-        headers = next(reader)
-    except StopIteration:
-        return []
-    return [h.strip() for h in headers]
+def _read_headers(reader: csv.DictReader) -> list[str]:
+    # DictReader pulls the header line from the first chunk on first access
+    return [h.strip() for h in reader.fieldnames or []]
 
 
 def _validate_headers_or_422(headers: list[str], expected: list[str]) -> None:
@@ -42,30 +59,219 @@ def _validate_headers_or_422(headers: list[str], expected: list[str]) -> None:
         )
 
 
+def _open_reader(stream: BinaryIO) -> csv.DictReader:
+    return csv.DictReader(iter_csv_lines(iter_chunks(stream)))
+
+
 def init_expected_headers_from_starter(starter_csv_path: Path) -> None:
-    starter_bytes = starter_csv_path.read_bytes()
-    STORE.expected_headers = _read_headers(starter_bytes)
+    with starter_csv_path.open("rb") as f:
+        STORE.expected_headers = _read_headers(_open_reader(f))
 
 
-def ingest_bytes(csv_bytes: bytes, *, source: str) -> None:
-    headers = _read_headers(csv_bytes)
-    _validate_headers_or_422(headers, STORE.expected_headers)
+def _issue_logs(settings: IngestionSettings) -> tuple[IssueLog[RowError], IssueLog[ConflictError]]:
+    caps = {
+        "memory_cap": settings.issues_memory_cap,
+        "max_records": settings.issues_max_records,
+        "sample_size": settings.issues_sample_size,
+        "directory": settings.issues_dir,
+    }
+    return new_row_error_log(**caps), new_conflict_log(**caps)
+
+
+def _log_summary(
+    reporter: IssueReporter,
+    *,
+    source: str,
+    started: float,
+    accounts: dict[UUID, AccountAggregate],
+    row_errors: IssueLog[RowError],
+    conflicts: IssueLog[ConflictError],
+    progress: IngestProgress,
+    plan: Optional[DeltaPlan],
+) -> None:
+    extra: dict = {"accounts_parsed": len(accounts)}
+    if plan is not None:
+        extra.update(rows_unchanged=plan.rows_unchanged, rows_updated=plan.rows_updated, rows_new=plan.rows_new)
+    reporter.log_summary(
+        source=source,
+        rows_processed=progress.rows_processed,
+        row_errors=row_errors,
+        conflicts=conflicts,
+        seconds=time.monotonic() - started,
+        extra=extra,
+    )
+
+
+def _store_results(
+    accounts: dict[UUID, AccountAggregate],
+    row_errors: IssueLog[RowError],
+    conflicts: IssueLog[ConflictError],
+    *,
+    source: str,
+    previous: StoreSnapshot,
+    plan: Optional[DeltaPlan] = None,
+    workflow_sketches: bool = False,
+) -> int:
+    """Publish the next snapshot; returns the number of accounts in it."""
+    # Copy-on-write: merge into a fresh dict and publish it as the next snapshot
+    merged = dict(previous.accounts)
+    merged.update(accounts)
+
+    if plan is None:
+        # Without a hashing pass the stored digests no longer describe the accounts
+        row_digests: dict[str, bytes] = {}
+    else:
+        row_digests = next_row_digests(previous, plan, row_errors, conflicts)
+
+    if (previous.totals.workflow_sketch is not None) == workflow_sketches:
+        totals = previous.totals.with_changes(previous.accounts, accounts)
+    else:
+        # Switching between exact and approximate workflow stats needs one full pass
+        totals = AccountTotals.build(merged, workflow_sketch=workflow_sketches)
+
+    # Columns and index are patched at the changed positions instead of rebuilt
+    columns = previous.columns.with_changes(accounts)
+    STORE.set(
+        source=source,
+        accounts=merged,
+        row_errors=row_errors,
+        conflicts=conflicts,
+        row_digests=row_digests,
+        columns=columns,
+        totals=totals,
+        index=previous.index.with_changes(previous.columns, columns, accounts),
+    )
+    return len(merged)
 
-    tmp_path = Path(__file__).resolve().parents[1] / ".ingested.csv"
-    tmp_path.write_bytes(csv_bytes)
 
-    accounts, row_errors, conflicts = load_and_aggregate(tmp_path)
+def _plan_delta(stream: BinaryIO, previous: StoreSnapshot, progress: Optional[IngestProgress]) -> DeltaPlan:
+    plan = plan_delta(_open_reader(stream), previous)
+    stream.seek(0)
+    if progress is not None:
+        progress.rows_unchanged = plan.rows_unchanged
+        progress.rows_updated = plan.rows_updated
+        progress.rows_new = plan.rows_new
+    return plan
 
-    STORE.accounts.update(accounts)
 
-    STORE.row_errors.clear()
-    STORE.row_errors.extend(e.__dict__ for e in row_errors)
+def spool_upload(stream: BinaryIO) -> BinaryIO:
+    """Copy an upload into a private temp file, chunk by chunk, and check its header.
+
+    The request's own file is closed once the response is sent, so background jobs need
+    their own copy. Raises 422 (and removes the copy) if the header does not match.
+    """
+    spool = tempfile.TemporaryFile()
+    try:
+        shutil.copyfileobj(stream, spool, CHUNK_SIZE)
+        spool.seek(0)
+        _validate_headers_or_422(_read_headers(_open_reader(spool)), STORE.expected_headers)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def ingest_stream(stream: BinaryIO, *, source: str, progress: Optional[IngestProgress] = None) -> None:
+    """Aggregate a CSV stream into the store.
+
+    Seekable streams get a hashing pass first (delta ingestion), so accounts whose rows are
+    unchanged since the last ingest skip validation and keep their stored aggregate.
+    """
+    settings = get_ingestion_settings()
+    started = time.monotonic()
+    progress = progress if progress is not None else IngestProgress()
+    previous = STORE.snapshot
+    reader = _open_reader(stream)
+    _validate_headers_or_422(_read_headers(reader), STORE.expected_headers)
+
+    plan = None
+    if settings.delta and stream.seekable():
+        stream.seek(0)
+        plan = _plan_delta(stream, previous, progress)
+        reader = _open_reader(stream)
+
+    row_errors, conflicts = _issue_logs(settings)
+    reporter = IssueReporter(settings.log_mode, examples=settings.log_examples)
+    accounts, row_errors, conflicts = aggregate_rows(
+        reader,
+        mode=settings.parse_mode,
+        progress=progress,
+        skip_keys=plan.skip_keys if plan else frozenset(),
+        row_errors=row_errors,
+        conflicts=conflicts,
+        reporter=reporter,
+    )
+    _log_summary(
+        reporter,
+        source=source,
+        started=started,
+        accounts=accounts,
+        row_errors=row_errors,
+        conflicts=conflicts,
+        progress=progress,
+        plan=plan,
+    )
+    progress.records_loaded = _store_results(
+        accounts,
+        row_errors,
+        conflicts,
+        source=source,
+        previous=previous,
+        plan=plan,
+        workflow_sketches=settings.workflow_sketches,
+    )
+
+
+def ingest_bytes(csv_bytes: bytes, *, source: str) -> None:
+    ingest_stream(io.BytesIO(csv_bytes), source=source)
 
-    STORE.conflicts.clear()
-    STORE.conflicts.extend(c.__dict__ for c in conflicts)
 
-    STORE.set(source=source)
+def ingest_path(csv_path: Path, *, source: str, progress: Optional[IngestProgress] = None) -> None:
+    settings = get_ingestion_settings()
+    if settings.parallel_workers <= 1 or csv_path.stat().st_size < settings.parallel_min_bytes:
+        with csv_path.open("rb") as f:
+            ingest_stream(f, source=source, progress=progress)
+        return
 
+    started = time.monotonic()
+    progress = progress if progress is not None else IngestProgress()
+    previous = STORE.snapshot
+    plan = None
+    with csv_path.open("rb") as f:
+        _validate_headers_or_422(_read_headers(_open_reader(f)), STORE.expected_headers)
+        if settings.delta:
+            f.seek(0)
+            plan = _plan_delta(f, previous, progress)
 
-def ingest_path(csv_path: Path, *, source: str) -> None:
-    ingest_bytes(csv_path.read_bytes(), source=source)
\ No newline at end of file
+    row_errors, conflicts = _issue_logs(settings)
+    reporter = IssueReporter(settings.log_mode, examples=settings.log_examples)
+    accounts, row_errors, conflicts = load_and_aggregate_parallel(
+        csv_path,
+        workers=settings.parallel_workers,
+        mode=settings.parse_mode,
+        progress=progress,
+        skip_keys=plan.skip_keys if plan else frozenset(),
+        row_errors=row_errors,
+        conflicts=conflicts,
+        reporter=reporter,
+    )
+    _log_summary(
+        reporter,
+        source=source,
+        started=started,
+        accounts=accounts,
+        row_errors=row_errors,
+        conflicts=conflicts,
+        progress=progress,
+        plan=plan,
+    )
+    progress.records_loaded = _store_results(
+        accounts,
+        row_errors,
+        conflicts,
+        source=source,
+        previous=previous,
+        plan=plan,
+        workflow_sketches=settings.workflow_sketches,
+    )
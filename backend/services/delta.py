@@ -0,0 +1,139 @@
+import csv
+from collections import Counter
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any, Iterable, Mapping, Optional
+from uuid import UUID
+
+from services.aggregation import ConflictError, RowError, account_key, uuid_position
+from services.issue_log import IssueLog
+from services.store import StoreSnapshot
+
+_UUID_FIELD = "Account UUID"
+_FIELD_SEP = "\x1f"
+_ROW_SEP = b"\x1e"
+
+
+@dataclass(frozen=True)
+class DeltaPlan:
+    # Content hash of each account's source rows in this file, keyed by account_key()
+    digests: dict[str, bytes]
+    # Accounts whose rows are byte-for-byte what produced the stored aggregate
+    skip_keys: frozenset[str]
+    rows_unchanged: int
+    rows_updated: int
+    rows_new: int
+
+
+def _is_canonical(key: str) -> bool:
+    # Lowercase hyphenated form: equal keys <=> equal UUIDs, so no collision check needed
+    return len(key) == 36 and key[8] == key[13] == key[18] == key[23] == "-"
+
+
+def _uuid_str(key: str) -> Optional[str]:
+    try:
+        return str(UUID(key))
+    except ValueError:
+        return None
+
+
+def _digest_rows(reader: csv.DictReader) -> tuple[dict[str, bytes], Counter, int]:
+    hashes: dict[str, Any] = {}
+    row_counts: Counter = Counter()
+    keyless_rows = 0
+
+    headers = [h.strip() for h in reader.fieldnames or []]
+    pos = uuid_position(reader.fieldnames or [])
+    # Every digest starts from the header, so reordered or renamed columns change them all
+    seed = blake2b(_FIELD_SEP.join(headers).encode("utf-8"), digest_size=16)
+    seed.update(_ROW_SEP)
+    for fields in filter(None, reader.reader):
+        key = account_key(fields[pos]) if pos is not None and pos < len(fields) else ""
+        if not key:
+            keyless_rows += 1
+            continue
+        h = hashes.get(key)
+        if h is None:
+            hashes[key] = h = seed.copy()
+        # Fed in file order, so the digest also covers row order within the account
+        h.update(_FIELD_SEP.join(fields).encode("utf-8"))
+        h.update(_ROW_SEP)
+        row_counts[key] += 1
+
+    return {key: h.digest() for key, h in hashes.items()}, row_counts, keyless_rows
+
+
+def _ambiguous_keys(keys: Iterable[str]) -> set[str]:
+    """Keys spelling the same UUID differently ("{...}", no hyphens) cannot be skipped independently."""
+    keys = set(keys)
+    by_uuid: dict[str, list[str]] = {}
+    for key in keys:
+        if not _is_canonical(key):
+            u = _uuid_str(key)
+            if u is not None:
+                by_uuid.setdefault(u, []).append(key)
+
+    ambiguous: set[str] = set()
+    for u, spellings in by_uuid.items():
+        if len(spellings) > 1 or u in keys:
+            ambiguous.update(spellings)
+            ambiguous.add(u)
+    return ambiguous
+
+
+def plan_delta(reader: csv.DictReader, previous: StoreSnapshot) -> DeltaPlan:
+    """First pass over the file: hash each account's rows and compare with the last ingest.
+
+    Only csv tokenizing and hashing happens here, no validation.
+    """
+    digests, row_counts, keyless_rows = _digest_rows(reader)
+    ambiguous = _ambiguous_keys(digests)
+
+    skip_keys = frozenset(
+        key for key, digest in digests.items() if key not in ambiguous and previous.row_digests.get(key) == digest
+    )
+
+    rows_unchanged = rows_updated = 0
+    rows_new = keyless_rows
+    for key, count in row_counts.items():
+        if key in skip_keys:
+            rows_unchanged += count
+        elif key in previous.row_digests or _known_account(key, previous.accounts):
+            rows_updated += count
+        else:
+            rows_new += count
+
+    return DeltaPlan(
+        digests=digests,
+        skip_keys=skip_keys,
+        rows_unchanged=rows_unchanged,
+        rows_updated=rows_updated,
+        rows_new=rows_new,
+    )
+
+
+def _known_account(key: str, accounts: Mapping[UUID, Any]) -> bool:
+    u = _uuid_str(key)
+    return u is not None and UUID(u) in accounts
+
+
+def next_row_digests(
+    previous: StoreSnapshot, plan: DeltaPlan, row_errors: IssueLog[RowError], conflicts: IssueLog[ConflictError]
+) -> dict[str, bytes]:
+    digests = dict(previous.row_digests)
+    if row_errors.truncated or conflicts.truncated:
+        # Issues past the log cap are unknown, so nothing from this file is trusted
+        for key in plan.digests:
+            digests.pop(key, None)
+        return digests
+
+    # Accounts with any rejected row or conflict are always re-parsed, so their digest is dropped:
+    # their issues are reported with this file's row numbers, which the next file may shift
+    error_keys = {account_key(e.raw.get(_UUID_FIELD)) for e in row_errors}
+    conflict_uuids = {c.account_uuid for c in conflicts}
+    for key, digest in plan.digests.items():
+        if key in error_keys or (key if _is_canonical(key) else _uuid_str(key)) in conflict_uuids:
+            digests.pop(key, None)
+        else:
+            digests[key] = digest
+    return digests
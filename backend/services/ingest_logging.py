@@ -0,0 +1,77 @@
+import json
+import logging
+from enum import Enum
+from typing import Any, Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXAMPLES = 5
+
+
+class IngestLogMode(str, Enum):
+    # One warning per dropped row and per differing conflict field
+    per_row = "per_row"
+    # A few example warnings, then one summary record per ingest
+    summary = "summary"
+
+
+class IssueReporter:
+    """Decides which ingest issues are logged individually.
+
+    In summary mode only the first `examples` row errors and conflicts are logged; the rest
+    are only counted (exactly, by the issue logs) and reported by `log_summary`.
+    """
+
+    def __init__(self, mode: IngestLogMode = IngestLogMode.summary, *, examples: int = DEFAULT_EXAMPLES) -> None:
+        self.mode = mode
+        self._row_error_budget = examples
+        self._conflict_budget = examples
+        self.suppressed = 0
+
+    def row_error(self, e: Any) -> None:
+        if self.mode == IngestLogMode.summary:
+            if self._row_error_budget <= 0:
+                self.suppressed += 1
+                return
+            self._row_error_budget -= 1
+        logger.warning("Dropping row %d (%s): %s", e.row_number, e.category, e.message)
+
+    def conflict(self, c: Any) -> None:
+        if self.mode == IngestLogMode.summary:
+            if self._conflict_budget <= 0:
+                self.suppressed += 1
+                return
+            self._conflict_budget -= 1
+        logger.warning(
+            "CSV conflict (first row wins): account_uuid=%s row=%d field=%s expected=%r got=%r",
+            c.account_uuid,
+            c.row_number,
+            c.field,
+            c.expected,
+            c.got,
+        )
+
+    def log_summary(
+        self,
+        *,
+        source: str,
+        rows_processed: int,
+        row_errors: Any,
+        conflicts: Any,
+        seconds: float,
+        extra: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Emit the single structured record for an ingest; `row_errors`/`conflicts` are IssueLogs."""
+        summary = {
+            "source": source,
+            "rows_processed": rows_processed,
+            "row_errors": len(row_errors),
+            "row_errors_by_category": dict(row_errors.counts),
+            "conflicts": len(conflicts),
+            "conflicts_by_field": dict(conflicts.counts),
+            "suppressed_log_lines": self.suppressed,
+            "seconds": round(seconds, 3),
+            **(extra or {}),
+        }
+        logger.info("Ingest summary: %s", json.dumps(summary, sort_keys=True), extra={"ingest_summary": summary})
+        return summary
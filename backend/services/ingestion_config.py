@@ -0,0 +1,47 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from services.aggregation import ParseMode
+from services.ingest_logging import DEFAULT_EXAMPLES, IngestLogMode
+from services.issue_log import DEFAULT_MAX_RECORDS, DEFAULT_MEMORY_CAP, DEFAULT_SAMPLE_SIZE
+
+
+@dataclass(frozen=True)
+class IngestionSettings:
+    parse_mode: ParseMode
+    parallel_workers: int
+    parallel_min_bytes: int
+    delta: bool
+    issues_memory_cap: int
+    issues_max_records: int
+    issues_sample_size: int
+    issues_dir: Optional[str]
+    log_mode: IngestLogMode
+    log_examples: int
+    workflow_sketches: bool
+
+
+def get_ingestion_settings() -> IngestionSettings:
+    # Delta ingestion hashes each account's rows first and skips accounts unchanged since the last ingest.
+    # Parallel ingestion is opt-in: files on disk of at least parallel_min_bytes are sharded
+    # across parallel_workers processes when it is > 1
+    return IngestionSettings(
+        parse_mode=ParseMode(os.getenv("INGEST_PARSE_MODE", ParseMode.fast.value)),
+        parallel_workers=int(os.getenv("INGEST_PARALLEL_WORKERS", "1")),
+        parallel_min_bytes=int(os.getenv("INGEST_PARALLEL_MIN_BYTES", str(64 * 1024 * 1024))),
+        delta=os.getenv("INGEST_DELTA", "true").strip().lower() in ("1", "true", "yes"),
+        # Row errors and conflicts: kept in memory up to the cap, then spilled to a temp file
+        # (in INGEST_ISSUES_DIR, default the system temp dir) up to max_records, then only counted
+        issues_memory_cap=int(os.getenv("INGEST_ISSUES_MEMORY_CAP", str(DEFAULT_MEMORY_CAP))),
+        issues_max_records=int(os.getenv("INGEST_ISSUES_MAX_RECORDS", str(DEFAULT_MAX_RECORDS))),
+        issues_sample_size=int(os.getenv("INGEST_ISSUES_SAMPLE_SIZE", str(DEFAULT_SAMPLE_SIZE))),
+        issues_dir=os.getenv("INGEST_ISSUES_DIR") or None,
+        # "summary" logs a few example issues plus one summary record per ingest; "per_row" logs them all
+        log_mode=IngestLogMode(os.getenv("INGEST_LOG_MODE", IngestLogMode.summary.value)),
+        log_examples=int(os.getenv("INGEST_LOG_EXAMPLES", str(DEFAULT_EXAMPLES))),
+        # Opt-in approximate workflow stats: a HyperLogLog and a count-min sketch with heavy hitters
+        # replace the exact title counts in the totals, so only the totals stay constant-memory.
+        # The columns' title dictionary and the index's title postings still grow with every distinct title
+        workflow_sketches=os.getenv("INGEST_WORKFLOW_SKETCHES", "false").strip().lower() in ("1", "true", "yes"),
+    )
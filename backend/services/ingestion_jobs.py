@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Optional, TypedDict
+
+from fastapi import HTTPException
+
+from services.aggregation import IngestProgress
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class IngestionJobRecord(TypedDict):
+    job_id: str
+    source: str
+    state: str
+    rows_processed: int
+    rows_per_sec: float
+    row_errors: int
+    conflicts: int
+    rows_unchanged: int
+    rows_updated: int
+    rows_new: int
+    records_loaded: int
+    error: Any
+    created_at: str
+    started_at: Optional[str]
+    finished_at: Optional[str]
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class IngestionJob:
+    job_id: str
+    source: str
+    created_at: str = field(default_factory=_now_iso)
+    state: JobState = JobState.queued
+    progress: IngestProgress = field(default_factory=IngestProgress)
+    error: Any = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    _started: Optional[float] = None
+    _finished: Optional[float] = None
+
+    def rows_per_sec(self) -> float:
+        if self._started is None:
+            return 0.0
+        elapsed = (self._finished or time.monotonic()) - self._started
+        return self.progress.rows_processed / elapsed if elapsed > 0 else 0.0
+
+
+def job_to_record(job: IngestionJob) -> IngestionJobRecord:
+    return {
+        "job_id": job.job_id,
+        "source": job.source,
+        "state": job.state.value,
+        "rows_processed": job.progress.rows_processed,
+        "rows_per_sec": round(job.rows_per_sec(), 1),
+        "row_errors": job.progress.row_errors,
+        "conflicts": job.progress.conflicts,
+        "rows_unchanged": job.progress.rows_unchanged,
+        "rows_updated": job.progress.rows_updated,
+        "rows_new": job.progress.rows_new,
+        "records_loaded": job.progress.records_loaded,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class IngestionJobRunner:
+    """Runs ingestions one at a time on a background thread, off the event loop.
+
+    A single worker keeps ingests ordered, so each one sees the store the previous one left.
+    Only the most recent `max_jobs` jobs are remembered.
+    """
+
+    def __init__(self, *, max_jobs: int = 100) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest")
+        self._jobs: OrderedDict[str, IngestionJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_jobs = max_jobs
+
+    def submit(
+        self,
+        *,
+        source: str,
+        run: Callable[[IngestProgress], None],
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> IngestionJob:
+        job = IngestionJob(job_id=uuid.uuid4().hex, source=source)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self._max_jobs:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job, run, cleanup)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: IngestionJob, run: Callable[[IngestProgress], None], cleanup: Optional[Callable[[], None]]) -> None:
+        job.state = JobState.running
+        job.started_at = _now_iso()
+        job._started = time.monotonic()
+        try:
+            run(job.progress)
+            job.state = JobState.succeeded
+        except HTTPException as e:
+            job.state = JobState.failed
+            job.error = e.detail
+        except Exception:
+            logger.exception("Ingestion job %s failed (source=%s)", job.job_id, job.source)
+            job.state = JobState.failed
+            job.error = "Internal error during ingestion"
+        finally:
+            job._finished = time.monotonic()
+            job.finished_at = _now_iso()
+            if cleanup is not None:
+                cleanup()
+
+
+JOBS = IngestionJobRunner()
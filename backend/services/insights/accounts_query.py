@@ -1,13 +1,16 @@
+import base64
+import json
 import math
 from enum import Enum
-from typing import Any, Optional, TypedDict
+from typing import Any, Optional, Sequence, TypedDict
+from uuid import UUID
 
 from fastapi import HTTPException
 
-from models.account_aggregate import AccountAggregate
 from models.subscription import SubscriptionStatus
-from services.insights.repository import get_accounts_or_404
-from services.insights.serializers import account_to_record
+from services.account_index import AccountIndex
+from services.insights.repository import get_snapshot_or_404
+from services.insights.serializers import account_to_record, accounts_page_json, records_json
 
 
 class SubscriptionRecord(TypedDict):
@@ -39,11 +42,13 @@ class AccountRecord(TypedDict):
 
 
 class AccountsPage(TypedDict):
-    page: int
+    # None in cursor mode, where pages are not counted
+    page: Optional[int]
     page_size: int
     total_items: int
     total_pages: int
     items: list[AccountRecord]
+    next_cursor: Optional[str]
 
 
 class SortBy(str, Enum):
@@ -67,7 +72,8 @@ def _validate_paging(page: int, page_size: int) -> None:
         raise HTTPException(status_code=422, detail="'page_size' must be between 1 and 200")
 
 
-def _parse_status(status: Optional[str]) -> Optional[SubscriptionStatus]:
+# parse_status and filter_positions are shared with the export, aggregate and analytics services
+def parse_status(status: Optional[str]) -> Optional[SubscriptionStatus]:
     if status is None:
         return None
     try:
@@ -76,61 +82,45 @@ def _parse_status(status: Optional[str]) -> Optional[SubscriptionStatus]:
         raise HTTPException(status_code=422, detail="Invalid 'status'. Expected: active|inactive.")
 
 
-def _filter_accounts(
-    accounts: list[AccountAggregate],
+def filter_positions(
+    index: AccountIndex,
     *,
     account_uuid: str,
     status: Optional[str],
     search: Optional[str],
     workflow_title: Optional[str],
-) -> list[AccountAggregate]:
-    status_enum = _parse_status(status)
+) -> Sequence[int]:
+    return index.select(
+        account_uuid=account_uuid,
+        status=parse_status(status),
+        search=search,
+        workflow_title=workflow_title,
+    )
 
-    result = accounts
 
-    if account_uuid:
-        a = account_uuid.strip().lower()
-        result = [a for a in result if str(a.account.account_uuid) == account_uuid]
+def _encode_cursor(*, version: int, sort_by: SortBy, sort_dir: SortDir, value: Any, account_uuid: str) -> str:
+    raw = json.dumps([version, sort_by.value, sort_dir.value, value, account_uuid], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
 
-    if status_enum is not None:
-        result = [a for a in result if a.subscription.status == status_enum]
 
-    if search:
-        s = search.strip().lower()
-        result = [a for a in result if s in a.account.account_label.lower()]
-
-    if workflow_title:
-        wt = workflow_title.strip().lower()
-        result = [a for a in result if any(w.title.lower() == wt for w in a.workflows)]
+def _decode_cursor(cursor: str, *, index: AccountIndex, sort_by: SortBy, sort_dir: SortDir) -> tuple[Any, int]:
+    """(sort value, store position) of the last account the cursor's page ended on."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        _version, cursor_sort_by, cursor_sort_dir, value, account_uuid = json.loads(raw)
+        position = index.positions.get(UUID(account_uuid))
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=422, detail="Invalid 'cursor'.")
 
-    return result
+    if cursor_sort_by != sort_by.value or cursor_sort_dir != sort_dir.value:
+        raise HTTPException(status_code=422, detail="'cursor' belongs to a different sort_by/sort_dir.")
+    value_type = str if sort_by == SortBy.account_label else int
+    if position is None or type(value) is not value_type:
+        raise HTTPException(status_code=422, detail="Invalid 'cursor'.")
+    return value, position
 
 
-def _sort_accounts(
-    accounts: list[AccountAggregate],
-    *,
-    sort_by: SortBy,
-    sort_dir: SortDir,
-) -> list[AccountAggregate]:
-    reverse = sort_dir == SortDir.desc
-
-    if sort_by == SortBy.account_label:
-        return sorted(accounts, key=lambda a: a.account.account_label.lower(), reverse=reverse)
-    if sort_by == SortBy.notifications_billed:
-        return sorted(accounts, key=lambda a: a.usage.notifications_billed, reverse=reverse)
-    if sort_by == SortBy.notifications_sent:
-        return sorted(accounts, key=lambda a: a.usage.notifications_sent, reverse=reverse)
-    if sort_by == SortBy.messages_processed:
-        return sorted(accounts, key=lambda a: a.usage.messages_processed, reverse=reverse)
-    if sort_by == SortBy.total_records:
-        return sorted(accounts, key=lambda a: a.usage.total_records, reverse=reverse)
-    if sort_by == SortBy.automation_count:
-        return sorted(accounts, key=lambda a: a.usage.automation_count, reverse=reverse)
-
-    return accounts
-
-
-def get_records(
+def _select_page(
     *,
     page: int = 1,
     page_size: int = 25,
@@ -140,23 +130,110 @@ def get_records(
     workflow_title: Optional[str] = None,
     sort_by: SortBy = SortBy.account_label,
     sort_dir: SortDir = SortDir.asc,
-) -> AccountsPage:
+    cursor: Optional[str] = None,
+) -> tuple[AccountIndex, list[int], AccountsPage]:
+    # The page's positions, and the page without its items
     _validate_paging(page, page_size)
 
-    accounts = get_accounts_or_404()
-    accounts = _filter_accounts(accounts, account_uuid=account_uuid, status=status, search=search, workflow_title=workflow_title)
-    accounts = _sort_accounts(accounts, sort_by=sort_by, sort_dir=sort_dir)
+    snapshot = get_snapshot_or_404()
+    index = snapshot.index
+    selected = filter_positions(index, account_uuid=account_uuid, status=status, search=search, workflow_title=workflow_title)
 
-    total_items = len(accounts)
+    total_items = len(selected)
     total_pages = max(1, math.ceil(total_items / page_size))
-    start = (page - 1) * page_size
-    end = start + page_size
-    page_items = accounts[start:end]
-
-    return {
-        "page": page,
+    key, descending = sort_by.value, sort_dir == SortDir.desc
+    if cursor is None:
+        start = (page - 1) * page_size
+        end = start + page_size
+        # Walks the store's precomputed ordering for `sort_by` instead of sorting per request
+        positions = index.ordered(selected, key=key, descending=descending, start=start, stop=end)
+        has_more = end < total_items
+        page_number: Optional[int] = page
+    else:
+        value, position = _decode_cursor(cursor, index=index, sort_by=sort_by, sort_dir=sort_dir)
+        # One extra row tells whether a next page exists
+        positions = index.ordered_after(
+            selected, key=key, descending=descending, value=value, position=position, limit=page_size + 1
+        )
+        has_more = len(positions) > page_size
+        positions = positions[:page_size]
+        page_number = None
+
+    next_cursor = None
+    if has_more and positions:
+        next_cursor = _encode_cursor(
+            version=snapshot.version,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            value=index.sort_values[key][positions[-1]],
+            account_uuid=str(index.accounts[positions[-1]].account.account_uuid),
+        )
+
+    return index, positions, {
+        "page": page_number,
         "page_size": page_size,
         "total_items": total_items,
         "total_pages": total_pages,
-        "items": [account_to_record(a) for a in page_items],  
-    }
\ No newline at end of file
+        "items": [],
+        "next_cursor": next_cursor,
+    }
+
+
+def get_records(
+    *,
+    page: int = 1,
+    page_size: int = 25,
+    status: Optional[str] = None,
+    account_uuid: Optional[str] = None,
+    search: Optional[str] = None,
+    workflow_title: Optional[str] = None,
+    sort_by: SortBy = SortBy.account_label,
+    sort_dir: SortDir = SortDir.asc,
+    cursor: Optional[str] = None,
+) -> AccountsPage:
+    """One page of accounts, by `page` number or, when `cursor` is given, after the cursor's account.
+
+    Cursors are keyset positions: (sort value, account uuid) plus the snapshot version they came
+    from. Existing accounts keep their store position across ingests, so a cursor from an older
+    snapshot resumes right after the same account instead of shifting by however many rows moved.
+    """
+    index, positions, result = _select_page(
+        page=page,
+        page_size=page_size,
+        status=status,
+        account_uuid=account_uuid,
+        search=search,
+        workflow_title=workflow_title,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        cursor=cursor,
+    )
+    result["items"] = [account_to_record(index.accounts[p]) for p in positions]
+    return result
+
+
+def get_records_json(
+    *,
+    page: int = 1,
+    page_size: int = 25,
+    status: Optional[str] = None,
+    account_uuid: Optional[str] = None,
+    search: Optional[str] = None,
+    workflow_title: Optional[str] = None,
+    sort_by: SortBy = SortBy.account_label,
+    sort_dir: SortDir = SortDir.asc,
+    cursor: Optional[str] = None,
+) -> bytes:
+    """`get_records` as the final enveloped JSON body, built from per-snapshot cached record fragments."""
+    index, positions, result = _select_page(
+        page=page,
+        page_size=page_size,
+        status=status,
+        account_uuid=account_uuid,
+        search=search,
+        workflow_title=workflow_title,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        cursor=cursor,
+    )
+    return accounts_page_json(result, records_json(index, positions), next_cursor=result["next_cursor"])
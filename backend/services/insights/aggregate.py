@@ -0,0 +1,188 @@
+from bisect import bisect_right
+from collections import defaultdict
+from itertools import compress
+from typing import Optional, Sequence, TypedDict, Union
+
+from models.aggregate import AggregateOp, AggregateRequest, Aggregation, GroupBy, MetricField
+from services.account_index import AccountIndex
+from services.columns import STATUS_CODES, AccountColumns, IntColumn
+from services.insights.accounts_query import filter_positions
+from services.insights.repository import get_snapshot_or_404
+
+_STATUS_VALUES = {code: status.value for status, code in STATUS_CODES.items()}
+
+Number = Union[int, float]
+
+
+class AggregateGroup(TypedDict):
+    key: dict[str, Optional[str]]
+    values: dict[str, Optional[Number]]
+
+
+class AggregateResult(TypedDict):
+    group_by: list[str]
+    aggregations: list[str]
+    total_items: int
+    groups: list[AggregateGroup]
+
+
+def _bucket_label(bounds: Sequence[int], i: int) -> str:
+    if i == len(bounds) - 1:
+        return f"{bounds[i]}+"
+    lo, hi = bounds[i], bounds[i + 1] - 1
+    return str(lo) if lo == hi else f"{lo}-{hi}"
+
+
+def _key_column(columns: AccountColumns, key: GroupBy, positions: Sequence[int], bounds: Sequence[int], seats: IntColumn) -> list:
+    # One group code per selected position
+    if key == GroupBy.status:
+        return [columns.status[p] for p in positions]
+    selected = [seats[p] for p in positions]
+    # Seat totals repeat heavily: bisect each distinct value once
+    bucket = {v: bisect_right(bounds, v) - 1 for v in set(selected)}
+    return list(map(bucket.__getitem__, selected))
+
+
+def _partition_by_codes(
+    columns: AccountColumns, group_by: Sequence[GroupBy], positions: Sequence[int], bounds: Sequence[int], seats: IntColumn
+) -> dict[tuple, list[int]]:
+    if not group_by:
+        return {(): list(positions)} if positions else {}
+    keys = [_key_column(columns, key, positions, bounds, seats) for key in group_by]
+    groups: dict[tuple, list[int]] = defaultdict(list)
+    for p, key in zip(positions, zip(*keys)):
+        groups[key].append(p)
+    return groups
+
+
+def _title_groups(index: AccountIndex, columns: AccountColumns, positions: Sequence[int]) -> dict[Optional[str], list[int]]:
+    # Lowercased title -> selected positions listing it, read off the index postings; None for no workflows
+    if len(positions) == len(index):
+        groups = {title: list(postings) for title, postings in index.by_title.items()}
+    else:
+        member = bytearray(len(index))
+        for p in positions:
+            member[p] = 1
+        groups = {title: list(compress(postings, map(member.__getitem__, postings))) for title, postings in index.by_title.items()}
+    offsets = columns.workflow_offsets
+    groups[None] = [p for p in positions if offsets[p] == offsets[p + 1]]
+    return {title: members for title, members in groups.items() if members}
+
+
+def _partition(
+    index: AccountIndex,
+    columns: AccountColumns,
+    group_by: Sequence[GroupBy],
+    positions: Sequence[int],
+    bounds: Sequence[int],
+    seats: IntColumn,
+) -> dict[tuple, list[int]]:
+    """Hash partition of the selected positions by their group-by codes, each group in store order."""
+    if not group_by:
+        return {(): list(positions)}
+    if GroupBy.workflow_title not in group_by:
+        return _partition_by_codes(columns, group_by, positions, bounds, seats)
+    # An account counts once in each of its workflow titles' groups
+    at = group_by.index(GroupBy.workflow_title)
+    others = [key for key in group_by if key != GroupBy.workflow_title]
+    groups = {}
+    for title, members in _title_groups(index, columns, positions).items():
+        for codes, sub in _partition_by_codes(columns, others, members, bounds, seats).items():
+            groups[(*codes[:at], title, *codes[at:])] = sub
+    return groups
+
+
+def _decode(group_by: Sequence[GroupBy], codes: tuple, bounds: Sequence[int], titles: dict[str, str]) -> tuple[tuple, dict]:
+    # (sort key, public key): statuses and buckets sort by code, titles alphabetically, missing titles last
+    order, key = [], {}
+    for name, code in zip(group_by, codes):
+        if name == GroupBy.status:
+            order.append((False, code))
+            key[name.value] = _STATUS_VALUES[code]
+        elif name == GroupBy.seat_bucket:
+            order.append((False, code))
+            key[name.value] = _bucket_label(bounds, code)
+        else:
+            order.append((code is None, code or ""))
+            key[name.value] = None if code is None else titles[code]
+    return tuple(order), key
+
+
+def _percentile(ordered: list[int], q: float) -> float:
+    rank = (len(ordered) - 1) * q / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def _aggregate(
+    positions: list[int], aggregations: Sequence[Aggregation], metric: dict[MetricField, IntColumn]
+) -> dict[str, Optional[Number]]:
+    gathered: dict[MetricField, list[int]] = {}
+    ordered: dict[MetricField, list[int]] = {}
+    result: dict[str, Optional[Number]] = {}
+    for agg in aggregations:
+        if agg.op == AggregateOp.count:
+            result[agg.name] = len(positions)
+            continue
+        if agg.field not in gathered:
+            gathered[agg.field] = list(map(metric[agg.field].__getitem__, positions))
+        values = gathered[agg.field]
+        if not values:
+            result[agg.name] = 0 if agg.op == AggregateOp.sum else None
+        elif agg.op == AggregateOp.sum:
+            result[agg.name] = sum(values)
+        elif agg.op == AggregateOp.mean:
+            result[agg.name] = sum(values) / len(values)
+        elif agg.op == AggregateOp.min:
+            result[agg.name] = min(values)
+        elif agg.op == AggregateOp.max:
+            result[agg.name] = max(values)
+        else:
+            if agg.field not in ordered:
+                ordered[agg.field] = sorted(values)
+            result[agg.name] = _percentile(ordered[agg.field], agg.q)
+    return result
+
+
+def aggregate(request: AggregateRequest) -> AggregateResult:
+    """Group the accounts matching `request.filters` and aggregate metrics per group.
+
+    One pass hash-partitions the selected positions by their group-by codes (workflow titles come
+    from the index postings); each group then reads only the columns its aggregations name. Cost
+    is linear in the selection, plus a sort per group for percentiles.
+    """
+    snapshot = get_snapshot_or_404()
+    index, columns = snapshot.index, snapshot.columns
+    filters = request.filters
+    positions = filter_positions(
+        index,
+        account_uuid=filters.account_uuid,
+        status=filters.status,
+        search=filters.search,
+        workflow_title=filters.workflow_title,
+    )
+    bounds = request.seat_buckets
+
+    fields = {a.field for a in request.aggregations if a.field is not None}
+    needs_seats = MetricField.seats_total in fields or GroupBy.seat_bucket in request.group_by
+    seats = columns.seats_total() if needs_seats else []
+    metric = {f: seats if f == MetricField.seats_total else columns[f.value] for f in fields}
+
+    # Titles group case-insensitively, like the workflow_title filter; each shows its first spelling
+    titles: dict[str, str] = {}
+    for title in columns.workflow_titles:
+        titles.setdefault(title.lower(), title)
+
+    groups = []
+    for codes, members in _partition(index, columns, request.group_by, positions, bounds, seats).items():
+        order, key = _decode(request.group_by, codes, bounds, titles)
+        groups.append((order, {"key": key, "values": _aggregate(members, request.aggregations, metric)}))
+    groups.sort(key=lambda g: g[0])
+
+    return {
+        "group_by": [g.value for g in request.group_by],
+        "aggregations": [a.name for a in request.aggregations],
+        "total_items": len(positions),
+        "groups": [g for _, g in groups],
+    }
@@ -1,10 +1,13 @@
-from collections import Counter
-from typing import TypedDict
+from enum import Enum
+from typing import Optional, Sequence, TypedDict
 
 from fastapi import HTTPException
 
 from models.subscription import SubscriptionStatus
-from services.insights.repository import get_accounts_or_404
+from services.insights.accounts_query import parse_status
+from services.insights.repository import get_totals_or_404
+from services.sketches import HISTOGRAM_EDGES, QUANTILE_ACCURACY
+from services.totals import AccountTotals
 
 
 class ChartData(TypedDict):
@@ -26,42 +29,107 @@ class UsageBySubscriptionStatus(TypedDict):
     inactive: UsageTotals
 
 
+class UsageField(str, Enum):
+    total_records = "total_records"
+    automation_count = "automation_count"
+    messages_processed = "messages_processed"
+    notifications_sent = "notifications_sent"
+    notifications_billed = "notifications_billed"
+
+
+class Quantile(TypedDict):
+    q: float
+    value: Optional[float]
+
+
+class UsageDistribution(TypedDict):
+    field: str
+    status: Optional[str]
+    accounts: int
+    relative_accuracy: float
+    quantiles: list[Quantile]
+    histogram: ChartData
+
+
+def _edge_label(i: int) -> str:
+    if i == len(HISTOGRAM_EDGES) - 1:
+        return f"{HISTOGRAM_EDGES[i]}+"
+    lo, hi = HISTOGRAM_EDGES[i], HISTOGRAM_EDGES[i + 1] - 1
+    return str(lo) if lo == hi else f"{lo}-{hi}"
+
+
+_HISTOGRAM_LABELS = [_edge_label(i) for i in range(len(HISTOGRAM_EDGES))]
+
+
+# The *_from variants take one snapshot's totals so callers (the dashboard) can share a version
+
+
 def subscriptions_by_status() -> ChartData:
-    accounts = get_accounts_or_404()
-    active = sum(1 for a in accounts if a.subscription.status == SubscriptionStatus.active)
-    inactive = len(accounts) - active
+    return subscriptions_by_status_from(get_totals_or_404())
+
+
+def subscriptions_by_status_from(totals: AccountTotals) -> ChartData:
+    active = totals.status_counts[SubscriptionStatus.active]
+    inactive = totals.accounts - active
     return {"labels": ["active", "inactive"], "values": [active, inactive]}
 
 
 def notifications_sent_vs_billed() -> ChartData:
-    accounts = get_accounts_or_404()
-    sent = sum(a.usage.notifications_sent for a in accounts)
-    billed = sum(a.usage.notifications_billed for a in accounts)
+    return notifications_sent_vs_billed_from(get_totals_or_404())
+
+
+def notifications_sent_vs_billed_from(totals: AccountTotals) -> ChartData:
+    sent = totals.usage_total("notifications_sent")
+    billed = totals.usage_total("notifications_billed")
     return {"labels": ["sent", "billed"], "values": [sent, billed]}
 
 
 def top_workflows(*, limit: int = 10) -> ChartData:
     if limit < 1 or limit > 100:
         raise HTTPException(status_code=422, detail="'limit' must be between 1 and 100")
+    return top_workflows_from(get_totals_or_404(), limit=limit)
 
-    accounts = get_accounts_or_404()
-    titles = [w.title for a in accounts for w in a.workflows]
-    top = Counter(titles).most_common(limit)
-    return {"labels": [t for t, _ in top], "values": [c for _, c in top]}
+
+def top_workflows_from(totals: AccountTotals, *, limit: int) -> ChartData:
+    # Ties rank by first appearance; after incremental ingests that is first appearance in the store
+    top = totals.top_titles(limit)
+    return {"labels": [title for title, _ in top], "values": [c for _, c in top]}
 
 
 def usage_by_subscription_status() -> UsageBySubscriptionStatus:
-    accounts = get_accounts_or_404()
+    return usage_by_subscription_status_from(get_totals_or_404())
+
 
-    def totals(status: SubscriptionStatus) -> UsageTotals:
-        xs = [a for a in accounts if a.subscription.status == status]
+def usage_by_subscription_status_from(totals: AccountTotals) -> UsageBySubscriptionStatus:
+    def for_status(status: SubscriptionStatus) -> UsageTotals:
+        sums = totals.usage_by_status[status]
         return {
-            "accounts": len(xs),
-            "automation_count_total": sum(a.usage.automation_count for a in xs),
-            "messages_processed_total": sum(a.usage.messages_processed for a in xs),
-            "notifications_sent_total": sum(a.usage.notifications_sent for a in xs),
-            "notifications_billed_total": sum(a.usage.notifications_billed for a in xs),
-            "total_records_total": sum(a.usage.total_records for a in xs),
+            "accounts": totals.status_counts[status],
+            "automation_count_total": sums["automation_count"],
+            "messages_processed_total": sums["messages_processed"],
+            "notifications_sent_total": sums["notifications_sent"],
+            "notifications_billed_total": sums["notifications_billed"],
+            "total_records_total": sums["total_records"],
         }
 
-    return {"active": totals(SubscriptionStatus.active), "inactive": totals(SubscriptionStatus.inactive)}
\ No newline at end of file
+    return {"active": for_status(SubscriptionStatus.active), "inactive": for_status(SubscriptionStatus.inactive)}
+
+def usage_distribution(
+    *, field: UsageField, status: Optional[str] = None, quantiles: Sequence[float] = (50, 90, 99)
+) -> UsageDistribution:
+    return usage_distribution_from(get_totals_or_404(), field=field, status=parse_status(status), quantiles=quantiles)
+
+
+def usage_distribution_from(
+    totals: AccountTotals, *, field: UsageField, status: Optional[SubscriptionStatus], quantiles: Sequence[float]
+) -> UsageDistribution:
+    # Read from sketches maintained per ingest; values are within relative_accuracy of the exact quantiles
+    distribution = totals.usage_distribution(field.value, status)
+    return {
+        "field": field.value,
+        "status": status.value if status is not None else None,
+        "accounts": len(distribution),
+        "relative_accuracy": QUANTILE_ACCURACY,
+        "quantiles": [{"q": q, "value": distribution.quantile(q / 100)} for q in quantiles],
+        "histogram": {"labels": _HISTOGRAM_LABELS, "values": list(distribution.histogram)},
+    }
@@ -0,0 +1,43 @@
+import json
+import os
+from dataclasses import dataclass
+
+# Thresholds the account-manager rules are written against; rule sets override them by name
+DEFAULT_THRESHOLDS: dict[str, int] = {
+    "HIGH_SEATS": 10,
+    "LOW_ACTIVITY_MESSAGES": 5,
+    "LOW_ACTIVITY_NOTIFICATIONS": 5,
+    "HIGH_ACTIVITY_NOTIFICATIONS": 200,
+    "LOW_SEATS": 2,
+}
+
+
+@dataclass(frozen=True)
+class InsightsSettings:
+    rule_sets: dict[str, dict[str, int]]
+
+
+def _parse_rule_sets(raw: str) -> dict[str, dict[str, int]]:
+    try:
+        rule_sets = json.loads(raw) if raw else {}
+    except json.JSONDecodeError as e:
+        raise ValueError(f"INSIGHTS_RULE_SETS is not valid JSON: {e}") from e
+    if not isinstance(rule_sets, dict):
+        raise ValueError("INSIGHTS_RULE_SETS must be a JSON object of rule sets")
+    for name, overrides in rule_sets.items():
+        if not isinstance(overrides, dict):
+            raise ValueError(f"INSIGHTS_RULE_SETS[{name!r}] must be an object of threshold overrides")
+        unknown = sorted(set(overrides) - set(DEFAULT_THRESHOLDS))
+        if unknown:
+            raise ValueError(f"INSIGHTS_RULE_SETS[{name!r}] has unknown thresholds {unknown}; expected {sorted(DEFAULT_THRESHOLDS)}")
+        not_ints = sorted(k for k, v in overrides.items() if type(v) is not int)
+        if not_ints:
+            raise ValueError(f"INSIGHTS_RULE_SETS[{name!r}] thresholds must be integers: {not_ints}")
+    return rule_sets
+
+
+def get_insights_settings() -> InsightsSettings:
+    # Named overrides of the account-manager thresholds, e.g. one per region:
+    # INSIGHTS_RULE_SETS='{"emea": {"HIGH_SEATS": 20, "LOW_SEATS": 3}}'. Thresholds a set omits keep their defaults.
+    # Malformed sets raise ValueError; the app reads these settings at startup, so it fails to boot
+    return InsightsSettings(rule_sets=_parse_rule_sets(os.getenv("INSIGHTS_RULE_SETS", "").strip()))
@@ -0,0 +1,50 @@
+from typing import TypedDict
+
+from fastapi import HTTPException
+
+from services.insights.analytics import (
+    ChartData,
+    UsageBySubscriptionStatus,
+    notifications_sent_vs_billed_from,
+    subscriptions_by_status_from,
+    top_workflows_from,
+    usage_by_subscription_status_from,
+)
+from services.insights.repository import get_snapshot_or_404
+from services.insights.summary import (
+    DEFAULT_RULE_SET,
+    AccountManagerSummary,
+    LeadershipSummary,
+    account_manager_summary_of,
+    leadership_summary_from,
+)
+
+
+class Dashboard(TypedDict):
+    leadership: LeadershipSummary
+    account_manager: AccountManagerSummary
+    subscriptions_by_status: ChartData
+    notifications_sent_vs_billed: ChartData
+    top_workflows: ChartData
+    usage_by_subscription_status: UsageBySubscriptionStatus
+
+
+def get_dashboard(*, top_workflows_limit: int = 10, rule_set: str = DEFAULT_RULE_SET) -> Dashboard:
+    """Every dashboard panel from one snapshot read, so all panels describe the same data version.
+
+    The charts and the leadership summary read the maintained totals; only the account-manager
+    action lists touch per-account data, in one pass over the columns cached per rule set.
+    """
+    if top_workflows_limit < 1 or top_workflows_limit > 100:
+        raise HTTPException(status_code=422, detail="'top_workflows_limit' must be between 1 and 100")
+
+    snapshot = get_snapshot_or_404()
+    totals = snapshot.totals
+    return {
+        "leadership": leadership_summary_from(totals),
+        "account_manager": account_manager_summary_of(snapshot, rule_set=rule_set),
+        "subscriptions_by_status": subscriptions_by_status_from(totals),
+        "notifications_sent_vs_billed": notifications_sent_vs_billed_from(totals),
+        "top_workflows": top_workflows_from(totals, limit=top_workflows_limit),
+        "usage_by_subscription_status": usage_by_subscription_status_from(totals),
+    }
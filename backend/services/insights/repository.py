@@ -1,11 +1,26 @@
 from fastapi import HTTPException
 
 from models.account_aggregate import AccountAggregate
-from services.store import STORE
+from services.columns import AccountColumns
+from services.store import STORE, StoreSnapshot
+from services.totals import AccountTotals
+
+
+def get_snapshot_or_404() -> StoreSnapshot:
+    # Read the reference once: everything derived from it is one consistent version
+    snapshot = STORE.snapshot
+    if not snapshot.accounts:
+        raise HTTPException(status_code=404, detail="No ingested data available. Ingest a CSV first.")
+    return snapshot
 
 
 def get_accounts_or_404() -> list[AccountAggregate]:
+    return list(get_snapshot_or_404().accounts.values())
 
-    if not STORE.accounts:
-        raise HTTPException(status_code=404, detail="No ingested data available. Ingest a CSV first.")
-    return list(STORE.accounts.values())
\ No newline at end of file
+
+def get_columns_or_404() -> AccountColumns:
+    return get_snapshot_or_404().columns
+
+
+def get_totals_or_404() -> AccountTotals:
+    return get_snapshot_or_404().totals
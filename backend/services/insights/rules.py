@@ -0,0 +1,129 @@
+import ast
+from dataclasses import dataclass, field
+from typing import Callable, Mapping
+
+from services.columns import SEAT_FIELDS, STATUS_CODES, USAGE_FIELDS, AccountColumns, positions_of
+
+# Per-account values a rule may read; each is one column of AccountColumns
+FIELDS: tuple[str, ...] = ("status", *SEAT_FIELDS, *USAGE_FIELDS)
+
+# Values computed once per account from FIELDS, shared by every rule that names them
+DERIVED: dict[str, str] = {"seats_total": "admin_seats + user_seats + read_only_seats"}
+
+# Names usable in any rule: status codes compare directly against `status`
+BUILTIN_CONSTANTS: dict[str, int] = {s.name.upper(): code for s, code in STATUS_CODES.items()}
+
+# Rule outcomes are packed into one byte per account
+MAX_RULES = 8
+
+# bytes.translate tables turning a classification into the 0/1 mask of one rule's bit
+_BIT_TABLES = [bytes((code >> bit) & 1 for code in range(256)) for bit in range(MAX_RULES)]
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One heuristic: `when` is a boolean expression over FIELDS, DERIVED and constant names."""
+
+    name: str
+    when: str
+    reason: str
+    recommended_actions: tuple[str, ...] = ()
+
+
+def _check_expression(rule: Rule, names: set[str]) -> set[str]:
+    # Only comparisons, boolean logic and arithmetic over known names; returns the names used
+    try:
+        tree = ast.parse(rule.when, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Rule {rule.name!r}: invalid expression: {e.msg}") from e
+    used = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Rule {rule.name!r}: {type(node).__name__} is not allowed")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, int):
+            raise ValueError(f"Rule {rule.name!r}: only integer constants are allowed")
+        if isinstance(node, ast.Name):
+            if node.id not in names:
+                raise ValueError(f"Rule {rule.name!r}: unknown name {node.id!r}")
+            used.add(node.id)
+    return used
+
+
+@dataclass(frozen=True)
+class RuleEngine:
+    """Classifies every account against all rules in a single fused pass over the columns.
+
+    The rules are compiled into one function taking only the columns they read. It is mapped
+    over those columns once, so each value is read once per account, derived values are
+    computed once per account, and the result is one byte per account with a bit per rule.
+    """
+
+    rules: tuple[Rule, ...]
+    constants: Mapping[str, int] = field(default_factory=dict)
+    _fields: tuple[str, ...] = field(init=False, repr=False)
+    _classify: Callable[..., int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0 < len(self.rules) <= MAX_RULES:
+            raise ValueError(f"A rule engine takes 1 to {MAX_RULES} rules, got {len(self.rules)}")
+        if len({r.name for r in self.rules}) != len(self.rules):
+            raise ValueError("Rule names must be unique")
+        constants = {**BUILTIN_CONSTANTS, **self.constants}
+        if shadowed := set(constants) & (set(FIELDS) | set(DERIVED)):
+            raise ValueError(f"Constants shadow account fields: {sorted(shadowed)}")
+        known = set(FIELDS) | set(DERIVED) | set(constants)
+        used = set().union(*(_check_expression(r, known) for r in self.rules))
+        derived = [name for name in DERIVED if name in used]
+        for name in derived:
+            used |= {n.id for n in ast.walk(ast.parse(DERIVED[name], mode="eval")) if isinstance(n, ast.Name)}
+        fields = tuple(f for f in FIELDS if f in used)
+
+        bits = " | ".join(f"({1 << i} if ({rule.when}) else 0)" for i, rule in enumerate(self.rules))
+        source = "\n".join(
+            [
+                f"def _classify({', '.join(fields)}):",
+                *(f"    {name} = {DERIVED[name]}" for name in derived),
+                f"    return {bits}",
+            ]
+        )
+        namespace: dict = {}
+        # Safe: every expression was restricted to the whitelisted AST nodes above
+        exec(compile(source, "<rules>", "exec"), dict(constants), namespace)
+        object.__setattr__(self, "_fields", fields)
+        object.__setattr__(self, "_classify", namespace["_classify"])
+
+    def classify(self, columns: AccountColumns) -> bytes:
+        """One byte per account position; bit i is set when rules[i] matched."""
+        if not self._fields:
+            return bytes([self._classify()]) * len(columns)
+        return bytes(map(self._classify, *(columns.status if f == "status" else columns[f] for f in self._fields)))
+
+    def evaluate(self, columns: AccountColumns) -> dict[str, list[int]]:
+        """Rule name -> positions of the matching accounts, in store order."""
+        codes = self.classify(columns)
+        return {rule.name: positions_of(codes.translate(_BIT_TABLES[i])) for i, rule in enumerate(self.rules)}
+
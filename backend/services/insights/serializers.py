@@ -1,6 +1,8 @@
-from typing import TypedDict
+import json
+from typing import Any, Iterable, Mapping, Optional, TypedDict
 
 from models.account_aggregate import AccountAggregate
+from services.account_index import AccountIndex
 
 
 class SubscriptionRecord(TypedDict):
@@ -52,4 +54,43 @@ def account_to_record(a: AccountAggregate) -> AccountRecord:
             "count": len(a.workflows),
             "titles": [w.title for w in a.workflows],
         },
-    }
\ No newline at end of file
+    }
+
+def _dumps(value: Any) -> bytes:
+    # Same bytes FastAPI's response_model path produces: compact, UTF-8, not ASCII-escaped
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def record_json(index: AccountIndex, position: int) -> bytes:
+    """One encoded record, from the cache when present; bulk readers use this to avoid filling it."""
+    fragment = index.record_json[position]
+    return fragment if fragment is not None else _dumps(account_to_record(index.accounts[position]))
+
+
+def records_json(index: AccountIndex, positions: Iterable[int]) -> list[bytes]:
+    """Encoded records for `positions`; each account is encoded at most once per snapshot."""
+    cache = index.record_json
+    fragments = []
+    for p in positions:
+        fragment = cache[p]
+        if fragment is None:
+            # Racing requests may both encode; either result is identical
+            fragment = cache[p] = _dumps(account_to_record(index.accounts[p]))
+        fragments.append(fragment)
+    return fragments
+
+
+def accounts_page_json(page: Mapping[str, Any], items: list[bytes], *, next_cursor: Optional[str]) -> bytes:
+    """The enveloped AccountsPageDTO body, spliced together from pre-encoded record fragments."""
+    head = _dumps({k: page[k] for k in ("page", "page_size", "total_items", "total_pages")})
+    return b"".join(
+        (
+            b'{"status":true,"data":',
+            head[:-1],
+            b',"items":[',
+            b",".join(items),
+            b'],"next_cursor":',
+            _dumps(next_cursor),
+            b"}}",
+        )
+    )
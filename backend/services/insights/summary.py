@@ -1,18 +1,20 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Literal, Optional, TypedDict, Union, Any
 
 from fastapi import HTTPException
 
 from models.subscription import SubscriptionStatus
-from services.insights.repository import get_accounts_or_404
+from services.columns import AccountColumns
+from services.insights.config import DEFAULT_THRESHOLDS, get_insights_settings
+from services.insights.repository import get_snapshot_or_404, get_totals_or_404
+from services.insights.rules import Rule, RuleEngine
+from services.store import StoreSnapshot
+from services.totals import AccountTotals
 
+DEFAULT_RULE_SET = "default"
 
-
-_HIGH_SEATS = 10
-_LOW_ACTIVITY_MESSAGES = 5
-_LOW_ACTIVITY_NOTIFICATIONS = 5
-_HIGH_ACTIVITY_NOTIFICATIONS = 200
-_LOW_SEATS = 2
+Thresholds = tuple[tuple[str, int], ...]
 
 class LeadershipAnalytics(TypedDict):
     accounts_total: int
@@ -70,19 +72,22 @@ class Audience(str, Enum):
 
 
 def leadership_summary() -> LeadershipSummary:
-    accounts = get_accounts_or_404()
+    return leadership_summary_from(get_totals_or_404())
+
 
-    total_accounts = len(accounts)
-    active_accounts = sum(1 for a in accounts if a.subscription.status == SubscriptionStatus.active)
+def leadership_summary_from(totals: AccountTotals) -> LeadershipSummary:
+
+    total_accounts = totals.accounts
+    active_accounts = totals.status_counts[SubscriptionStatus.active]
     inactive_accounts = total_accounts - active_accounts
 
-    workflows_total = sum(len(a.workflows) for a in accounts)
-    workflow_titles_unique = len({w.title for a in accounts for w in a.workflows})
+    workflows_total = totals.workflows
+    workflow_titles_unique = totals.unique_titles()
 
-    automation_count_total = sum(a.usage.automation_count for a in accounts)
-    messages_processed_total = sum(a.usage.messages_processed for a in accounts)
-    notifications_sent_total = sum(a.usage.notifications_sent for a in accounts)
-    notifications_billed_total = sum(a.usage.notifications_billed for a in accounts)
+    automation_count_total = totals.usage_total("automation_count")
+    messages_processed_total = totals.usage_total("messages_processed")
+    notifications_sent_total = totals.usage_total("notifications_sent")
+    notifications_billed_total = totals.usage_total("notifications_billed")
 
     billed_ratio = (
         (notifications_billed_total / notifications_sent_total) if notifications_sent_total > 0 else None
@@ -103,125 +108,124 @@ def leadership_summary() -> LeadershipSummary:
         },
     }
 
-def _account_ref(a) -> AccountRef:
+def _account_refs(columns: AccountColumns, positions: list[int]) -> list[AccountRef]:
+    return [{"account_uuid": columns.uuid_strs[i], "account_label": columns.labels[i]} for i in positions]
+
+
+ACCOUNT_MANAGER_RULES: tuple[Rule, ...] = (
+    Rule(
+        name="inactive_with_usage",
+        when="status == INACTIVE and (messages_processed > 0 or notifications_sent > 0 or notifications_billed > 0)",
+        reason="Subscription is inactive but usage signals are > 0.",
+        recommended_actions=(
+            "Confirm whether usage reflects recent activity or data lag.",
+            "Reach out to renew/reactivate if activity is expected.",
+            "Check billing/notification rules if billed > 0 while inactive.",
+        ),
+    ),
+    Rule(
+        name="active_zero_activity",
+        when="status == ACTIVE and messages_processed == 0 and notifications_sent == 0 and automation_count == 0",
+        reason="Subscription is active but there is no measured activity (messages/notifications/automation).",
+        recommended_actions=(
+            "Verify onboarding completed (workflows configured, users added).",
+            "Schedule enablement/training; validate integrations are connected.",
+            "Identify first-use workflow and set activation goal.",
+        ),
+    ),
+    Rule(
+        name="seats_vs_usage_mismatch",
+        # Adoption risk (many seats, little activity) or expansion opportunity (few seats, heavy use)
+        when=(
+            "status == ACTIVE and ("
+            "(seats_total >= HIGH_SEATS and messages_processed <= LOW_ACTIVITY_MESSAGES"
+            " and notifications_sent <= LOW_ACTIVITY_NOTIFICATIONS and automation_count == 0)"
+            " or (seats_total <= LOW_SEATS and notifications_sent >= HIGH_ACTIVITY_NOTIFICATIONS))"
+        ),
+        reason="Seat allocation appears inconsistent with observed usage (heuristic).",
+        recommended_actions=(
+            "If high seats + low activity: identify activation blockers and schedule enablement.",
+            "If low seats + high activity: discuss expansion/licensing needs.",
+        ),
+    ),
+    Rule(
+        name="billed_vs_sent_anomalies",
+        # Only meaningful if we actually sent notifications
+        when="notifications_sent > 0 and (notifications_billed == 0 or notifications_billed > notifications_sent)",
+        reason="Notifications billed vs sent appears inconsistent (heuristic).",
+        recommended_actions=(
+            "If sent > 0 and billed == 0: review billing configuration/rules.",
+            "If billed > sent: verify definitions and data pipeline correctness.",
+        ),
+    ),
+)
+
+
+
+def rule_set_thresholds(rule_set: str = DEFAULT_RULE_SET) -> Thresholds:
+    """DEFAULT_THRESHOLDS with the named rule set's overrides applied, as a hashable key."""
+    if rule_set == DEFAULT_RULE_SET:
+        return tuple(DEFAULT_THRESHOLDS.items())
+    overrides = get_insights_settings().rule_sets.get(rule_set)
+    if overrides is None:
+        raise HTTPException(status_code=422, detail=f"Unknown 'rule_set': {rule_set!r}.")
+    return tuple({**DEFAULT_THRESHOLDS, **overrides}.items())
+
+
+@lru_cache(maxsize=64)
+def account_manager_engine(thresholds: Thresholds = tuple(DEFAULT_THRESHOLDS.items())) -> RuleEngine:
+    return RuleEngine(ACCOUNT_MANAGER_RULES, constants=dict(thresholds))
+
+
+def _build_action_list(*, reason: str, recommended_actions: list[str], items: list[AccountRef]) -> ActionList:
     return {
-        "account_uuid": str(a.account.account_uuid),
-        "account_label": a.account.account_label,
+        "reason": reason,
+        "recommended_actions": recommended_actions,
+        "items": items,
     }
 
 
-def _total_seats(a) -> int:
-    return a.subscription.admin_seats + a.subscription.user_seats + a.subscription.read_only_seats
-
+def account_manager_summary(*, rule_set: str = DEFAULT_RULE_SET) -> AccountManagerSummary:
+    return account_manager_summary_of(get_snapshot_or_404(), rule_set=rule_set)
 
-def _is_inactive_with_usage(a) -> bool:
-    return a.subscription.status == SubscriptionStatus.inactive and (
-        a.usage.messages_processed > 0
-        or a.usage.notifications_sent > 0
-        or a.usage.notifications_billed > 0
-    )
 
+def account_manager_summary_of(snapshot: StoreSnapshot, *, rule_set: str = DEFAULT_RULE_SET) -> AccountManagerSummary:
+    """The snapshot's summary under `rule_set`, computed once per (thresholds, data version).
 
-def _is_active_zero_activity(a) -> bool:
-    return (
-        a.subscription.status == SubscriptionStatus.active
-        and a.usage.messages_processed == 0
-        and a.usage.notifications_sent == 0
-        and a.usage.automation_count == 0
-    )
-
-
-def _is_seats_vs_usage_mismatch(a) -> bool:
-    if a.subscription.status != SubscriptionStatus.active:
-        return False
-
-    seats = _total_seats(a)
-
-    adoption_risk = (
-        seats >= _HIGH_SEATS
-        and a.usage.messages_processed <= _LOW_ACTIVITY_MESSAGES
-        and a.usage.notifications_sent <= _LOW_ACTIVITY_NOTIFICATIONS
-        and a.usage.automation_count == 0
-    )
+    A new ingest publishes a new snapshot with an empty cache; new thresholds cost one pass.
+    """
+    thresholds = rule_set_thresholds(rule_set)
+    result = snapshot.rule_results.get(thresholds)
+    if result is None:
+        result = snapshot.rule_results[thresholds] = account_manager_summary_from(snapshot.columns, thresholds=thresholds)
+    return result
 
-    expansion_opportunity = seats <= _LOW_SEATS and a.usage.notifications_sent >= _HIGH_ACTIVITY_NOTIFICATIONS
 
-    return adoption_risk or expansion_opportunity
-
-
-def _is_billed_vs_sent_anomaly(a) -> bool:
-    # Only meaningful if we actually sent notifications
-    if a.usage.notifications_sent <= 0:
-        return False
-
-    return a.usage.notifications_billed == 0 or a.usage.notifications_billed > a.usage.notifications_sent
-
-
-def _build_action_list(*, reason: str, recommended_actions: list[str], accounts) -> ActionList:
-    return {
-        "reason": reason,
-        "recommended_actions": recommended_actions,
-        "items": [_account_ref(a) for a in accounts],
+def account_manager_summary_from(
+    columns: AccountColumns, *, thresholds: Thresholds = tuple(DEFAULT_THRESHOLDS.items())
+) -> AccountManagerSummary:
+    # Every rule is evaluated in one pass over the columns
+    matches = account_manager_engine(thresholds).evaluate(columns)
+    action_lists = {
+        rule.name: _build_action_list(
+            reason=rule.reason,
+            recommended_actions=list(rule.recommended_actions),
+            items=_account_refs(columns, matches[rule.name]),
+        )
+        for rule in ACCOUNT_MANAGER_RULES
     }
 
-
-def account_manager_summary() -> AccountManagerSummary:
-    accounts = get_accounts_or_404()
-
-    inactive_with_usage_accounts = [a for a in accounts if _is_inactive_with_usage(a)]
-    active_zero_activity_accounts = [a for a in accounts if _is_active_zero_activity(a)]
-    seats_vs_usage_mismatch_accounts = [a for a in accounts if _is_seats_vs_usage_mismatch(a)]
-    billed_vs_sent_anomalies_accounts = [a for a in accounts if _is_billed_vs_sent_anomaly(a)]
-
     return {
         "analytics": {
-            "accounts_total": len(accounts),
-            "inactive_with_usage_count": len(inactive_with_usage_accounts),
-            "active_zero_activity_count": len(active_zero_activity_accounts),
-            "seats_vs_usage_mismatch_count": len(seats_vs_usage_mismatch_accounts),
-            "billed_vs_sent_anomalies_count": len(billed_vs_sent_anomalies_accounts),
-        },
-        "action_lists": {
-            "inactive_with_usage": _build_action_list(
-                reason="Subscription is inactive but usage signals are > 0.",
-                recommended_actions=[
-                    "Confirm whether usage reflects recent activity or data lag.",
-                    "Reach out to renew/reactivate if activity is expected.",
-                    "Check billing/notification rules if billed > 0 while inactive.",
-                ],
-                accounts=inactive_with_usage_accounts,
-            ),
-            "active_zero_activity": _build_action_list(
-                reason="Subscription is active but there is no measured activity (messages/notifications/automation).",
-                recommended_actions=[
-                    "Verify onboarding completed (workflows configured, users added).",
-                    "Schedule enablement/training; validate integrations are connected.",
-                    "Identify first-use workflow and set activation goal.",
-                ],
-                accounts=active_zero_activity_accounts,
-            ),
-            "seats_vs_usage_mismatch": _build_action_list(
-                reason="Seat allocation appears inconsistent with observed usage (heuristic).",
-                recommended_actions=[
-                    "If high seats + low activity: identify activation blockers and schedule enablement.",
-                    "If low seats + high activity: discuss expansion/licensing needs.",
-                ],
-                accounts=seats_vs_usage_mismatch_accounts,
-            ),
-            "billed_vs_sent_anomalies": _build_action_list(
-                reason="Notifications billed vs sent appears inconsistent (heuristic).",
-                recommended_actions=[
-                    "If sent > 0 and billed == 0: review billing configuration/rules.",
-                    "If billed > sent: verify definitions and data pipeline correctness.",
-                ],
-                accounts=billed_vs_sent_anomalies_accounts,
-            ),
+            "accounts_total": len(columns),
+            **{f"{name}_count": len(action_list["items"]) for name, action_list in action_lists.items()},
         },
+        "action_lists": action_lists,
     }
 
-def get_summary(*, audience: Audience) -> Summary:
+def get_summary(*, audience: Audience, rule_set: str = DEFAULT_RULE_SET) -> Summary:
     if audience == Audience.leadership:
         return leadership_summary()
     if audience == Audience.account_manager:
-        return account_manager_summary()
+        return account_manager_summary(rule_set=rule_set)
     raise HTTPException(status_code=422, detail="Invalid audience.")
\ No newline at end of file
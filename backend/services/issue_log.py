@@ -0,0 +1,200 @@
+import dataclasses
+import json
+import os
+import random
+import tempfile
+import weakref
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Generic, Iterable, Iterator, Mapping, Optional, TypeVar, TypedDict
+
+T = TypeVar("T")
+
+# Every INDEX_EVERY-th spilled record gets its byte offset indexed, so a page read seeks
+# close to its first record and skips at most INDEX_EVERY - 1 lines
+INDEX_EVERY = 256
+
+DEFAULT_MEMORY_CAP = 1000
+DEFAULT_MAX_RECORDS = 1_000_000
+DEFAULT_SAMPLE_SIZE = 100
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class IssueLog(Generic[T]):
+    """Append-only, memory-bounded record of ingest issues (row errors or conflicts).
+
+    Records are kept as compact JSON arrays of the dataclass fields. The first `memory_cap`
+    stay in memory; the rest spill to a temp NDJSON file with a sparse offset index. After
+    `max_records` records are only counted. Counters by category are always exact, and
+    `sample` is a uniform reservoir sample of everything appended.
+    """
+
+    def __init__(
+        self,
+        kind: type[T],
+        *,
+        category: Callable[[T], str],
+        memory_cap: int = DEFAULT_MEMORY_CAP,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        directory: Optional[str] = None,
+    ) -> None:
+        self.kind = kind
+        self._fields = [f.name for f in dataclasses.fields(kind)]
+        self._category = category
+        self._memory_cap = memory_cap
+        self._max_records = max_records
+        self._sample_size = sample_size
+        self._directory = directory
+        self._random = random.Random(0)
+
+        self.counts: Counter = Counter()
+        self.sample: list[T] = []
+        self.last_row_number = 0
+        self._total = 0
+
+        self._head: list[bytes] = []
+        self._spilled = 0
+        self._offsets = array("q")
+        self._path: Optional[str] = None
+        self._writer: Optional[BinaryIO] = None
+        self._write_pos = 0
+
+    def empty_like(self) -> "IssueLog[T]":
+        return IssueLog(
+            self.kind,
+            category=self._category,
+            memory_cap=self._memory_cap,
+            max_records=self._max_records,
+            sample_size=self._sample_size,
+            directory=self._directory,
+        )
+
+    def __len__(self) -> int:
+        # Everything appended, including records past max_records that were only counted
+        return self._total
+
+    @property
+    def max_records(self) -> int:
+        return self._max_records
+
+    @property
+    def stored(self) -> int:
+        return len(self._head) + self._spilled
+
+    @property
+    def truncated(self) -> bool:
+        return self._total > self.stored
+
+    def append(self, item: T) -> None:
+        self._total += 1
+        self.counts[self._category(item)] += 1
+        self.last_row_number = max(self.last_row_number, getattr(item, "row_number", 0))
+
+        if len(self.sample) < self._sample_size:
+            self.sample.append(item)
+        else:
+            j = self._random.randrange(self._total)
+            if j < self._sample_size:
+                self.sample[j] = item
+
+        if self.stored >= self._max_records:
+            return
+        line = self._encode(item)
+        if len(self._head) < self._memory_cap:
+            self._head.append(line)
+        else:
+            self._spill(line)
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.append(item)
+
+    def count_unstored(self, counts: Mapping[str, int]) -> None:
+        """Count records dropped before reaching this log because they were past `max_records` anyway.
+
+        They are counted by category like appended records, but never stored or sampled.
+        """
+        self._total += sum(counts.values())
+        self.counts.update(counts)
+
+    def _encode(self, item: T) -> bytes:
+        values = [getattr(item, name) for name in self._fields]
+        return json.dumps(values, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+    def _decode(self, line: bytes) -> T:
+        return self.kind(*json.loads(line))
+
+    def _spill(self, line: bytes) -> None:
+        if self._writer is None:
+            fd, self._path = tempfile.mkstemp(prefix="ingest-issues-", suffix=".ndjson", dir=self._directory)
+            self._writer = os.fdopen(fd, "wb")
+            # The file lives exactly as long as the log (and so the snapshot holding it)
+            weakref.finalize(self, _remove_quietly, self._path)
+        if not self._spilled % INDEX_EVERY:
+            self._offsets.append(self._write_pos)
+        self._writer.write(line + b"\n")
+        self._write_pos += len(line) + 1
+        self._spilled += 1
+
+    def seal(self) -> None:
+        """Finish writing; called once before the log is published."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _read_spilled(self, start: int, stop: int) -> Iterator[bytes]:
+        if self._path is None or start >= stop:
+            return
+        if self._writer is not None:
+            self._writer.flush()
+        block, skip = divmod(start, INDEX_EVERY)
+        # A separate handle per read: published logs are read from many request threads
+        with open(self._path, "rb") as f:
+            f.seek(self._offsets[block])
+            yield from (line.rstrip(b"\n") for line in islice(f, skip, skip + stop - start))
+
+    def _lines(self, start: int, stop: int) -> Iterator[bytes]:
+        head = len(self._head)
+        yield from self._head[start:min(stop, head)]
+        yield from self._read_spilled(max(start - head, 0), min(stop, self.stored) - head)
+
+    def __iter__(self) -> Iterator[T]:
+        return map(self._decode, self._lines(0, self.stored))
+
+    def page(self, offset: int, limit: int) -> list[T]:
+        return [self._decode(line) for line in self._lines(offset, offset + limit)]
+
+
+class IssuePage(TypedDict):
+    page: int
+    page_size: int
+    total_items: int
+    total_pages: int
+    total_seen: int
+    truncated: bool
+    counts: dict[str, int]
+    items: list[dict[str, Any]]
+
+
+def issue_page(log: IssueLog, *, page: int, page_size: int) -> IssuePage:
+    total_items = log.stored
+    total_pages = max(1, (total_items + page_size - 1) // page_size)
+    items = log.page((page - 1) * page_size, page_size)
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total_items": total_items,
+        "total_pages": total_pages,
+        "total_seen": len(log),
+        "truncated": log.truncated,
+        "counts": dict(log.counts),
+        "items": [dataclasses.asdict(item) for item in items],
+    }
@@ -0,0 +1,280 @@
+import csv
+import heapq
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from itertools import repeat
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, BinaryIO, Container, Iterable, Iterator
+from uuid import UUID
+
+from models.account_aggregate import AccountAggregate
+from services.aggregation import (
+    CHUNK_SIZE,
+    ConflictError,
+    IngestProgress,
+    ParseMode,
+    RowError,
+    add_workflow_title,
+    aggregate_from_parsed,
+    compared_values,
+    iter_chunks,
+    iter_csv_lines,
+    iter_parsed_rows,
+    load_and_aggregate,
+    new_conflict_log,
+    new_row_error_log,
+    record_conflicts,
+)
+from services.ingest_logging import IssueReporter
+from services.issue_log import DEFAULT_MAX_RECORDS, IssueLog
+
+
+@dataclass
+class ShardResult:
+    row_count: int
+    # First row of each account within the shard wins, exactly like a sequential pass
+    accounts: dict[UUID, AccountAggregate] = field(default_factory=dict)
+    first_rows: dict[UUID, int] = field(default_factory=dict)
+    # Later rows of an account grouped by their compared values, so the merge can re-check
+    # them against whichever row turns out to be first globally
+    variants: dict[UUID, dict[tuple[Any, ...], array]] = field(default_factory=dict)
+    # Only the first errors up to the merged log's max_records are shipped back; counts are exact
+    row_errors: list[RowError] = field(default_factory=list)
+    row_error_counts: Counter = field(default_factory=Counter)
+
+    @property
+    def row_error_total(self) -> int:
+        return sum(self.row_error_counts.values())
+
+
+class _CappedRowErrors:
+    """Row error sink for a shard: keeps the first `cap` errors and counts all of them by category."""
+
+    def __init__(self, cap: int) -> None:
+        self.cap = cap
+        self.items: list[RowError] = []
+        self.counts: Counter = Counter()
+
+    def append(self, e: RowError) -> None:
+        self.counts[e.category] += 1
+        if len(self.items) < self.cap:
+            self.items.append(e)
+
+
+def _iter_range_chunks(f: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = f.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+
+def shard_ranges(csv_path: Path, *, data_start: int, shards: int) -> list[tuple[int, int]]:
+    """Split [data_start, EOF) into byte ranges that each begin at the start of a line."""
+    size = csv_path.stat().st_size
+    bounds = [data_start]
+    with csv_path.open("rb") as f:
+        for i in range(1, shards):
+            pos = data_start + (size - data_start) * i // shards
+            if pos <= bounds[-1]:
+                continue
+            # Finish the line that `pos` falls into; a newline right before `pos` ends it
+            f.seek(pos - 1)
+            f.readline()
+            bounds.append(f.tell())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _has_multiline_records(csv_path: Path, *, data_start: int) -> bool:
+    """True when a quoted field spans lines, so some line starts fall inside a record."""
+    with csv_path.open("rb") as f:
+        f.seek(data_start)
+        # Without a quote character every line is exactly one record
+        if not any(b'"' in chunk for chunk in iter_chunks(f)):
+            return False
+        f.seek(data_start)
+        lines = 0
+
+        def counted(it: Iterator[str]) -> Iterator[str]:
+            nonlocal lines
+            for line in it:
+                lines += 1
+                yield line
+
+        # Same tokenizer as the sequential pass; it yields one (possibly empty) record per blank line too
+        records = sum(1 for _ in csv.reader(counted(iter_csv_lines(iter_chunks(f)))))
+    return records != lines
+
+
+def aggregate_shard(
+    csv_path: str,
+    start: int,
+    end: int,
+    fieldnames: list[str],
+    mode: ParseMode,
+    skip_keys: frozenset[str] = frozenset(),
+    max_row_errors: int = DEFAULT_MAX_RECORDS,
+) -> ShardResult:
+    """Worker entry point: parse one byte range with row numbers local to the shard (from 0).
+
+    Errors past `max_row_errors` within the shard are only counted: earlier rows of the file
+    fill the merged log at least as far, so it would never store them.
+    """
+    result = ShardResult(row_count=0)
+    row_errors = _CappedRowErrors(max_row_errors)
+
+    with open(csv_path, "rb") as f:
+        reader = csv.DictReader(iter_csv_lines(_iter_range_chunks(f, start, end)), fieldnames=fieldnames)
+        parsed_rows = 0
+        for row_number, parsed in iter_parsed_rows(
+            reader, mode=mode, row_errors=row_errors, first_row_number=0, skip_keys=skip_keys
+        ):
+            parsed_rows += 1
+            if parsed is None:
+                continue
+            existing = result.accounts.get(parsed.account_uuid)
+            if existing is None:
+                result.accounts[parsed.account_uuid] = aggregate_from_parsed(parsed)
+                result.first_rows[parsed.account_uuid] = row_number
+                continue
+
+            variants = result.variants.setdefault(parsed.account_uuid, {})
+            variants.setdefault(parsed.compared_values(), array("q")).append(row_number)
+            add_workflow_title(existing, parsed.workflow_title)
+
+    result.row_errors, result.row_error_counts = row_errors.items, row_errors.counts
+    # Every record was either yielded (parsed or skipped) or produced exactly one row error
+    result.row_count = parsed_rows + result.row_error_total
+    return result
+
+
+def _duplicate_rows(shard: ShardResult, owned_before: Container[UUID]) -> Iterator[tuple[int, UUID, tuple[Any, ...]]]:
+    """(row_number, account_uuid, compared values) of the shard's non-first rows, in row order."""
+    streams: list[Iterable[tuple[int, UUID, tuple[Any, ...]]]] = []
+    for account_uuid, agg in shard.accounts.items():
+        if account_uuid in owned_before:
+            # An earlier shard already owns this account: the shard's first row is a duplicate too
+            streams.append([(shard.first_rows[account_uuid], account_uuid, compared_values(agg))])
+        for got_values, rows in shard.variants.get(account_uuid, {}).items():
+            streams.append(zip(rows, repeat(account_uuid), repeat(got_values)))
+    # Each stream is sorted and every row is in exactly one of them
+    return heapq.merge(*streams, key=itemgetter(0))
+
+
+def merge_shards(
+    shards: list[ShardResult],
+    *,
+    first_row_number: int = 2,
+    row_errors: IssueLog[RowError] | None = None,
+    conflicts: IssueLog[ConflictError] | None = None,
+    reporter: IssueReporter | None = None,
+) -> tuple[dict[UUID, AccountAggregate], IssueLog[RowError], IssueLog[ConflictError]]:
+    """Merge shard results in file order, reproducing the sequential first-row-wins output.
+
+    Row errors and conflicts are streamed into the issue logs in row order, one shard at a time.
+    """
+    accounts: dict[UUID, AccountAggregate] = {}
+    row_errors = row_errors if row_errors is not None else new_row_error_log()
+    conflicts = conflicts if conflicts is not None else new_conflict_log()
+    reporter = reporter if reporter is not None else IssueReporter()
+
+    offset = first_row_number
+    for shard in shards:
+        for e in shard.row_errors:
+            err = replace(e, row_number=e.row_number + offset)
+            row_errors.append(err)
+            reporter.row_error(err)
+        dropped = shard.row_error_counts - Counter(e.category for e in shard.row_errors)
+        if dropped:
+            row_errors.count_unstored(dropped)
+            reporter.suppressed += sum(dropped.values())
+
+        # Conflicts are checked against the global first row, so they need the accounts owned before this shard
+        duplicates = _duplicate_rows(shard, accounts.keys())
+        for account_uuid, agg in shard.accounts.items():
+            existing = accounts.get(account_uuid)
+            if existing is None:
+                accounts[account_uuid] = agg
+            else:
+                for w in agg.workflows:
+                    add_workflow_title(existing, w.title)
+
+        for row_number, account_uuid, got_values in duplicates:
+            record_conflicts(
+                conflicts=conflicts,
+                account_uuid=account_uuid,
+                row_number=row_number + offset,
+                expected_values=compared_values(accounts[account_uuid]),
+                got_values=got_values,
+                reporter=reporter,
+            )
+
+        offset += shard.row_count
+
+    return accounts, row_errors, conflicts
+
+
+def load_and_aggregate_parallel(
+    csv_path: Path,
+    *,
+    workers: int,
+    mode: ParseMode = ParseMode.fast,
+    progress: IngestProgress | None = None,
+    skip_keys: frozenset[str] = frozenset(),
+    row_errors: IssueLog[RowError] | None = None,
+    conflicts: IssueLog[ConflictError] | None = None,
+    reporter: IssueReporter | None = None,
+) -> tuple[dict[UUID, AccountAggregate], IssueLog[RowError], IssueLog[ConflictError]]:
+    """Parse byte-range shards of the file in a process pool and merge them by global row number.
+
+    Shards are cut on physical line boundaries. Files where a quoted field spans lines (and
+    files whose header is not on the first line) are aggregated sequentially instead, so the
+    result is always the sequential one.
+    Each shard ships back at most the row log's `max_records` errors (plus exact counts), and
+    the merge streams errors and conflicts into the issue logs.
+    """
+    with csv_path.open("rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+    fieldnames = next(csv.reader(iter_csv_lines([header])), [])
+
+    row_errors = row_errors if row_errors is not None else new_row_error_log()
+    ranges = []
+    # Leading blank lines and empty files: let the sequential path apply DictReader's rules
+    if fieldnames and not _has_multiline_records(csv_path, data_start=data_start):
+        ranges = shard_ranges(csv_path, data_start=data_start, shards=workers)
+    if len(ranges) <= 1:
+        return load_and_aggregate(
+            csv_path,
+            mode=mode,
+            progress=progress,
+            skip_keys=skip_keys,
+            row_errors=row_errors,
+            conflicts=conflicts,
+            reporter=reporter,
+        )
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [
+            pool.submit(aggregate_shard, str(csv_path), start, end, fieldnames, mode, skip_keys, row_errors.max_records)
+            for start, end in ranges
+        ]
+        if progress is not None:
+            # Shards report as a whole; conflicts are only known after the merge
+            for future in as_completed(futures):
+                shard = future.result()
+                progress.rows_processed += shard.row_count
+                progress.row_errors += shard.row_error_total
+        shards = [f.result() for f in futures]
+
+    accounts, row_errors, conflicts = merge_shards(shards, row_errors=row_errors, conflicts=conflicts, reporter=reporter)
+    if progress is not None:
+        progress.conflicts = len(conflicts)
+    return accounts, row_errors, conflicts
@@ -1,26 +1,116 @@
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 from uuid import UUID
 
 from models.account_aggregate import AccountAggregate
+from services.account_index import AccountIndex
+from services.aggregation import ConflictError, RowError, new_conflict_log, new_row_error_log
+from services.columns import AccountColumns
+from services.issue_log import IssueLog
+from services.totals import AccountTotals
+
+
+@dataclass(frozen=True)
+class StoreSnapshot:
+    """One published, read-only version of the ingested data.
+
+    Snapshots are never changed after publication; a new ingest builds the next one
+    off to the side and the store swaps it in with a single reference assignment.
+    """
+
+    version: int = 0
+    accounts: Mapping[UUID, AccountAggregate] = field(default_factory=lambda: MappingProxyType({}))
+    # Columnar copy of the account metrics, position-aligned with `accounts` (services/columns.py)
+    columns: AccountColumns = field(default_factory=AccountColumns)
+    # Running totals the summary endpoints read without scanning (services/totals.py)
+    totals: AccountTotals = field(default_factory=AccountTotals)
+    # Filter indexes for the accounts query, derived from `columns` (services/account_index.py)
+    index: AccountIndex = field(default_factory=AccountIndex)
+    # Issue logs keep memory bounded; pages are read back from them (services/issue_log.py)
+    row_errors: IssueLog[RowError] = field(default_factory=new_row_error_log)
+    conflicts: IssueLog[ConflictError] = field(default_factory=new_conflict_log)
+    # Content hash of the source rows behind each account, for delta ingestion (services/delta.py)
+    row_digests: Mapping[str, bytes] = field(default_factory=lambda: MappingProxyType({}))
+    # Account-manager summaries computed from this snapshot, keyed by rule thresholds (services/insights/summary.py)
+    rule_results: dict = field(default_factory=dict, compare=False, repr=False)
+
+    source: Optional[str] = None
+    loaded_at: Optional[str] = None  # ISO string
 
 
 @dataclass
 class InMemoryStore:
-    accounts: dict[UUID, AccountAggregate] = field(default_factory=dict)
-    row_errors: list[dict] = field(default_factory=list)
-    conflicts: list[dict] = field(default_factory=list)
+    # Readers grab `STORE.snapshot` once per request and never lock
+    snapshot: StoreSnapshot = field(default_factory=StoreSnapshot)
 
     expected_headers: list[str] = field(default_factory=list)
 
-    source: Optional[str] = None
-    loaded_at: Optional[str] = None  # ISO string
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def version(self) -> int:
+        # Bumped by every set(); insights ETags are derived from it
+        return self.snapshot.version
+
+    @property
+    def accounts(self) -> Mapping[UUID, AccountAggregate]:
+        return self.snapshot.accounts
+
+    @property
+    def row_errors(self) -> IssueLog[RowError]:
+        return self.snapshot.row_errors
+
+    @property
+    def conflicts(self) -> IssueLog[ConflictError]:
+        return self.snapshot.conflicts
+
+    @property
+    def source(self) -> Optional[str]:
+        return self.snapshot.source
 
-    def set(self, *, source: str) -> None:
-        self.source = source
-        self.loaded_at = datetime.now(timezone.utc).isoformat()
+    @property
+    def loaded_at(self) -> Optional[str]:
+        return self.snapshot.loaded_at
 
+    def set(
+        self,
+        *,
+        source: str,
+        accounts: dict[UUID, AccountAggregate],
+        row_errors: Optional[IssueLog[RowError]] = None,
+        conflicts: Optional[IssueLog[ConflictError]] = None,
+        row_digests: Optional[dict[str, bytes]] = None,
+        columns: Optional[AccountColumns] = None,
+        totals: Optional[AccountTotals] = None,
+        index: Optional[AccountIndex] = None,
+    ) -> StoreSnapshot:
+        # `accounts` must be a dict the caller no longer mutates; it is published as-is.
+        # `columns`, `totals` and `index` must describe `accounts`; they are rebuilt from them when not given.
+        columns = columns if columns is not None else AccountColumns.build(accounts)
+        totals = totals if totals is not None else AccountTotals.build(accounts)
+        index = index if index is not None else AccountIndex.build(accounts, columns)
+        row_errors = row_errors if row_errors is not None else new_row_error_log()
+        conflicts = conflicts if conflicts is not None else new_conflict_log()
+        row_errors.seal()
+        conflicts.seal()
+        with self._write_lock:
+            snapshot = StoreSnapshot(
+                version=self.snapshot.version + 1,
+                accounts=MappingProxyType(accounts),
+                columns=columns,
+                totals=totals,
+                index=index,
+                row_errors=row_errors,
+                conflicts=conflicts,
+                row_digests=MappingProxyType(row_digests) if row_digests is not None else self.snapshot.row_digests,
+                source=source,
+                loaded_at=datetime.now(timezone.utc).isoformat(),
+            )
+            self.snapshot = snapshot
+        return snapshot
 
 
-STORE = InMemoryStore()
\ No newline at end of file
+STORE = InMemoryStore()
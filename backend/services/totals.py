@@ -0,0 +1,142 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Mapping, Optional
+from uuid import UUID
+
+from models.account_aggregate import AccountAggregate
+from models.subscription import SubscriptionStatus
+from services.columns import USAGE_FIELDS
+from services.sketches import ValueDistribution, WorkflowSketch
+
+
+def _zero_sums() -> dict[SubscriptionStatus, dict[str, int]]:
+    return {s: dict.fromkeys(USAGE_FIELDS, 0) for s in SubscriptionStatus}
+
+
+def _empty_distributions() -> dict[SubscriptionStatus, dict[str, ValueDistribution]]:
+    return {s: {name: ValueDistribution() for name in USAGE_FIELDS} for s in SubscriptionStatus}
+
+
+def _value_lists() -> dict[SubscriptionStatus, dict[str, list[int]]]:
+    return {s: {name: [] for name in USAGE_FIELDS} for s in SubscriptionStatus}
+
+
+@dataclass(frozen=True)
+class AccountTotals:
+    """Running aggregates over the published accounts, maintained per ingest instead of per request.
+
+    `with_changes` subtracts the replaced accounts' old contribution and adds the new one,
+    so an ingest pays O(changed accounts) and the summary endpoints read these in O(1).
+    """
+
+    accounts: int = 0
+    status_counts: dict[SubscriptionStatus, int] = field(default_factory=lambda: dict.fromkeys(SubscriptionStatus, 0))
+    # Usage sums split by subscription status; overall totals are the sum over statuses
+    usage_by_status: dict[SubscriptionStatus, dict[str, int]] = field(default_factory=_zero_sums)
+    # Workflow title -> number of accounts listing it; titles reaching zero are removed
+    title_counts: Counter = field(default_factory=Counter)
+    # Per-account usage value distributions (quantiles and histograms), split like usage_by_status
+    usage_distributions: dict[SubscriptionStatus, dict[str, ValueDistribution]] = field(default_factory=_empty_distributions)
+    # Workflows over all accounts, i.e. the sum of the title counts
+    workflows: int = 0
+    # Approximate mode: replaces title_counts (left empty) with constant-memory sketches.
+    # Only the totals shrink; AccountColumns and AccountIndex still keep one entry per distinct title
+    workflow_sketch: Optional[WorkflowSketch] = None
+
+    @classmethod
+    def build(cls, accounts: Mapping[UUID, AccountAggregate], *, workflow_sketch: bool = False) -> "AccountTotals":
+        return cls(workflow_sketch=WorkflowSketch() if workflow_sketch else None).with_changes({}, accounts)
+
+    def with_changes(
+        self, previous: Mapping[UUID, AccountAggregate], changed: Mapping[UUID, AccountAggregate]
+    ) -> "AccountTotals":
+        """Next totals after `changed` accounts replace their versions in `previous` (or are added)."""
+        if not changed:
+            return self
+
+        accounts = self.accounts
+        status_counts = dict(self.status_counts)
+        usage = {s: dict(sums) for s, sums in self.usage_by_status.items()}
+        # In approximate mode only this batch's title deltas are counted exactly, then folded into the sketch
+        titles = Counter() if self.workflow_sketch is not None else Counter(self.title_counts)
+        # Usage values entering and leaving the distributions, binned in bulk below
+        added, removed = _value_lists(), _value_lists()
+
+        for account_uuid, agg in changed.items():
+            old = previous.get(account_uuid)
+            if old is None:
+                accounts += 1
+            else:
+                _apply(old, -1, status_counts, usage, titles, removed)
+            _apply(agg, 1, status_counts, usage, titles, added)
+
+        distributions = {}
+        for status, by_field in self.usage_distributions.items():
+            distributions[status] = {}
+            for name, distribution in by_field.items():
+                if added[status][name] or removed[status][name]:
+                    distribution = distribution.copy()
+                    distribution.update(added[status][name])
+                    distribution.update(removed[status][name], sign=-1)
+                distributions[status][name] = distribution
+
+        sketch = None
+        if self.workflow_sketch is not None:
+            sketch = self.workflow_sketch.copy()
+            sketch.update(titles)
+            workflows = self.workflows + sum(titles.values())
+            titles = Counter()
+        else:
+            titles = Counter({t: c for t, c in titles.items() if c > 0})
+            workflows = sum(titles.values())
+
+        return AccountTotals(
+            accounts=accounts,
+            status_counts=status_counts,
+            usage_by_status=usage,
+            usage_distributions=distributions,
+            title_counts=titles,
+            workflows=workflows,
+            workflow_sketch=sketch,
+        )
+
+    def top_titles(self, limit: int) -> list[tuple[str, int]]:
+        if self.workflow_sketch is not None:
+            return self.workflow_sketch.top(limit)
+        return self.title_counts.most_common(limit)
+
+    def unique_titles(self) -> int:
+        if self.workflow_sketch is not None:
+            return self.workflow_sketch.distinct.count()
+        return len(self.title_counts)
+
+    def usage_distribution(self, name: str, status: Optional[SubscriptionStatus] = None) -> ValueDistribution:
+        if status is not None:
+            return self.usage_distributions[status][name]
+        merged = ValueDistribution()
+        for by_field in self.usage_distributions.values():
+            merged = merged.merge(by_field[name])
+        return merged
+
+    def usage_total(self, name: str) -> int:
+        return sum(sums[name] for sums in self.usage_by_status.values())
+
+
+def _apply(
+    agg: AccountAggregate,
+    sign: int,
+    status_counts: dict[SubscriptionStatus, int],
+    usage: dict[SubscriptionStatus, dict[str, int]],
+    titles: Counter,
+    values: dict[SubscriptionStatus, dict[str, list[int]]],
+) -> None:
+    status = agg.subscription.status
+    status_counts[status] += sign
+    sums = usage[status]
+    lists = values[status]
+    for name in USAGE_FIELDS:
+        value = getattr(agg.usage, name)
+        sums[name] += sign * value
+        lists[name].append(value)
+    for w in agg.workflows:
+        titles[w.title] += sign
@@ -1,23 +1,107 @@
+import time
+
 import pytest
 
 
+def _wait_for_job(client, auth_headers, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(f"/api/ingest/jobs/{job_id}", headers=auth_headers)
+        assert response.status_code == 200
+        job = response.json()["data"]
+        if job["state"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
 @pytest.mark.integration
 @pytest.mark.ingestion
 class TestIngestionController:
     """Integration tests for data ingestion endpoints"""
 
     def test_upload_csv_success(self, client, auth_headers, valid_csv_file_factory):
-        """Test POST /api/ingest/ with valid CSV file"""
+        """Test POST /api/ingest/ with valid CSV file returns an ingestion job"""
         files = {"file": ("test.csv", valid_csv_file_factory(), "text/csv")}
 
         response = client.post("/api/ingest/", headers=auth_headers, files=files)
-        assert response.status_code == 200
+        assert response.status_code == 202
 
         data = response.json()["data"]
         status = response.json()["status"]
         assert status is True
         assert "ok" in data
         assert "records_loaded" in data
+        assert data["job_id"]
+        assert data["source"] == "upload:test.csv"
+        assert data["state"] in ("queued", "running", "succeeded")
+
+    def test_upload_job_reports_progress(self, client, auth_headers, valid_csv_file_factory):
+        """Test GET /api/ingest/jobs/{id} reports rows, errors and completion"""
+        files = {"file": ("test.csv", valid_csv_file_factory(), "text/csv")}
+        job_id = client.post("/api/ingest/", headers=auth_headers, files=files).json()["data"]["job_id"]
+
+        job = _wait_for_job(client, auth_headers, job_id)
+
+        assert job["state"] == "succeeded"
+        assert job["rows_processed"] == 2
+        # Neither fixture row has a valid UUID (and one has an unknown status)
+        assert job["row_errors"] == 2
+        assert job["conflicts"] == 0
+        assert job["rows_per_sec"] >= 0
+        assert job["started_at"] and job["finished_at"]
+
+    def test_row_errors_are_paged(self, client, auth_headers, valid_csv_file_factory):
+        """Test GET /api/ingest/errors pages the last ingest's rejected rows"""
+        files = {"file": ("test.csv", valid_csv_file_factory(), "text/csv")}
+        job_id = client.post("/api/ingest/", headers=auth_headers, files=files).json()["data"]["job_id"]
+        assert _wait_for_job(client, auth_headers, job_id)["state"] == "succeeded"
+
+        response = client.get("/api/ingest/errors?page=1&page_size=1", headers=auth_headers)
+        assert response.status_code == 200
+
+        data = response.json()["data"]
+        assert data["total_items"] == data["total_seen"] == 2
+        assert data["total_pages"] == 2
+        assert data["truncated"] is False
+        assert sum(data["counts"].values()) == 2
+        [item] = data["items"]
+        assert item["row_number"] == 2
+        assert item["raw"]["Account UUID"]
+
+        conflicts = client.get("/api/ingest/conflicts", headers=auth_headers).json()["data"]
+        assert conflicts["total_items"] == 0
+        assert conflicts["items"] == []
+
+    def test_reload_runs_as_job(self, client, auth_headers):
+        """Test POST /api/ingest/reload returns a job that completes"""
+        response = client.post("/api/ingest/reload", headers=auth_headers)
+        assert response.status_code == 202
+
+        job = _wait_for_job(client, auth_headers, response.json()["data"]["job_id"])
+        assert job["state"] == "succeeded"
+        assert job["rows_processed"] > 0
+        assert job["records_loaded"] > 0
+
+    def test_failed_job_is_not_ok(self, client, auth_headers, monkeypatch):
+        """Test a job that fails reports ok=false and loads no records"""
+        from fastapi import HTTPException
+
+        def fail(*_, **__):
+            raise HTTPException(status_code=422, detail="CSV headers do not match expected schema")
+
+        monkeypatch.setattr("controllers.ingestion.ingest_path", fail)
+        response = client.post("/api/ingest/reload", headers=auth_headers)
+
+        job = _wait_for_job(client, auth_headers, response.json()["data"]["job_id"])
+        assert job["state"] == "failed"
+        assert job["ok"] is False
+        assert job["records_loaded"] == 0
+        assert job["error"] == "CSV headers do not match expected schema"
+
+    def test_unknown_job_returns_404(self, client, auth_headers):
+        """Test unknown job ids are reported as not found"""
+        response = client.get("/api/ingest/jobs/does-not-exist", headers=auth_headers)
+        assert response.status_code == 404
 
     def test_upload_csv_requires_authentication(self, client, valid_csv_file_factory):
         """Test upload requires authentication"""
@@ -34,6 +34,18 @@ class TestInsightsController:
         assert "action_lists" in data
         assert isinstance(data["action_lists"], dict)
 
+    def test_get_summary_account_manager_with_rule_set(self, client, auth_headers, monkeypatch):
+        """Test a configured rule set changes the thresholds, and unknown rule sets are rejected"""
+        monkeypatch.setenv("INSIGHTS_RULE_SETS", '{"strict": {"HIGH_SEATS": 0, "LOW_ACTIVITY_MESSAGES": 10000000}}')
+        get = lambda query: client.get(f"/api/insights/summary?audience=account_manager{query}", headers=auth_headers)
+
+        default, strict = get("").json()["data"], get("&rule_set=strict").json()["data"]
+        assert strict["action_lists"]["inactive_with_usage"] == default["action_lists"]["inactive_with_usage"]
+        count = lambda data: data["analytics"]["seats_vs_usage_mismatch_count"]
+        assert count(strict) >= count(default)
+
+        assert get("&rule_set=nowhere").status_code == 422
+
     def test_get_summary_requires_authentication(self, client):
         """Test summary endpoint requires authentication"""
         response = client.get("/api/insights/summary")
@@ -154,6 +166,139 @@ class TestInsightsController:
         for account in data["items"]:
             assert account["subscription"]["status"] == "active"
 
+    def test_get_accounts_cursor_pages_match_offset_pages(self, client, auth_headers):
+        """Test following next_cursor visits the same accounts as offset paging"""
+        query = "/api/insights/accounts?page_size=3&sort_by=notifications_sent&sort_dir=desc"
+        everything = client.get(f"{query}&page_size=200", headers=auth_headers).json()["data"]["items"]
+
+        seen, cursor = [], None
+        while True:
+            url = f"{query}&cursor={cursor}" if cursor else query
+            data = client.get(url, headers=auth_headers).json()["data"]
+            seen.extend(item["account_uuid"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+            assert data["page"] == (1 if len(seen) == 3 else None)
+
+        assert seen == [item["account_uuid"] for item in everything]
+
+    def test_get_accounts_pre_encoded_body_matches_the_response_model(self, client, auth_headers):
+        """Test the cached-fragment body is byte-identical to validating and dumping the DTO"""
+        from models.api_responses import AccountsPageDTO, ApiSuccessResponse
+        from services.insights.accounts_query import SortBy, SortDir, get_records
+
+        for _ in range(2):  # second round is served from the fragment cache
+            response = client.get(
+                "/api/insights/accounts?page_size=4&sort_by=total_records&sort_dir=desc", headers=auth_headers
+            )
+            page = get_records(page_size=4, sort_by=SortBy.total_records, sort_dir=SortDir.desc)
+            expected = ApiSuccessResponse[AccountsPageDTO].model_validate({"status": True, "data": page})
+            assert response.content == expected.model_dump_json().encode("utf-8")
+            assert response.headers["etag"]
+
+    def test_get_accounts_rejects_bad_cursors(self, client, auth_headers):
+        """Test malformed cursors and cursors from another sort are rejected"""
+        first = client.get("/api/insights/accounts?page_size=1", headers=auth_headers).json()["data"]
+        cursor = first["next_cursor"]
+
+        other_sort = client.get(f"/api/insights/accounts?sort_by=total_records&cursor={cursor}", headers=auth_headers)
+        assert other_sort.status_code == 422
+
+        garbage = client.get("/api/insights/accounts?cursor=not-a-cursor", headers=auth_headers)
+        assert garbage.status_code == 422
+
+    def test_insights_support_conditional_get(self, client, auth_headers, monkeypatch):
+        """Test ETags follow the data version and a matching If-None-Match skips the endpoint"""
+        from common import conditional
+        from services.store import STORE
+
+        url = "/api/insights/summary?audience=leadership"
+        first = client.get(url, headers=auth_headers)
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+        assert etag.startswith(f'W/"{conditional.BOOT_ID}-{STORE.version}-')
+        assert client.get("/api/insights/summary?audience=account_manager", headers=auth_headers).headers["etag"] != etag
+
+        def must_not_run(**_):
+            raise AssertionError("analytics ran for a conditional hit")
+
+        monkeypatch.setattr("controllers.insights.get_summary", must_not_run)
+        cached = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        monkeypatch.undo()
+
+        STORE.set(source=STORE.source, accounts=dict(STORE.accounts))
+        refreshed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.headers["etag"] != etag
+
+        # Another process restarting from the same version number must not match
+        monkeypatch.setattr(conditional, "BOOT_ID", "restarted")
+        restarted = client.get(url, headers={**auth_headers, "If-None-Match": refreshed.headers["etag"]})
+        assert restarted.status_code == 200
+
+    def test_export_streams_every_matching_account_in_order(self, client, auth_headers):
+        """Test CSV and NDJSON exports match the paged listing for the same filters and sort"""
+        import csv
+        import io
+        import json
+
+        query = "status=active&sort_by=notifications_sent&sort_dir=desc"
+        listed = client.get(f"/api/insights/accounts?{query}&page_size=200", headers=auth_headers).json()["data"]
+        assert listed["total_items"] == len(listed["items"])
+
+        ndjson = client.get(f"/api/insights/accounts/export?format=ndjson&{query}", headers=auth_headers)
+        assert ndjson.status_code == 200
+        assert ndjson.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in ndjson.text.splitlines()] == listed["items"]
+
+        exported = client.get(f"/api/insights/accounts/export?{query}", headers=auth_headers)
+        assert exported.headers["content-disposition"] == 'attachment; filename="accounts.csv"'
+        rows = list(csv.DictReader(io.StringIO(exported.text)))
+        assert [r["account_uuid"] for r in rows] == [item["account_uuid"] for item in listed["items"]]
+        assert all(r["subscription_status"] == "active" for r in rows)
+
+        bad = client.get("/api/insights/accounts/export?status=paused", headers=auth_headers)
+        assert bad.status_code == 422
+
+    def test_dashboard_bundles_every_panel(self, client, auth_headers):
+        """Test GET /api/insights/dashboard returns what the five separate calls return"""
+        response = client.get("/api/insights/dashboard?top_workflows_limit=5", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+
+        get = lambda url: client.get(url, headers=auth_headers).json()["data"]
+        assert data["leadership"] == get("/api/insights/summary?audience=leadership")
+        assert data["account_manager"] == get("/api/insights/summary?audience=account_manager")
+        assert data["subscriptions_by_status"] == get("/api/insights/analytics/subscriptions-by-status")
+        assert data["notifications_sent_vs_billed"] == get("/api/insights/analytics/notifications-sent-vs-billed")
+        assert data["top_workflows"] == get("/api/insights/analytics/workflows/top?limit=5")
+        assert data["usage_by_subscription_status"] == get("/api/insights/analytics/usage/by-subscription-status")
+
+    def test_aggregate_groups_and_aggregates(self, client, auth_headers):
+        """Test POST /api/insights/aggregate agrees with the fixed analytics endpoints"""
+        body = {
+            "group_by": ["status"],
+            "aggregations": [{"op": "count"}, {"op": "sum", "field": "messages_processed"}],
+        }
+        response = client.post("/api/insights/aggregate", json=body, headers=auth_headers)
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        data = response.json()["data"]
+
+        usage = client.get("/api/insights/analytics/usage/by-subscription-status", headers=auth_headers).json()["data"]
+        for group in data["groups"]:
+            totals = usage[group["key"]["status"]]
+            assert group["values"] == {"count": totals["accounts"], "sum_messages_processed": totals["messages_processed_total"]}
+
+        bad = {"aggregations": [{"op": "percentile", "field": "user_seats"}]}
+        assert client.post("/api/insights/aggregate", json=bad, headers=auth_headers).status_code == 422
+        bad_status = {"filters": {"status": "paused"}, "aggregations": [{"op": "count"}]}
+        assert client.post("/api/insights/aggregate", json=bad_status, headers=auth_headers).status_code == 422
+
     def test_get_subscriptions_by_status(self, client, auth_headers):
         """Test GET /api/insights/analytics/subscriptions-by-status"""
         response = client.get(
@@ -232,6 +377,31 @@ class TestInsightsController:
         assert "accounts" in data["inactive"]
         assert "total_records_total" in data["inactive"]
 
+    def test_get_usage_distribution(self, client, auth_headers):
+        """Test GET /api/insights/analytics/usage/distribution returns quantiles and a histogram"""
+        url = "/api/insights/analytics/usage/distribution"
+        response = client.get(f"{url}?field=notifications_sent&status=active&q=0&q=50&q=100", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+
+        usage = client.get("/api/insights/analytics/usage/by-subscription-status", headers=auth_headers).json()["data"]
+        assert data["accounts"] == usage["active"]["accounts"]
+        assert sum(data["histogram"]["values"]) == data["accounts"]
+        assert [q["q"] for q in data["quantiles"]] == [0, 50, 100]
+        values = [q["value"] for q in data["quantiles"]]
+        assert values == sorted(values)
+
+        assert client.get(f"{url}?q=101", headers=auth_headers).status_code == 422
+        assert client.get(f"{url}?" + "&".join(["q=50"] * 21), headers=auth_headers).status_code == 422
+        q_schema = next(
+            p["schema"]
+            for p in client.get("/openapi.json").json()["paths"][url]["get"]["parameters"]
+            if p["name"] == "q"
+        )
+        assert (q_schema["minItems"], q_schema["maxItems"]) == (1, 20)
+        assert (q_schema["items"]["minimum"], q_schema["items"]["maximum"]) == (0, 100)
+        assert client.get(f"{url}?field=admin_seats", headers=auth_headers).status_code == 422
+
     def test_analytics_endpoints_require_authentication(self, client):
         """Test all analytics endpoints require authentication"""
         endpoints = [
@@ -0,0 +1,57 @@
+import random
+import uuid
+
+import pytest
+
+import services.insights.repository as repository
+from models.account_aggregate import AccountAggregate
+from services.store import InMemoryStore
+
+TITLES = ["Lead Sync", "Q3 Outreach", "Renewal", "NPS Survey"]
+
+
+def _account(rng: random.Random, account_uuid: uuid.UUID) -> AccountAggregate:
+    return AccountAggregate.model_validate(
+        {
+            "account": {"account_uuid": account_uuid, "account_label": f"Account {rng.randint(0, 999)}"},
+            "subscription": {
+                "status": rng.choice(["active", "inactive"]),
+                "admin_seats": rng.randint(0, 6),
+                "user_seats": rng.randint(0, 6),
+                "read_only_seats": rng.randint(0, 2),
+            },
+            "usage": {
+                "total_records": rng.randint(0, 100),
+                "automation_count": rng.choice([0, 0, 1]),
+                "messages_processed": rng.choice([0, 3, 50]),
+                "notifications_sent": rng.choice([0, 4, 250]),
+                "notifications_billed": rng.choice([0, 4, 300]),
+            },
+            "workflows": [{"title": t} for t in rng.sample(TITLES, rng.randint(0, 3))],
+        }
+    )
+
+
+def _accounts(n: int, seed: int = 1) -> dict[uuid.UUID, AccountAggregate]:
+    rng = random.Random(seed)
+    return {u: _account(rng, u) for u in (uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(n))}
+
+
+@pytest.fixture
+def make_account():
+    """make_account(rng, uuid): one random account drawn from `rng`"""
+    return _account
+
+
+@pytest.fixture
+def make_accounts():
+    """make_accounts(n, seed=1): `n` random accounts keyed by uuid, the same ones for the same seed"""
+    return _accounts
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """An empty store the insights services read instead of the app's"""
+    store = InMemoryStore()
+    monkeypatch.setattr(repository, "STORE", store)
+    return store
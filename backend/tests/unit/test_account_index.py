@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+import services.account_index as account_index
+from models.account_aggregate import AccountAggregate
+from models.subscription import SubscriptionStatus
+from services.account_index import AccountIndex, OrderPlan, plan_order
+from services.columns import AccountColumns
+
+
+@pytest.mark.unit
+class TestAccountIndex:
+    """Index lookups must return what the linear filters did, in store order"""
+
+    @pytest.mark.parametrize("replaced, appended", [(10, 4), (0, 3), (5, 0), (200, 50)])
+    def test_incremental_changes_match_a_full_build(self, make_account, make_accounts, replaced, appended):
+        before = make_accounts(600)
+        rng = random.Random(replaced)
+        changed = {u: make_account(rng, u) for u in rng.sample(list(before), replaced)}
+        # An unchanged account passed as changed, and a title differing only in case
+        u = next(iter(before))
+        changed[u] = AccountAggregate.model_validate(
+            {**before[u].model_dump(), "workflows": [*before[u].model_dump()["workflows"], {"title": "lead SYNC"}]}
+        )
+        changed.update(make_accounts(appended, seed=3))
+        after = {**before, **changed}
+
+        columns_before = AccountColumns.build(before)
+        index_before = AccountIndex.build(before, columns_before)
+        index_before.record_json[1] = b"cached"
+        columns = columns_before.with_changes(changed)
+        incremental = index_before.with_changes(columns_before, columns, changed)
+        full = AccountIndex.build(after, columns)
+
+        for name in ("accounts", "status", "by_status", "by_title", "labels_lower", "labels_folded", "by_trigram", "orderings"):
+            assert getattr(incremental, name) == getattr(full, name), name
+        assert incremental.positions == full.positions
+        assert len(incremental.record_json) == len(after)
+        # Cached records of untouched accounts carry over; the old index is left as it was
+        if len(changed) <= account_index.REBUILD_FRACTION * len(after) and list(before)[1] not in changed:
+            assert incremental.record_json[1] == b"cached"
+        assert len(index_before) == len(before)
+
+    def test_combined_filters_match_a_linear_scan(self, make_accounts):
+        accounts = make_accounts(400)
+        # Case variants of one title collapse to a single index key
+        first = next(iter(accounts.values()))
+        first.workflows.extend([first.workflows[0].model_copy(update={"title": "lead sync"})] if first.workflows else [])
+        index = AccountIndex.build(accounts, AccountColumns.build(accounts))
+        xs = list(accounts.values())
+        target = str(xs[7].account.account_uuid)
+
+        cases = [
+            {},
+            {"status": SubscriptionStatus.active},
+            {"workflow_title": " LEAD sync "},
+            {"workflow_title": "Renewal", "status": SubscriptionStatus.inactive, "search": "1"},
+            {"account_uuid": target.upper()},
+            {"account_uuid": target, "status": xs[7].subscription.status},
+            {"account_uuid": "not-a-uuid"},
+            {"search": "account 2"},
+        ]
+        for filters in cases:
+            expected = [
+                a
+                for a in xs
+                if ("account_uuid" not in filters or str(a.account.account_uuid) == filters["account_uuid"].lower())
+                and ("status" not in filters or a.subscription.status == filters["status"])
+                and ("search" not in filters or filters["search"] in a.account.account_label.lower())
+                and (
+                    "workflow_title" not in filters
+                    or any(w.title.lower() == filters["workflow_title"].strip().lower() for w in a.workflows)
+                )
+            ]
+            assert [index.accounts[p] for p in index.select(**filters)] == expected, filters
+
+    def test_label_search_uses_trigrams_and_casefolding(self, make_accounts):
+        accounts = make_accounts(50)
+        labels = ["Große Straße", "STRASSENBAU", "Ab", "abc Labs", "Zebra"]
+        for agg, label in zip(accounts.values(), labels):
+            agg.account.account_label = label
+        index = AccountIndex.build(accounts, AccountColumns.build(accounts))
+        found = lambda search, **kw: [index.accounts[p].account.account_label for p in index.select(search=search, **kw)]
+
+        assert found("strasse") == ["Große Straße", "STRASSENBAU"]
+        assert found(" ABS ") == ["abc Labs"]
+        # Needles shorter than a trigram are scanned
+        assert found("ab") == ["Ab", "abc Labs"]
+        assert found("labz") == []
+        first = next(iter(accounts.values()))
+        assert found("GROSS", status=first.subscription.status) == ["Große Straße"]
+
+    @pytest.mark.parametrize("plan", [OrderPlan.walk, OrderPlan.heap, OrderPlan.sort])
+    @pytest.mark.parametrize("key", ["account_label", "automation_count", "notifications_billed"])
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_every_order_plan_matches_a_stable_sort(self, make_accounts, monkeypatch, plan, key, descending):
+        accounts = make_accounts(600)
+        index = AccountIndex.build(accounts, AccountColumns.build(accounts))
+        value = (
+            (lambda a: a.account.account_label.lower())
+            if key == "account_label"
+            else (lambda a: getattr(a.usage, key))
+        )
+        monkeypatch.setattr(account_index, "plan_order", lambda selected, total, stop: plan if selected < total else OrderPlan.slice)
+
+        for selected in (index.select(), index.select(status=SubscriptionStatus.active), index.select(search="account 12")):
+            expected = sorted((index.accounts[p] for p in selected), key=value, reverse=descending)
+            for start, stop in ((0, 25), (50, 75), (len(selected) - 5, len(selected) + 20)):
+                got = index.ordered(selected, key=key, descending=descending, start=start, stop=stop)
+                assert [index.accounts[p] for p in got] == expected[start:stop]
+
+    @pytest.mark.parametrize("plan", [OrderPlan.walk, OrderPlan.heap])
+    @pytest.mark.parametrize("key", ["account_label", "automation_count"])
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_keyset_pages_match_a_stable_sort(self, make_accounts, monkeypatch, plan, key, descending):
+        accounts = make_accounts(300)
+        index = AccountIndex.build(accounts, AccountColumns.build(accounts))
+        monkeypatch.setattr(account_index, "plan_order", lambda selected, total, stop: plan)
+
+        for selected in (index.select(), index.select(status=SubscriptionStatus.inactive)):
+            expected = index.ordered(selected, key=key, descending=descending, start=0, stop=len(selected))
+            values = index.sort_values[key]
+            got = index.ordered(selected, key=key, descending=descending, start=0, stop=7)
+            while len(got) < len(expected):
+                last = got[-1]
+                page = index.ordered_after(
+                    selected, key=key, descending=descending, value=values[last], position=last, limit=7
+                )
+                assert page
+                got += page
+            assert got == expected
+
+    def test_plan_prefers_walking_for_shallow_pages_and_sorting_for_deep_ones(self):
+        assert plan_order(1_000_000, 1_000_000, 25) == OrderPlan.slice
+        assert plan_order(300_000, 1_000_000, 25) == OrderPlan.walk
+        assert plan_order(80_000, 1_000_000, 40_000) == OrderPlan.sort
@@ -0,0 +1,59 @@
+import statistics
+
+import pytest
+
+from models.aggregate import AggregateRequest
+from services.insights.aggregate import aggregate
+
+
+@pytest.mark.unit
+class TestAggregate:
+    """Hash aggregation over the columns must match grouping the account models"""
+
+    def test_grouped_aggregations_match_a_model_walk(self, make_accounts, store):
+        accounts = make_accounts(400)
+        store.set(source="test", accounts=accounts)
+        request = AggregateRequest.model_validate(
+            {
+                "group_by": ["status", "workflow_title"],
+                "filters": {"search": "account 1"},
+                "aggregations": [
+                    {"op": "count"},
+                    {"op": "sum", "field": "messages_processed"},
+                    {"op": "max", "field": "seats_total"},
+                    {"op": "percentile", "field": "notifications_sent", "q": 50},
+                ],
+            }
+        )
+        result = aggregate(request)
+
+        xs = [a for a in accounts.values() if "account 1" in a.account.account_label.lower()]
+        expected: dict = {}
+        for a in xs:
+            for title in dict.fromkeys(w.title for w in a.workflows) or [None]:
+                expected.setdefault((a.subscription.status.value, title), []).append(a)
+        got = {(g["key"]["status"], g["key"]["workflow_title"]): g["values"] for g in result["groups"]}
+
+        assert result["total_items"] == len(xs)
+        assert result["aggregations"] == ["count", "sum_messages_processed", "max_seats_total", "p50_notifications_sent"]
+        assert set(got) == set(expected)
+        for key, members in expected.items():
+            s = [m.subscription for m in members]
+            assert got[key]["count"] == len(members)
+            assert got[key]["sum_messages_processed"] == sum(m.usage.messages_processed for m in members)
+            assert got[key]["max_seats_total"] == max(x.admin_seats + x.user_seats + x.read_only_seats for x in s)
+            assert got[key]["p50_notifications_sent"] == statistics.median(m.usage.notifications_sent for m in members)
+
+    def test_seat_buckets_and_empty_selections(self, make_accounts, store):
+        accounts = make_accounts(200)
+        store.set(source="test", accounts=accounts)
+        bucketed = aggregate(
+            AggregateRequest(group_by=["seat_bucket"], aggregations=[{"op": "count"}], seat_buckets=[0, 5, 10])
+        )
+        assert [g["key"]["seat_bucket"] for g in bucketed["groups"]] == ["0-4", "5-9", "10+"]
+        assert sum(g["values"]["count"] for g in bucketed["groups"]) == 200
+
+        empty = aggregate(
+            AggregateRequest(filters={"search": "no such label"}, aggregations=[{"op": "count"}, {"op": "mean", "field": "user_seats"}])
+        )
+        assert empty["groups"] == [{"key": {}, "values": {"count": 0, "mean_user_seats": None}}]
@@ -0,0 +1,96 @@
+import csv
+from io import BytesIO
+
+import pytest
+
+from services.aggregation import ParseMode, aggregate_rows, iter_chunks, iter_csv_lines
+
+HEADER = (
+    "Account UUID,Account Label,Subscription Status,Admin Seats,User Seats,"
+    "Read Only Seats,Total Records,Automation Count,Workflow Title,"
+    "Messages Processed,Notifications Sent,Notifications Billed\n"
+)
+
+
+def _aggregate(csv_bytes: bytes, chunk_size: int = 1 << 16, mode: ParseMode = ParseMode.fast):
+    reader = csv.DictReader(iter_csv_lines(iter_chunks(BytesIO(csv_bytes), chunk_size=chunk_size)))
+    accounts, row_errors, conflicts = aggregate_rows(reader, mode=mode)
+    return accounts, list(row_errors), list(conflicts)
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestStreamingAggregation:
+    """Unit tests for chunked CSV decoding and aggregation"""
+
+    def test_lines_survive_chunk_boundaries(self):
+        """Multi-byte characters and lines split across chunks are reassembled"""
+        text = "a,b\r\nZürich Café,2\r\n\"multi\nline\",3"
+        lines = list(iter_csv_lines(iter_chunks(BytesIO(text.encode("utf-8-sig")), chunk_size=3)))
+
+        assert "".join(lines) == text
+        assert list(csv.reader(lines)) == [["a", "b"], ["Zürich Café", "2"], ["multi\nline", "3"]]
+
+    def test_small_chunks_match_single_chunk(self):
+        """Aggregation results do not depend on the chunk size"""
+        csv_bytes = (
+            HEADER
+            + "c1a8f4d2-9b34-4f2a-bb12-8d91c7c1a901,Atlas,active,2,6,1,10,4,Lead Sync,5,4,3\n"
+            + "c1a8f4d2-9b34-4f2a-bb12-8d91c7c1a901,Atlas,active,2,6,1,10,4,Q3 Outreach,5,4,3\n"
+            + "not-a-uuid,Broken,active,1,1,1,1,1,,1,1,1\n"
+        ).encode("utf-8")
+
+        accounts_a, errors_a, conflicts_a = _aggregate(csv_bytes, chunk_size=7)
+        accounts_b, errors_b, conflicts_b = _aggregate(csv_bytes, chunk_size=1 << 16)
+
+        assert accounts_a == accounts_b
+        assert errors_a == errors_b
+        assert conflicts_a == conflicts_b
+        [agg] = accounts_a.values()
+        assert [w.title for w in agg.workflows] == ["Lead Sync", "Q3 Outreach"]
+        assert [e.row_number for e in errors_a] == [4]
+
+    def test_missing_header_row(self):
+        """An empty stream reports a single header error"""
+        accounts, errors, conflicts = _aggregate(b"", chunk_size=8)
+
+        assert accounts == {}
+        assert conflicts == []
+        assert [e.message for e in errors] == ["CSV has no header row"]
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestFastParseMode:
+    """The fast parser must be indistinguishable from per-row Pydantic validation"""
+
+    ROWS = [
+        "c1a8f4d2-9b34-4f2a-bb12-8d91c7c1a901,Atlas,active,2,6,1,10,4,Lead Sync,5,4,3",
+        "C1A8F4D2-9B34-4F2A-BB12-8D91C7C1A901,Atlas Systems,Active,+2,6,1,1_000,4,Lead Sync,5,4,3",
+        "f92d7b11-44a2-41f9-9f1e-5bcb18c6d203,Northshore,inactive,1,0,0,0,0,,0,0,0",
+        "{f92d7b11-44a2-41f9-9f1e-5bcb18c6d203},Northshore,inactive,1,0,0,0,0,Q3,0,5.0,0",
+        "8e3d21fa0e4d4c2e9e881d72bcbf9a14,Cloudline,active,3,12,4,62310,7,,1840220,4980,4750",
+        "uuid-123,Bad UUID,active,2,5,3,1000,10,Test Workflow,5000,4500,4000",
+        "2d9f51bc-7c89-4b18-ae3c-7f1e24a1b908,Trial,trial,1,2,1,500,5,Demo,2000,1800,1500",
+        "2d9f51bc-7c89-4b18-ae3c-7f1e24a1b908,Negative,active,-1,2,1,500,5,Demo,2000,1800,1500",
+        "2d9f51bc-7c89-4b18-ae3c-7f1e24a1b908,Float,active,1,2,1,5.5,5,Demo,2000,1800,1500",
+        "2d9f51bc-7c89-4b18-ae3c-7f1e24a1b908,,active,1,2,1,500,5,Demo,2000,1800,1500",
+        "2d9f51bc-7c89-4b18-ae3c-7f1e24a1b908,Pixel,active,1,3,0,9875,2,Onboarding,78600,310,300",
+    ]
+
+    def test_fast_and_strict_modes_agree(self):
+        """Accounts, row errors and conflicts are identical in both modes"""
+        csv_bytes = (HEADER + "\n".join(self.ROWS) + "\n").encode("utf-8")
+
+        fast = _aggregate(csv_bytes, mode=ParseMode.fast)
+        strict = _aggregate(csv_bytes, mode=ParseMode.strict)
+
+        fast_accounts, fast_errors, fast_conflicts = fast
+        strict_accounts, strict_errors, strict_conflicts = strict
+        assert {k: v.model_dump() for k, v in fast_accounts.items()} == {
+            k: v.model_dump() for k, v in strict_accounts.items()
+        }
+        assert fast_errors == strict_errors
+        assert fast_conflicts == strict_conflicts
+        assert len(fast_accounts) == 4
+        assert [e.row_number for e in fast_errors] == [7, 8, 9, 10, 11]
@@ -0,0 +1,86 @@
+import random
+from collections import Counter
+
+import pytest
+
+from models.subscription import SubscriptionStatus
+from services.columns import AccountColumns
+from services.insights import analytics, summary
+
+
+@pytest.mark.unit
+class TestAccountColumns:
+    """Columnar analytics must match walking the account models"""
+
+    def test_incremental_changes_match_a_full_build(self, make_account, make_accounts):
+        before = make_accounts(300)
+        rng = random.Random(2)
+        changed = {u: make_account(rng, u) for u in rng.sample(list(before), 40)}
+        changed.update(make_accounts(25, seed=3))
+        after = {**before, **changed}
+
+        incremental = AccountColumns.build(before).with_changes(changed)
+        full = AccountColumns.build(after)
+
+        assert incremental.uuids == full.uuids == list(after)
+        assert incremental.labels == full.labels
+        assert incremental.status == full.status
+        assert incremental.ints == full.ints
+        assert list(incremental.workflow_offsets) == list(full.workflow_offsets)
+        decode = lambda c, i: [c.workflow_titles[x] for x in c.workflow_codes[c.workflow_offsets[i]:c.workflow_offsets[i + 1]]]
+        assert all(decode(incremental, i) == [w.title for w in a.workflows] for i, a in enumerate(after.values()))
+
+    def test_large_values_fall_back_to_python_ints(self, make_accounts):
+        accounts = make_accounts(3)
+        big = next(iter(accounts.values())).model_copy(deep=True)
+        big.usage.notifications_sent = 2**70
+        columns = AccountColumns.build(accounts).with_changes({big.account.account_uuid: big})
+
+        assert sum(columns["notifications_sent"]) == sum(
+            a.usage.notifications_sent for a in {**accounts, big.account.account_uuid: big}.values()
+        )
+
+    def test_summaries_match_model_walks(self, make_accounts, store):
+        accounts = make_accounts(500)
+        store.set(source="test", accounts=accounts)
+        xs = list(accounts.values())
+        active = [a for a in xs if a.subscription.status == SubscriptionStatus.active]
+
+        lead = summary.leadership_summary()["analytics"]
+        assert lead["accounts_active"] == len(active)
+        assert lead["workflows_total"] == sum(len(a.workflows) for a in xs)
+        assert lead["workflow_titles_unique"] == len({w.title for a in xs for w in a.workflows})
+        assert lead["notifications_sent_total"] == sum(a.usage.notifications_sent for a in xs)
+
+        top = analytics.top_workflows(limit=3)
+        expected = Counter(w.title for a in xs for w in a.workflows).most_common(3)
+        assert list(zip(top["labels"], top["values"])) == expected
+
+        by_status = analytics.usage_by_subscription_status()
+        assert by_status["active"]["messages_processed_total"] == sum(a.usage.messages_processed for a in active)
+
+        refs = lambda pred: [str(a.account.account_uuid) for a in xs if pred(a)]
+        lists = summary.account_manager_summary()["action_lists"]
+        got = {name: [i["account_uuid"] for i in lists[name]["items"]] for name in lists}
+        u, s = (lambda a: a.usage), (lambda a: a.subscription)
+        seats = lambda a: s(a).admin_seats + s(a).user_seats + s(a).read_only_seats
+        assert got["inactive_with_usage"] == refs(
+            lambda a: s(a).status == SubscriptionStatus.inactive
+            and (u(a).messages_processed > 0 or u(a).notifications_sent > 0 or u(a).notifications_billed > 0)
+        )
+        assert got["active_zero_activity"] == refs(
+            lambda a: s(a).status == SubscriptionStatus.active
+            and u(a).messages_processed == 0 and u(a).notifications_sent == 0 and u(a).automation_count == 0
+        )
+        assert got["seats_vs_usage_mismatch"] == refs(
+            lambda a: s(a).status == SubscriptionStatus.active
+            and (
+                (seats(a) >= 10 and u(a).messages_processed <= 5 and u(a).notifications_sent <= 5 and u(a).automation_count == 0)
+                or (seats(a) <= 2 and u(a).notifications_sent >= 200)
+            )
+        )
+        assert got["billed_vs_sent_anomalies"] == refs(
+            lambda a: u(a).notifications_sent > 0
+            and (u(a).notifications_billed == 0 or u(a).notifications_billed > u(a).notifications_sent)
+        )
+        assert all(got.values()), "fixture should hit every heuristic"
@@ -0,0 +1,142 @@
+import io
+from uuid import UUID
+
+import pytest
+
+import services.csv_ingestion as csv_ingestion
+from services.csv_ingestion import ingest_bytes, ingest_stream
+from services.aggregation import IngestProgress
+from services.store import InMemoryStore
+
+HEADER = (
+    "Account UUID,Account Label,Subscription Status,Admin Seats,User Seats,"
+    "Read Only Seats,Total Records,Automation Count,Workflow Title,"
+    "Messages Processed,Notifications Sent,Notifications Billed\n"
+)
+
+ATLAS = "c1a8f4d2-9b34-4f2a-bb12-8d91c7c1a901"
+BOREAL = "0b7a1f0e-5c2d-4e8f-9a61-3f2b7c9d1e22"
+CEDAR = "9e3c2b1a-7d6f-4a5b-8c9d-0e1f2a3b4c5d"
+
+
+def _row(uuid: str, label: str, seats: int = 2, title: str = "Lead Sync") -> str:
+    return f"{uuid},{label},active,{seats},6,1,10,4,{title},5,4,3\n"
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = InMemoryStore(expected_headers=HEADER.strip().split(","))
+    monkeypatch.setattr(csv_ingestion, "STORE", store)
+    return store
+
+
+def _ingest(csv_text: str) -> IngestProgress:
+    progress = IngestProgress()
+    ingest_stream(io.BytesIO(csv_text.encode("utf-8")), source="test", progress=progress)
+    return progress
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestDeltaIngestion:
+    """Unit tests for skipping accounts whose source rows did not change"""
+
+    def test_first_ingest_counts_all_rows_as_new(self, store):
+        progress = _ingest(HEADER + _row(ATLAS, "Atlas") + _row(ATLAS, "Atlas", title="Q3") + _row(BOREAL, "Boreal"))
+
+        assert (progress.rows_unchanged, progress.rows_updated, progress.rows_new) == (0, 0, 3)
+        assert progress.rows_processed == 3
+        assert len(store.snapshot.row_digests) == 2
+
+    def test_unchanged_accounts_keep_their_stored_aggregate(self, store):
+        _ingest(HEADER + _row(ATLAS, "Atlas") + _row(BOREAL, "Boreal"))
+        atlas_before = store.accounts[UUID(ATLAS)]
+
+        progress = _ingest(HEADER + _row(ATLAS, "Atlas") + _row(BOREAL, "Boreal", seats=9) + _row(CEDAR, "Cedar"))
+
+        assert (progress.rows_unchanged, progress.rows_updated, progress.rows_new) == (1, 1, 1)
+        assert store.accounts[UUID(ATLAS)] is atlas_before
+        assert store.accounts[UUID(BOREAL)].subscription.admin_seats == 9
+        assert UUID(CEDAR) in store.accounts
+
+    def test_delta_result_matches_full_ingest(self, store, monkeypatch):
+        first = HEADER + _row(ATLAS, "Atlas") + _row(ATLAS, "Atlas Renamed") + _row(BOREAL, "Boreal")
+        second = first + _row(CEDAR, "Cedar") + _row(BOREAL, "Boreal", title="Q3")
+        _ingest(first)
+        _ingest(second)
+        delta_snapshot = store.snapshot
+
+        monkeypatch.setenv("INGEST_DELTA", "false")
+        full = InMemoryStore(expected_headers=store.expected_headers)
+        monkeypatch.setattr(csv_ingestion, "STORE", full)
+        _ingest(second)
+
+        assert dict(delta_snapshot.accounts) == dict(full.accounts)
+        # Atlas had a conflict, so it was re-parsed rather than skipped
+        assert list(delta_snapshot.conflicts) == list(full.conflicts)
+
+    def test_conflicts_report_the_current_file_row_numbers(self, store):
+        atlas = _row(ATLAS, "Atlas") + _row(ATLAS, "Atlas Renamed")
+        _ingest(HEADER + atlas)
+        assert [c.row_number for c in store.conflicts] == [3]
+
+        progress = _ingest(HEADER + _row(BOREAL, "Boreal") + _row(CEDAR, "Cedar") + _row(BOREAL, "Boreal") + atlas)
+
+        assert progress.rows_unchanged == 0
+        assert [(c.account_uuid, c.row_number) for c in store.conflicts] == [(ATLAS, 6)]
+
+    def test_reordered_header_columns_reparse_every_account(self, store):
+        row = f"{ATLAS},Atlas,active,1,9,1,10,4,Lead Sync,5,4,3\n"
+        _ingest(HEADER + row)
+        assert store.accounts[UUID(ATLAS)].subscription.admin_seats == 1
+
+        # Same row bytes, but the admin and user seat columns swapped names
+        swapped = HEADER.replace("Admin Seats,User Seats", "User Seats,Admin Seats")
+        progress = _ingest(swapped + row)
+
+        assert progress.rows_unchanged == 0
+        subscription = store.accounts[UUID(ATLAS)].subscription
+        assert (subscription.admin_seats, subscription.user_seats) == (9, 1)
+
+    def test_accounts_with_row_errors_are_always_reparsed(self, store):
+        csv_text = HEADER + _row(ATLAS, "Atlas") + f"{ATLAS},,active,1,1,1,1,1,,1,1,1\n"
+        _ingest(csv_text)
+        assert ATLAS not in store.snapshot.row_digests
+
+        progress = _ingest(csv_text)
+
+        assert progress.rows_unchanged == 0
+        assert progress.rows_updated == 2
+        assert len(store.row_errors) == 1
+
+    def test_differently_spelled_uuids_are_not_skipped(self, store):
+        braced = "{" + ATLAS.upper() + "}"
+        csv_text = HEADER + _row(ATLAS, "Atlas") + _row(braced, "Atlas", title="Q3")
+        _ingest(csv_text)
+
+        progress = _ingest(HEADER + _row(ATLAS, "Atlas") + _row(braced, "Atlas", title="Renewal"))
+
+        assert progress.rows_unchanged == 0
+        assert [w.title for w in store.accounts[UUID(ATLAS)].workflows] == ["Lead Sync", "Renewal"]
+
+    def test_disabled_delta_clears_digests(self, store, monkeypatch):
+        ingest_bytes((HEADER + _row(ATLAS, "Atlas")).encode("utf-8"), source="test")
+        assert store.snapshot.row_digests
+
+        monkeypatch.setenv("INGEST_DELTA", "false")
+        progress = _ingest(HEADER + _row(ATLAS, "Atlas"))
+
+        assert progress.rows_new == 0
+        assert dict(store.snapshot.row_digests) == {}
+
+    def test_switching_to_workflow_sketches_rebuilds_the_totals(self, store, monkeypatch):
+        _ingest(HEADER + _row(ATLAS, "Atlas") + _row(ATLAS, "Atlas", title="Q3") + _row(BOREAL, "Boreal"))
+        assert store.snapshot.totals.workflow_sketch is None
+
+        monkeypatch.setenv("INGEST_WORKFLOW_SKETCHES", "true")
+        _ingest(HEADER + _row(ATLAS, "Atlas") + _row(ATLAS, "Atlas", title="Q3") + _row(BOREAL, "Boreal") + _row(CEDAR, "Cedar", title="Q3"))
+        totals = store.snapshot.totals
+
+        assert totals.workflow_sketch is not None and not totals.title_counts
+        assert totals.workflows == 4
+        assert totals.top_titles(2) == [("Lead Sync", 2), ("Q3", 2)]
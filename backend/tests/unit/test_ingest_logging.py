@@ -0,0 +1,69 @@
+import io
+import logging
+
+import pytest
+
+import services.csv_ingestion as csv_ingestion
+from services.csv_ingestion import ingest_stream
+from services.store import InMemoryStore
+
+HEADER = (
+    "Account UUID,Account Label,Subscription Status,Admin Seats,User Seats,"
+    "Read Only Seats,Total Records,Automation Count,Workflow Title,"
+    "Messages Processed,Notifications Sent,Notifications Billed\n"
+)
+
+ATLAS = "c1a8f4d2-9b34-4f2a-bb12-8d91c7c1a901"
+
+
+def _messy_csv() -> bytes:
+    rows = [f"{ATLAS},Atlas,active,2,6,1,10,4,Lead Sync,5,4,3\n"]
+    # 20 duplicates disagreeing on two fields, 20 rows missing a label, 20 with a bad status
+    rows += [f"{ATLAS},Atlas {i},active,{3 + i},6,1,10,4,Flow {i},5,4,3\n" for i in range(20)]
+    rows += [f"{ATLAS},,active,2,6,1,10,4,,5,4,3\n" for _ in range(20)]
+    rows += [f"{ATLAS},Atlas,paused,2,6,1,10,4,,5,4,3\n" for _ in range(20)]
+    return (HEADER + "".join(rows)).encode("utf-8")
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = InMemoryStore(expected_headers=HEADER.strip().split(","))
+    monkeypatch.setattr(csv_ingestion, "STORE", store)
+    return store
+
+
+def _warnings(caplog) -> list[logging.LogRecord]:
+    return [r for r in caplog.records if r.levelno == logging.WARNING]
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestIngestLogging:
+    """Unit tests for aggregated logging of dropped rows and conflicts"""
+
+    def test_summary_mode_logs_examples_and_one_summary(self, store, monkeypatch, caplog):
+        monkeypatch.setenv("INGEST_LOG_MODE", "summary")
+        monkeypatch.setenv("INGEST_LOG_EXAMPLES", "3")
+
+        with caplog.at_level(logging.INFO):
+            ingest_stream(io.BytesIO(_messy_csv()), source="messy")
+
+        assert len(_warnings(caplog)) == 6
+        [summary_record] = [r for r in caplog.records if hasattr(r, "ingest_summary")]
+        summary = summary_record.ingest_summary
+        assert summary["source"] == "messy"
+        assert summary["rows_processed"] == 61
+        assert summary["row_errors_by_category"] == {"missing_fields": 20, "validation": 20}
+        assert summary["conflicts_by_field"] == {"account_label": 20, "subscription.admin_seats": 20}
+        assert summary["suppressed_log_lines"] == 80 - 6
+        assert summary["rows_new"] == 61
+
+    def test_per_row_mode_logs_every_issue(self, store, monkeypatch, caplog):
+        monkeypatch.setenv("INGEST_LOG_MODE", "per_row")
+
+        with caplog.at_level(logging.INFO):
+            ingest_stream(io.BytesIO(_messy_csv()), source="messy")
+
+        assert len(_warnings(caplog)) == 80
+        assert len(store.row_errors) == 40
+        assert len(store.conflicts) == 40
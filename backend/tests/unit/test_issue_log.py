@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from services.aggregation import ConflictError, RowError, new_conflict_log, new_row_error_log
+
+
+def _error(row_number: int, category: str = "validation") -> RowError:
+    return RowError(row_number=row_number, message=f"bad row {row_number}", raw={"Account UUID": "x"}, category=category)
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestIssueLog:
+    """Unit tests for memory-bounded row error and conflict storage"""
+
+    def test_overflow_spills_to_disk_and_pages_in_order(self, tmp_path):
+        log = new_row_error_log(memory_cap=10, directory=str(tmp_path))
+        errors = [_error(n) for n in range(2, 1002)]
+        log.extend(errors)
+        log.seal()
+
+        assert len(os.listdir(tmp_path)) == 1
+        assert list(log) == errors
+        # Pages that straddle the in-memory head, the spill file and its index blocks
+        for offset in (0, 5, 9, 10, 11, 265, 266, 990):
+            assert log.page(offset, 20) == errors[offset:offset + 20]
+
+    def test_small_logs_stay_in_memory(self, tmp_path):
+        log = new_row_error_log(memory_cap=10, directory=str(tmp_path))
+        log.extend(_error(n) for n in range(2, 7))
+
+        assert os.listdir(tmp_path) == []
+        assert log.page(3, 10) == [_error(5), _error(6)]
+
+    def test_counts_stay_exact_past_the_cap(self, tmp_path):
+        log = new_row_error_log(memory_cap=2, max_records=5, sample_size=3, directory=str(tmp_path))
+        log.extend(_error(n, "missing_fields" if n % 2 else "validation") for n in range(2, 102))
+
+        assert len(log) == 100
+        assert log.stored == 5
+        assert log.truncated
+        assert log.counts == {"missing_fields": 50, "validation": 50}
+        assert log.last_row_number == 101
+        assert len(log.sample) == 3
+        assert [e.row_number for e in log] == [2, 3, 4, 5, 6]
+
+    def test_spill_file_is_removed_with_the_log(self, tmp_path):
+        log = new_conflict_log(memory_cap=0, directory=str(tmp_path))
+        log.append(ConflictError(account_uuid="a", row_number=3, field="account_label", expected="A", got="B"))
+        log.seal()
+        assert log.counts == {"account_label": 1}
+        assert len(os.listdir(tmp_path)) == 1
+
+        del log
+
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,122 @@
+import pytest
+
+from services.aggregation import ParseMode, load_and_aggregate, new_conflict_log, new_row_error_log
+from services.parallel_aggregation import (
+    _has_multiline_records,
+    aggregate_shard,
+    load_and_aggregate_parallel,
+    shard_ranges,
+)
+
+HEADER = (
+    "Account UUID,Account Label,Subscription Status,Admin Seats,User Seats,"
+    "Read Only Seats,Total Records,Automation Count,Workflow Title,"
+    "Messages Processed,Notifications Sent,Notifications Billed\n"
+)
+
+UUIDS = [
+    "c1a8f4d2-9b34-4f2a-bb12-8d91c7c1a901",
+    "f92d7b11-44a2-41f9-9f1e-5bcb18c6d203",
+    "8e3d21fa-0e4d-4c2e-9e88-1d72bcbf9a14",
+]
+
+
+def _rows() -> list[str]:
+    rows = []
+    for i in range(60):
+        account_uuid = UUIDS[i % len(UUIDS)]
+        # Every 7th row disagrees with the account's first row; every 11th row is invalid
+        seats = 9 if i % 7 == 0 else 2
+        status = "trial" if i % 11 == 0 else "active"
+        rows.append(f"{account_uuid},Account {i % 3},{status},{seats},5,1,100,1,Flow {i % 5},10,8,8\n")
+    return rows
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "accounts.csv"
+    path.write_text(HEADER + "".join(_rows()), encoding="utf-8")
+    return path
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestParallelAggregation:
+    """Sharded ingestion must reproduce the sequential first-row-wins output"""
+
+    def test_shards_start_on_line_boundaries(self, csv_path):
+        data = csv_path.read_bytes()
+        data_start = len(HEADER)
+
+        ranges = shard_ranges(csv_path, data_start=data_start, shards=4)
+
+        assert ranges[0][0] == data_start
+        assert ranges[-1][1] == len(data)
+        assert all(a_end == b_start for (_, a_end), (b_start, _) in zip(ranges, ranges[1:]))
+        assert all(data[start - 1:start] == b"\n" for start, _ in ranges)
+
+    @pytest.mark.parametrize("workers", [2, 3, 7])
+    def test_parallel_matches_sequential(self, csv_path, workers):
+        seq_accounts, seq_errors, seq_conflicts = load_and_aggregate(csv_path)
+        par_accounts, par_errors, par_conflicts = load_and_aggregate_parallel(csv_path, workers=workers)
+
+        assert list(par_accounts) == list(seq_accounts)
+        assert [a.model_dump() for a in par_accounts.values()] == [a.model_dump() for a in seq_accounts.values()]
+        assert list(par_errors) == list(seq_errors)
+        assert list(par_conflicts) == list(seq_conflicts)
+        assert seq_conflicts, "fixture should produce conflicts across shards"
+
+    @pytest.mark.parametrize("workers", [2, 7])
+    def test_quoted_multiline_fields_match_sequential(self, tmp_path, workers):
+        path = tmp_path / "multiline.csv"
+        rows = [
+            f'{UUIDS[i % len(UUIDS)]},"Account {i % 3}\nsecond line",active,2,5,1,100,1,Flow {i},10,8,8\n'
+            for i in range(50)
+        ]
+        path.write_text(HEADER + "".join(rows), encoding="utf-8")
+
+        seq_accounts, seq_errors, seq_conflicts = load_and_aggregate(path)
+        par_accounts, par_errors, par_conflicts = load_and_aggregate_parallel(path, workers=workers)
+
+        assert not list(seq_errors)
+        assert [a.model_dump() for a in par_accounts.values()] == [a.model_dump() for a in seq_accounts.values()]
+        assert list(par_errors) == list(seq_errors)
+        assert list(par_conflicts) == list(seq_conflicts)
+
+    def test_quoted_fields_on_one_line_still_shard(self, tmp_path):
+        path = tmp_path / "quoted.csv"
+        path.write_text(HEADER + "".join(r.replace("Account 0", '"Account 0, Inc"') for r in _rows()), encoding="utf-8")
+
+        assert not _has_multiline_records(path, data_start=len(HEADER))
+        assert len(shard_ranges(path, data_start=len(HEADER), shards=3)) == 3
+
+    def test_capped_logs_match_sequential(self, csv_path):
+        caps = {"memory_cap": 1, "max_records": 2}
+        seq = load_and_aggregate(csv_path, row_errors=new_row_error_log(**caps), conflicts=new_conflict_log(**caps))
+        par = load_and_aggregate_parallel(
+            csv_path, workers=3, row_errors=new_row_error_log(**caps), conflicts=new_conflict_log(**caps)
+        )
+
+        for seq_log, par_log in zip(seq[1:], par[1:]):
+            assert par_log.truncated and seq_log.truncated
+            assert list(par_log) == list(seq_log)
+            assert len(par_log) == len(seq_log)
+            assert par_log.counts == seq_log.counts
+
+    def test_shards_ship_at_most_max_records_errors(self, csv_path):
+        fieldnames = HEADER.strip().split(",")
+        shard = aggregate_shard(str(csv_path), len(HEADER), csv_path.stat().st_size, fieldnames, ParseMode.fast, max_row_errors=2)
+
+        assert len(shard.row_errors) == 2
+        assert shard.row_error_total == 6
+        assert shard.row_count == 60
+
+    def test_skipped_accounts_keep_row_numbers_aligned(self, csv_path):
+        skip_keys = frozenset({UUIDS[1]})
+        seq_accounts, seq_errors, seq_conflicts = load_and_aggregate(csv_path, skip_keys=skip_keys)
+        par_accounts, par_errors, par_conflicts = load_and_aggregate_parallel(csv_path, workers=3, skip_keys=skip_keys)
+
+        assert {str(u) for u in par_accounts} == {UUIDS[0], UUIDS[2]}
+        assert list(par_accounts) == list(seq_accounts)
+        assert list(par_errors) == list(seq_errors)
+        assert list(par_conflicts) == list(seq_conflicts)
@@ -0,0 +1,68 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from common.response import UniformResponseMiddleware
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UniformResponseMiddleware)
+
+    @app.get("/enveloped")
+    def enveloped():
+        return {"status": True, "data": {"items": list(range(3))}}
+
+    @app.get("/status-only")
+    def status_only():
+        return {"status": "ok", "count": 1}
+
+    @app.get("/raw")
+    def raw():
+        return {"message": "hi"}
+
+    @app.get("/empty")
+    def empty():
+        return Response(media_type="application/json")
+
+    @app.get("/invalid")
+    def invalid():
+        return Response(content=b"{not json", media_type="application/json")
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("plain")
+
+    @app.get("/streamed")
+    def streamed():
+        return StreamingResponse(iter([b"[1,", b"2]"]), media_type="application/json")
+
+    return app
+
+
+@pytest.mark.unit
+class TestUniformResponseMiddleware:
+    """The envelope must match the old parse-and-rewrap middleware without re-encoding enveloped bodies"""
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        return TestClient(_app())
+
+    def test_enveloped_bodies_pass_through_byte_for_byte(self, client):
+        response = client.get("/enveloped")
+        assert response.content == b'{"status":true,"data":{"items":[0,1,2]}}'
+        assert response.headers["content-length"] == str(len(response.content))
+
+    def test_other_json_is_wrapped(self, client):
+        assert client.get("/raw").json() == {"status": True, "data": {"message": "hi"}}
+        assert client.get("/streamed").json() == {"status": True, "data": [1, 2]}
+        assert client.get("/empty").json() == {"status": True, "data": None}
+
+    def test_other_status_objects_are_wrapped(self, client):
+        assert client.get("/status-only").json() == {"status": True, "data": {"status": "ok", "count": 1}}
+
+    def test_non_json_is_untouched(self, client):
+        assert client.get("/invalid").content == b"{not json"
+        assert client.get("/text").text == "plain"
+        assert client.get("/missing").json() == {"detail": "Not Found"}
@@ -0,0 +1,66 @@
+import pytest
+from fastapi import HTTPException
+
+from models.subscription import SubscriptionStatus
+from services.columns import AccountColumns
+from services.insights import summary
+from services.insights.config import get_insights_settings
+from services.insights.rules import Rule, RuleEngine
+
+
+@pytest.mark.unit
+class TestRuleEngine:
+    """One fused pass must flag exactly what each rule's predicate does on its own"""
+
+    def test_fused_classification_matches_each_rule_alone(self, make_accounts):
+        accounts = make_accounts(400)
+        columns = AccountColumns.build(accounts)
+
+        fused = summary.account_manager_engine().evaluate(columns)
+        for rule in summary.ACCOUNT_MANAGER_RULES:
+            alone = RuleEngine((rule,), constants=summary.account_manager_engine().constants)
+            assert fused[rule.name] == alone.evaluate(columns)[rule.name], rule.name
+
+        sent_only = RuleEngine((Rule(name="a", when="notifications_sent >= 250", reason=""),))
+        xs = list(accounts.values())
+        assert sent_only.evaluate(columns)["a"] == [i for i, a in enumerate(xs) if a.usage.notifications_sent >= 250]
+
+    def test_rule_sets_override_thresholds_and_are_cached_per_snapshot(self, make_accounts, store, monkeypatch):
+        monkeypatch.setenv("INSIGHTS_RULE_SETS", '{"emea": {"LOW_SEATS": 6}}')
+        accounts = make_accounts(300)
+        store.set(source="test", accounts=accounts)
+        xs = list(accounts.values())
+
+        emea = summary.account_manager_summary(rule_set="emea")
+        assert emea is summary.account_manager_summary(rule_set="emea")
+        assert emea is not summary.account_manager_summary()
+        seats = lambda a: a.subscription.admin_seats + a.subscription.user_seats + a.subscription.read_only_seats
+        low_seats_heavy_use = [
+            str(a.account.account_uuid)
+            for a in xs
+            if a.subscription.status == SubscriptionStatus.active and seats(a) <= 6 and a.usage.notifications_sent >= 200
+        ]
+        got = [i["account_uuid"] for i in emea["action_lists"]["seats_vs_usage_mismatch"]["items"]]
+        assert set(low_seats_heavy_use) <= set(got)
+
+        store.set(source="test", accounts=accounts)
+        assert summary.account_manager_summary(rule_set="emea") is not emea
+        with pytest.raises(HTTPException):
+            summary.account_manager_summary(rule_set="apac")
+
+    @pytest.mark.parametrize(
+        "raw",
+        ['{"bad": {"NOPE": 1}}', '{"bad": {"LOW_SEATS": "6"}}', '{"bad": {"LOW_SEATS": true}}', '{"bad": [1]}', "[]", "{oops"],
+    )
+    def test_malformed_rule_sets_fail_when_settings_load(self, monkeypatch, raw):
+        monkeypatch.setenv("INSIGHTS_RULE_SETS", raw)
+        with pytest.raises(ValueError, match="INSIGHTS_RULE_SETS"):
+            get_insights_settings()
+
+    @pytest.mark.parametrize(
+        "when",
+        ["__import__('os')", "account_label == 1", "messages_processed.real > 0", "status == 'active'", "x = 1", "SEATS > 0"],
+    )
+    def test_rejects_expressions_outside_the_grammar(self, when):
+        with pytest.raises(ValueError):
+            RuleEngine((Rule(name="bad", when=when, reason=""),))
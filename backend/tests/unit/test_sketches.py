@@ -0,0 +1,78 @@
+import random
+from collections import Counter
+
+import pytest
+
+from services.sketches import HISTOGRAM_EDGES, QUANTILE_ACCURACY, CountMinSketch, HyperLogLog, ValueDistribution, WorkflowSketch
+
+
+def _zipf_titles(rng: random.Random, n: int, distinct: int) -> list[str]:
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices([f"Workflow {i}" for i in range(distinct)], weights=weights, k=n)
+
+
+@pytest.mark.unit
+class TestSketches:
+    """Approximate workflow statistics must stay within their error bounds, also after merging"""
+
+    def test_hyperloglog_estimates_and_merges_distinct_counts(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(30_000):
+            a.add(f"title {i}")
+        for i in range(20_000, 60_000):
+            b.add(f"title {i}")
+
+        assert a.count() == pytest.approx(30_000, rel=0.03)
+        assert a.merge(b).count() == pytest.approx(60_000, rel=0.03)
+        small = HyperLogLog()
+        for title in ["Lead Sync", "Renewal", "Lead Sync"]:
+            small.add(title)
+        assert small.count() == 2
+
+    def test_count_min_never_under_counts_and_supports_decrements(self):
+        rng = random.Random(1)
+        titles = _zipf_titles(rng, 50_000, 5_000)
+        exact = Counter(titles)
+        left, right = CountMinSketch(), CountMinSketch()
+        for i, title in enumerate(titles):
+            (left if i % 2 else right).add(title)
+        merged = left.merge(right)
+        for title in titles[:1000]:
+            merged.add(title, -1)
+        exact.subtract(titles[:1000])
+
+        errors = [merged.estimate(t) - c for t, c in exact.items()]
+        assert min(errors) >= 0
+        # Error bound: e / width of all additions, with high probability
+        assert sum(e <= 2.72 / 8192 * len(titles) for e in errors) / len(errors) > 0.95
+
+    def test_heavy_hitters_find_the_top_titles_across_shards(self):
+        rng = random.Random(2)
+        titles = _zipf_titles(rng, 100_000, 20_000)
+        exact = Counter(titles).most_common(10)
+        shards = [WorkflowSketch(), WorkflowSketch()]
+        for i, title in enumerate(titles):
+            shards[i % 2].add(title)
+
+        top = shards[0].merge(shards[1]).top(10)
+        assert [t for t, _ in top[:5]] == [t for t, _ in exact[:5]]
+        assert len({t for t, _ in top} & {t for t, _ in exact}) >= 9
+        assert all(c >= dict(exact).get(t, 0) for t, c in top)
+
+    def test_quantiles_stay_within_the_relative_accuracy_after_removals_and_merges(self):
+        rng = random.Random(3)
+        values = [int(rng.paretovariate(1.1) * 20) - 20 for _ in range(60_000)] + [0] * 5_000 + [2**40]
+        left, right = ValueDistribution(), ValueDistribution()
+        left.update(values[:30_000])
+        right.update(values[30_000:])
+        right.update(values[30_000:40_000], sign=-1)
+        kept = sorted(values[:30_000] + values[40_000:])
+        merged = left.merge(right)
+
+        assert len(merged) == len(kept)
+        for q in (0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999, 1):
+            exact = kept[int(q * (len(kept) - 1))]
+            assert merged.quantile(q) == pytest.approx(exact, rel=QUANTILE_ACCURACY, abs=1e-9), q
+        edges = HISTOGRAM_EDGES + (float("inf"),)
+        assert merged.histogram == [sum(lo <= v < hi for v in kept) for lo, hi in zip(edges, edges[1:])]
+        assert ValueDistribution().quantile(0.5) is None
@@ -0,0 +1,89 @@
+import threading
+import uuid
+
+import pytest
+
+from models.account_aggregate import AccountAggregate
+from services.aggregation import RowError, new_row_error_log
+from services.store import InMemoryStore
+
+
+def _account(label: str) -> AccountAggregate:
+    return AccountAggregate.model_validate(
+        {
+            "account": {"account_uuid": uuid.uuid4(), "account_label": label},
+            "subscription": {"status": "active", "admin_seats": 1, "user_seats": 1, "read_only_seats": 0},
+            "usage": {
+                "total_records": 1,
+                "automation_count": 1,
+                "messages_processed": 1,
+                "notifications_sent": 1,
+                "notifications_billed": 1,
+            },
+        }
+    )
+
+
+@pytest.mark.unit
+class TestInMemoryStore:
+    """Unit tests for copy-on-write snapshot publication"""
+
+    def test_set_publishes_new_versioned_snapshot(self):
+        store = InMemoryStore()
+        first = _account("First")
+
+        row_errors = new_row_error_log()
+        row_errors.append(RowError(row_number=2, message="bad", raw={}))
+
+        published = store.set(source="a", accounts={first.account.account_uuid: first}, row_errors=row_errors)
+
+        assert store.snapshot is published
+        assert published.version == 1
+        assert list(store.accounts) == [first.account.account_uuid]
+        assert list(store.row_errors) == [RowError(row_number=2, message="bad", raw={})]
+        assert store.source == "a"
+        assert store.loaded_at
+
+    def test_old_snapshots_are_never_modified(self):
+        store = InMemoryStore()
+        first = _account("First")
+        before = store.set(source="a", accounts={first.account.account_uuid: first})
+
+        second = _account("Second")
+        after = store.set(source="b", accounts={**before.accounts, second.account.account_uuid: second})
+
+        assert after.version == before.version + 1
+        assert len(before.accounts) == 1
+        assert len(after.accounts) == 2
+        with pytest.raises(TypeError):
+            before.accounts[second.account.account_uuid] = second
+
+    def test_readers_never_see_a_torn_view(self):
+        store = InMemoryStore()
+        stop = threading.Event()
+        errors: list[Exception] = []
+
+        def writer():
+            accounts: dict = {}
+            while not stop.is_set():
+                a = _account("A")
+                accounts = {**accounts, a.account.account_uuid: a}
+                store.set(source="w", accounts=accounts)
+
+        def reader():
+            try:
+                for _ in range(2000):
+                    snapshot = store.snapshot
+                    assert sum(1 for _ in snapshot.accounts.values()) == len(snapshot.accounts)
+            except Exception as e:  # pragma: no cover - surfaced through the assertion below
+                errors.append(e)
+
+        t = threading.Thread(target=writer)
+        t.start()
+        try:
+            reader()
+        finally:
+            stop.set()
+            t.join()
+
+        assert errors == []
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from models.subscription import SubscriptionStatus
+from services.insights import analytics, summary
+from services.totals import AccountTotals
+
+
+@pytest.mark.unit
+class TestAccountTotals:
+    """Totals maintained across ingests must equal a full recomputation"""
+
+    def test_incremental_totals_match_a_full_recomputation(self, make_account, make_accounts):
+        before = make_accounts(300)
+        totals = AccountTotals.build(before)
+        rng = random.Random(4)
+        current = dict(before)
+        for seed in (5, 6):
+            changed = {u: make_account(rng, u) for u in rng.sample(list(current), 50)}
+            changed.update(make_accounts(20, seed=seed))
+            totals = totals.with_changes(current, changed)
+            current.update(changed)
+
+        full = AccountTotals.build(current)
+        assert totals.accounts == full.accounts == len(current)
+        assert totals.status_counts == full.status_counts
+        assert totals.usage_by_status == full.usage_by_status
+        assert totals.title_counts == full.title_counts
+        for status in SubscriptionStatus:
+            for name, distribution in totals.usage_distributions[status].items():
+                expected = full.usage_distributions[status][name]
+                assert (distribution.zeros, distribution.bins, distribution.histogram) == (
+                    expected.zeros,
+                    expected.bins,
+                    expected.histogram,
+                )
+        assert totals.usage_total("notifications_sent") == sum(a.usage.notifications_sent for a in current.values())
+
+    def test_sketch_mode_tracks_workflows_incrementally(self, make_account, make_accounts, store):
+        before = make_accounts(300)
+        totals = AccountTotals.build(before, workflow_sketch=True)
+        rng = random.Random(7)
+        changed = {u: make_account(rng, u) for u in rng.sample(list(before), 60)}
+        totals = totals.with_changes(before, changed)
+        current = {**before, **changed}
+
+        exact = AccountTotals.build(current)
+        assert not totals.title_counts
+        assert totals.workflows == exact.workflows == sum(len(a.workflows) for a in current.values())
+        # A handful of titles never collide in the sketch, so it is exact here
+        assert totals.top_titles(4) == sorted(exact.top_titles(4), key=lambda tc: (-tc[1], tc[0]))
+        titles = {w.title for a in current.values() for w in a.workflows}
+        assert totals.unique_titles() == exact.unique_titles() == len(titles)
+
+        store.set(source="test", accounts=current, totals=totals)
+        assert summary.leadership_summary()["analytics"]["workflow_titles_unique"] == len(titles)
+        assert analytics.top_workflows(limit=2)["values"] == [c for _, c in exact.top_titles(4)][:2]
@@ -2,3 +2,23 @@ export interface IngestionResult {
   ok: boolean;
   records_loaded: number;
 }
+
+export type IngestionJobState = 'queued' | 'running' | 'succeeded' | 'failed';
+
+// GET /api/ingest/jobs/{job_id}; the POST endpoints return the same record for the queued job
+export interface IngestionJob extends IngestionResult {
+  job_id: string;
+  source: string;
+  state: IngestionJobState;
+  rows_processed: number;
+  rows_per_sec: number;
+  row_errors: number;
+  conflicts: number;
+  rows_unchanged: number;
+  rows_updated: number;
+  rows_new: number;
+  error: any;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
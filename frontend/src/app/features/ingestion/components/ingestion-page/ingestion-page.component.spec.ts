@@ -221,6 +221,34 @@ describe('IngestionPageComponent', () => {
       expect(ingestionService.uploadFile).toHaveBeenCalledWith(file);
     });
 
+    it('should report a failed ingestion job instead of success', () => {
+      const file = new File(['test'], 'test.csv', { type: 'text/csv' });
+      component.selectFile(file);
+      const job = { job_id: 'j1', state: 'failed', ok: false, records_loaded: 0, error: 'Bad rows' };
+
+      ingestionService.uploadFile.mockReturnValue(
+        of(
+          { progress: 100, status: 'processing', message: 'Processing: 10 rows' },
+          { progress: 100, status: 'error', message: 'Bad rows', job },
+        ),
+      );
+
+      let state: any;
+      component.state$.subscribe((s) => (state = s));
+
+      component.uploadFile();
+
+      expect(state.isUploading).toBe(false);
+      expect(state.lastResult).toEqual(job);
+      expect(state.selectedFile).toBe(file);
+      expect(snackBar.open).toHaveBeenCalledWith('Bad rows', 'Close', { duration: 5000 });
+      expect(snackBar.open).not.toHaveBeenCalledWith(
+        expect.stringContaining('uploaded'),
+        'Close',
+        expect.anything(),
+      );
+    });
+
     it('should handle upload errors', async () => {
       const file = new File(['test'], 'test.csv', { type: 'text/csv' });
       component.selectFile(file);
@@ -244,10 +272,7 @@ describe('IngestionPageComponent', () => {
 
   describe('Data Reload', () => {
     it('should call reload service', () => {
-      const mockResult = {
-        success: true,
-        message: 'Data reloaded',
-      };
+      const mockResult = { job_id: 'j1', state: 'succeeded', ok: true, records_loaded: 3 };
 
       ingestionService.reloadData.mockReturnValue(of(mockResult));
 
@@ -257,10 +282,7 @@ describe('IngestionPageComponent', () => {
     });
 
     it('should set reloading state', async () => {
-      const mockResult = {
-        success: true,
-        message: 'Data reloaded',
-      };
+      const mockResult = { job_id: 'j1', state: 'succeeded', ok: true, records_loaded: 3 };
 
       ingestionService.reloadData.mockReturnValue(of(mockResult));
 
@@ -277,6 +299,27 @@ describe('IngestionPageComponent', () => {
       expect(state.lastResult).toEqual(mockResult);
     });
 
+    it('should report a failed reload job', () => {
+      const mockResult = {
+        job_id: 'j1',
+        state: 'failed',
+        ok: false,
+        records_loaded: 0,
+        error: { message: 'CSV validation failed' },
+      };
+
+      ingestionService.reloadData.mockReturnValue(of(mockResult));
+
+      component.reloadData();
+
+      expect(snackBar.open).toHaveBeenCalledWith('CSV validation failed', 'Close', { duration: 5000 });
+      expect(snackBar.open).not.toHaveBeenCalledWith(
+        'Data reloaded successfully!',
+        'Close',
+        expect.anything(),
+      );
+    });
+
     it('should handle reload errors', async () => {
       const error = new HttpErrorResponse({
         status: 500,
@@ -7,8 +7,12 @@ import { MatIconModule } from '@angular/material/icon';
 import { MatProgressBarModule } from '@angular/material/progress-bar';
 import { MatCardModule } from '@angular/material/card';
 import { MatSnackBar, MatSnackBarModule } from '@angular/material/snack-bar';
-import { IngestionService, UploadProgress } from '../../services/ingestion.service';
-import { IngestionResult } from '../../../../common/models/ingestion.model';
+import {
+  IngestionService,
+  UploadProgress,
+  jobErrorMessage,
+} from '../../services/ingestion.service';
+import { IngestionJob } from '../../../../common/models/ingestion.model';
 import { MatDialog, MatDialogModule } from '@angular/material/dialog';
 import { CsvErrorDialogComponent } from '../csv-error-dialog/csv-error-dialog.component';
 import { MatTooltipModule } from '@angular/material/tooltip';
@@ -17,7 +21,7 @@ interface IngestionState {
   isUploading: boolean;
   isReloading: boolean;
   uploadProgress: UploadProgress | null;
-  lastResult: IngestionResult | null;
+  lastResult: IngestionJob | null;
   error: string | null;
   selectedFile: File | null;
 }
@@ -133,20 +137,33 @@ export class IngestionPageComponent {
 
     this.ingestionService.uploadFile(currentState.selectedFile).subscribe({
       next: (progress) => {
+        // Uploading and processing keep the page busy until the ingestion job has finished
+        const finished = progress.status === 'complete' || progress.status === 'error';
         const state = this.stateSubject.value;
         this.stateSubject.next({
           ...state,
           uploadProgress: progress,
-          isUploading: progress.status !== 'complete',
+          isUploading: !finished,
+          lastResult: finished && progress.job ? progress.job : state.lastResult,
         });
 
         if (progress.status === 'complete') {
-          this.snackBar.open('File uploaded successfully!', 'Close', { duration: 3000 });
+          this.snackBar.open(
+            progress.job
+              ? `File uploaded: ${progress.job.records_loaded.toLocaleString()} accounts loaded`
+              : 'File uploaded successfully!',
+            'Close',
+            { duration: 3000 },
+          );
           // Reset selected file after successful upload
           this.stateSubject.next({
             ...this.stateSubject.value,
             selectedFile: null,
           });
+        } else if (progress.status === 'error') {
+          this.snackBar.open(progress.message || 'Failed to ingest file. Please try again.', 'Close', {
+            duration: 5000,
+          });
         }
       },
       error: (error: HttpErrorResponse) => {
@@ -189,13 +206,18 @@ export class IngestionPageComponent {
     });
 
     this.ingestionService.reloadData().subscribe({
+      // Emits once the reload job has finished, successfully or not
       next: (result) => {
         this.stateSubject.next({
           ...this.stateSubject.value,
           isReloading: false,
           lastResult: result,
         });
-        this.snackBar.open('Data reloaded successfully!', 'Close', { duration: 3000 });
+        if (result.ok) {
+          this.snackBar.open('Data reloaded successfully!', 'Close', { duration: 3000 });
+        } else {
+          this.snackBar.open(jobErrorMessage(result), 'Close', { duration: 5000 });
+        }
       },
       error: (error: HttpErrorResponse) => {
         const errorMessage = error.error?.detail || 'Failed to reload data. Please try again.';
@@ -1,15 +1,30 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpEvent, HttpEventType } from '@angular/common/http';
-import { Observable } from 'rxjs';
-import { map } from 'rxjs/operators';
+import { Observable, of, timer } from 'rxjs';
+import { exhaustMap, last, map, mergeMap, startWith, switchMap, takeWhile } from 'rxjs/operators';
 import { ApiSuccessResponse } from '../../../common/models/api-response.model';
 import { environment } from '../../../environments/environment';
-import { IngestionResult } from '../../../common/models/ingestion.model';
+import { IngestionJob } from '../../../common/models/ingestion.model';
 
 export interface UploadProgress {
   progress: number;
   status: 'uploading' | 'processing' | 'complete' | 'error';
   message?: string;
+  // The ingestion job, once the upload has been accepted
+  job?: IngestionJob;
+}
+
+// How often a queued or running ingestion job is polled
+export const JOB_POLL_INTERVAL_MS = 1000;
+
+export function isJobFinished(job: IngestionJob): boolean {
+  return job.state === 'succeeded' || job.state === 'failed';
+}
+
+export function jobErrorMessage(job: IngestionJob): string {
+  const error = job.error;
+  if (typeof error === 'string' && error) return error;
+  return error?.message || 'Ingestion failed. Please try again.';
 }
 
 @Injectable({
@@ -20,24 +35,77 @@ export class IngestionService {
 
   constructor(private http: HttpClient) {}
 
+  // Upload progress, then the job's progress until it has succeeded ('complete') or failed ('error')
   uploadFile(file: File): Observable<UploadProgress> {
     const formData = new FormData();
     formData.append('file', file);
 
     return this.http
-      .post<ApiSuccessResponse<IngestionResult>>(this.apiUrl, formData, {
+      .post<ApiSuccessResponse<IngestionJob>>(this.apiUrl, formData, {
         reportProgress: true,
         observe: 'events',
       })
-      .pipe(map((event) => this.getProgress(event)));
+      .pipe(
+        mergeMap((event) =>
+          event.type === HttpEventType.Response && event.body
+            ? this.waitForJob(event.body.data).pipe(map((job) => this.getJobProgress(job)))
+            : of(this.getProgress(event)),
+        ),
+      );
+  }
+
+  // Emits the reload job once it has finished; check `ok` for whether it succeeded
+  reloadData(): Observable<IngestionJob> {
+    return this.http.post<ApiSuccessResponse<IngestionJob>>(`${this.apiUrl}/reload`, {}).pipe(
+      switchMap((response) => this.waitForJob(response.data)),
+      last(),
+    );
   }
 
-  reloadData(): Observable<IngestionResult> {
+  getJob(jobId: string): Observable<IngestionJob> {
     return this.http
-      .post<ApiSuccessResponse<IngestionResult>>(`${this.apiUrl}/reload`, {})
+      .get<ApiSuccessResponse<IngestionJob>>(`${this.apiUrl}/jobs/${encodeURIComponent(jobId)}`)
       .pipe(map((response) => response.data));
   }
 
+  // Emits `job` and then every polled state of it, completing after the finished one
+  waitForJob(job: IngestionJob): Observable<IngestionJob> {
+    if (isJobFinished(job)) {
+      return of(job);
+    }
+    return timer(JOB_POLL_INTERVAL_MS, JOB_POLL_INTERVAL_MS).pipe(
+      exhaustMap(() => this.getJob(job.job_id)),
+      takeWhile((polled) => !isJobFinished(polled), true),
+      startWith(job),
+    );
+  }
+
+  private getJobProgress(job: IngestionJob): UploadProgress {
+    switch (job.state) {
+      case 'queued':
+        return { progress: 100, status: 'processing', message: 'Waiting to be processed...', job };
+
+      case 'running':
+        return {
+          progress: 100,
+          status: 'processing',
+          message: `Processing: ${job.rows_processed.toLocaleString()} rows`,
+          job,
+        };
+
+      case 'succeeded':
+        return {
+          progress: 100,
+          status: 'complete',
+          message: `Loaded ${job.records_loaded.toLocaleString()} accounts`,
+          job,
+        };
+
+      case 'failed':
+        return { progress: 100, status: 'error', message: jobErrorMessage(job), job };
+    }
+  }
+
   private getProgress(event: HttpEvent<any>): UploadProgress {
     switch (event.type) {
       case HttpEventType.Sent:
@@ -51,13 +119,6 @@ export class IngestionService {
           message: `Uploading: ${percentDone}%`,
         };
 
-      case HttpEventType.Response:
-        return {
-          progress: 100,
-          status: 'complete',
-          message: 'Upload complete!',
-        };
-
       default:
         return { progress: 0, status: 'uploading' };
     }